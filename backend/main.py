@@ -1,15 +1,19 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import shutil
 import os
-import pandas as pd
 import re
 
 # Import your modules
-from src.parser.pdf_processor import convert_pdf_to_images
-from src.parser.gemini_client import extract_strategy_from_images
-from src.parser.generator import save_strategy_file
-from src.backtester.engine import BacktestEngine
+from src.api.backtests import BacktestService
+from src.api.charts import CHART_FORMATS, shape_chart
+from src.api.jobs import PaperJobQueue
+from src.backtester.results_store import DEFAULT_RESULTS_DB, LEADERBOARD_METRICS, ResultsStore
+from src.monitoring.stats import capture, server_timing, stats
+from src.strategies.registry import registry
 
 app = FastAPI(title="Alpha-Mechanism API")
 
@@ -22,59 +26,148 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON responses (chart payloads) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Per-request stage breakdown in a Server-Timing header (SERVER_TIMING=0 turns it off)
+SERVER_TIMING = os.getenv("SERVER_TIMING", "1") != "0"
+
+@app.middleware("http")
+async def record_request_stats(request: Request, call_next):
+    with capture() as captured:
+        with stats.stage("request"):
+            response = await call_next(request)
+
+    # Route template (e.g. /jobs/{job_id}) keeps label cardinality bounded
+    route = request.scope.get("route")
+    path = getattr(route, "path", "unmatched")
+    stats.count("http_requests", path=path, method=request.method, status=response.status_code)
+    if SERVER_TIMING and captured["stages"]:
+        response.headers["Server-Timing"] = server_timing(captured)
+    return response
+
 # Paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 UPLOAD_DIR = os.path.join(BASE_DIR, "data", "input_papers")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Every finished backtest is kept in SQLite (RESULTS_DB) for reuse and leaderboards
+results_store = ResultsStore(os.getenv("RESULTS_DB", DEFAULT_RESULTS_DB))
+
+# Backtests run on a bounded process pool with an in-memory result cache
+backtest_service = BacktestService(max_workers=int(os.getenv("BACKTEST_WORKERS", "0")) or None,
+                                   results_store=results_store)
+
+# Paper analysis runs as background jobs (PAPER_JOB_CONCURRENCY at a time)
+paper_jobs = PaperJobQueue(concurrency=int(os.getenv("PAPER_JOB_CONCURRENCY", "2")))
+
+@app.on_event("shutdown")
+async def shutdown_workers():
+    backtest_service.shutdown()
+    await paper_jobs.shutdown()
+
 @app.get("/")
 def home():
     return {"message": "Alpha-Mechanism AI is Running 🚀"}
 
-@app.post("/analyze-paper/")
+@app.get("/metrics")
+def metrics():
+    """
+    Prometheus scrape endpoint: stage timings and counters.
+    """
+    return PlainTextResponse(stats.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/strategies")
+def list_strategies():
+    """
+    Generated strategies available to /run-backtest/ (name, class, description, hash).
+    """
+    return {"strategies": registry.list()}
+
+@app.get("/leaderboard")
+async def leaderboard(metric: str = "sharpe", ticker: str = None, per_ticker: bool = False,
+                      limit: int = 20, all_versions: bool = False):
+    """
+    Best recorded backtests by metric ('sharpe', 'total_return', 'max_drawdown').
+    per_ticker: top 'limit' runs of every ticker instead of one overall ranking
+    all_versions: include runs of strategy files that have since changed
+    """
+    if metric not in LEADERBOARD_METRICS:
+        raise HTTPException(status_code=400, detail=f"metric must be one of {LEADERBOARD_METRICS}")
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be at least 1")
+
+    # Only the strategies' current versions unless asked otherwise
+    hashes = None if all_versions else [s["hash"] for s in registry.list()]
+    rows = await run_in_threadpool(
+        results_store.leaderboard, metric, ticker=ticker, per_ticker=per_ticker, hashes=hashes, limit=limit
+    )
+    return {"metric": metric, "rows": rows}
+
+@app.post("/analyze-paper/", status_code=202)
 async def analyze_paper(file: UploadFile = File(...)):
     """
-    PHASE 1: Upload PDF -> Extract Logic -> Save .py file
+    PHASE 1: Upload PDF -> queue a background job (Extract Logic -> Save .py file)
+    Returns immediately; progress is streamed from /jobs/{job_id}/events.
     """
     try:
-        # 1. Save the uploaded file
-        file_location = os.path.join(UPLOAD_DIR, file.filename)
+        # 1. Save the uploaded file (off the event loop)
+        file_location = os.path.join(UPLOAD_DIR, os.path.basename(file.filename))
         with open(file_location, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+            await run_in_threadpool(shutil.copyfileobj, file.file, buffer)
             
         print(f"📥 Received: {file.filename}")
 
-        # 2. Run Phase 1 Pipeline
-        images = convert_pdf_to_images(file_location)
-        if not images:
-            raise HTTPException(status_code=400, detail="Could not read PDF")
-            
-        strategy_data = extract_strategy_from_images(images)
-        if not strategy_data:
-            raise HTTPException(status_code=500, detail="Gemini failed to extract logic")
-            
-        # 3. Generate Code
-        saved_path = save_strategy_file(strategy_data)
+        # 2. Queue the Phase 1 Pipeline
+        job = paper_jobs.submit(file_location, file.filename)
         
         return {
-            "status": "success",
-            "strategy_name": strategy_data['strategy_name'],
-            "description": strategy_data['description'],
-            "file_saved_at": saved_path
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": f"/jobs/{job.id}",
+            "events_url": f"/jobs/{job.id}/events",
         }
 
     except Exception as e:
         print(f"❌ API Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """
+    Current status of a paper analysis job (result included once done).
+    """
+    job = paper_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """
+    Server-Sent Events stream of stage progress (rendering, extraction, validation, codegen).
+    """
+    if paper_jobs.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return StreamingResponse(
+        paper_jobs.stream(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
 @app.get("/run-backtest/")
-def run_backtest(strategy_name: str, ticker: str = "BTC-USD"):
+async def run_backtest(request: Request, strategy_name: str, ticker: str = "BTC-USD",
+                       start_date: str = "2020-01-01", end_date: str = "2023-12-31",
+                       format: str = "records", max_points: int = 0):
     """
     PHASE 2: Run the generated strategy and return the equity curve
+    format: 'records' (one object per row) or 'columnar' (parallel arrays)
+    max_points: LTTB-downsample the curve to at most this many rows (default 0 = all)
     """
     try:
-        engine = BacktestEngine(start_date="2020-01-01", end_date="2023-12-31")
-        
+        if format not in CHART_FORMATS:
+            raise HTTPException(status_code=400, detail=f"format must be one of {CHART_FORMATS}")
+
         # --- FIX: EXACT MATCH LOGIC ---
         # Do NOT remove the word "Strategy". Just clean symbols/spaces.
         # This matches generator.py logic perfectly.
@@ -82,27 +175,29 @@ def run_backtest(strategy_name: str, ticker: str = "BTC-USD"):
         
         print(f"🔎 Request: '{strategy_name}' -> Looking for file: '{clean_name}.py'")
         
-        results = engine.run(strategy_name=clean_name, ticker=ticker)
+        # Runs on the worker pool; repeats are served from the result cache
+        payload, etag = await backtest_service.run(clean_name, ticker, start_date, end_date)
         
-        if results is None or results.empty:
+        if payload is None:
             raise HTTPException(status_code=404, detail="Backtest returned no data")
-            
-        # Fill NaNs
-        results = results.fillna(1.0)
 
-        # Chart Data
-        chart_data = results[['cumulative_market', 'cumulative_strategy']].reset_index()
-        chart_data.columns = ['date', 'market', 'strategy']
-        chart_data['date'] = chart_data['date'].dt.strftime('%Y-%m-%d')
-        
-        final_return = results['cumulative_strategy'].iloc[-1] - 1
-        
-        return {
-            "ticker": ticker,
-            "total_return": f"{final_return:.2%}",
-            "chart_data": chart_data.to_dict(orient="records")
-        }
+        # The representation depends on format and resolution as well as the data
+        etag = f'{etag[:-1]}-{format}-{max_points}"'
+        headers = {"ETag": etag, "Cache-Control": "private, max-age=0, must-revalidate"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+
+        with stats.stage("chart_shape"):
+            try:
+                body = shape_chart(payload, format, max_points)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        return JSONResponse(body, headers=headers)
         
+    except HTTPException:
+        raise
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         print(f"❌ Backtest Error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,5 +1,4 @@
 from src.backtester.engine import BacktestEngine
-import matplotlib.pyplot as plt
 
 def main():
     # 1. Initialize Engine
@@ -12,6 +11,8 @@ def main():
     
     # 3. Simple Plot
     if results is not None:
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=(10, 6))
         plt.plot(results['cumulative_market'], label='Buy & Hold (Bitcoin)', linestyle='--')
         plt.plot(results['cumulative_strategy'], label='AI Strategy (TS Momentum)', linewidth=2)
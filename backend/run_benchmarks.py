@@ -0,0 +1,75 @@
+import argparse
+import json
+from src.benchmarks.imports import check_import_budgets
+from src.benchmarks.suite import (
+    DEFAULT_SIZES, compare_results, latest_results, run_suite, save_results,
+)
+
+def parse_size(text):
+    # '1k' -> 1000, '10m' -> 10000000
+    multipliers = {"k": 1_000, "m": 1_000_000}
+    text = text.strip().lower()
+    if text[-1] in multipliers:
+        return int(float(text[:-1]) * multipliers[text[-1]])
+    return int(text)
+
+def check_imports():
+    # Cold-start budget: each subsystem imported in a fresh interpreter
+    failures = 0
+    for row in check_import_budgets():
+        if row["seconds"] is None:
+            print(f"❌ {row['name']}: {row['error']}")
+        else:
+            icon = "✅" if row["ok"] else "❌"
+            extra = f" (loaded {', '.join(row['loaded'])})" if row["loaded"] else ""
+            print(f"{icon} {row['name']}: {row['seconds'] * 1e3:.0f} ms / {row['budget'] * 1e3:.0f} ms{extra}")
+        failures += not row["ok"]
+    if failures:
+        raise SystemExit(1)
+
+def main():
+    # 1. Setup Arguments
+    parser = argparse.ArgumentParser(description="Alpha-Mechanism benchmark suite (synthetic market data)")
+    parser.add_argument("--sizes", default=",".join(str(n) for n in DEFAULT_SIZES),
+                        help="Comma-separated bar counts, e.g. 1k,100k,1m,10m")
+    parser.add_argument("--only", nargs="*", help="Run benchmarks whose name contains any of these")
+    parser.add_argument("--budget", type=float, default=2.0, help="Seconds of timed runs per benchmark")
+    parser.add_argument("--label", help="Suffix for the stored result file")
+    parser.add_argument("--compare", help="Baseline result file (default: the previous run)")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change reported as slower/faster")
+    parser.add_argument("--imports", action="store_true", help="Only check the import-time budgets")
+    args = parser.parse_args()
+
+    if args.imports:
+        check_imports()
+        return
+
+    # 2. Run and store
+    sizes = [parse_size(s) for s in args.sizes.split(",")]
+    results = run_suite(sizes=sizes, only=args.only, budget=args.budget)
+    path = save_results(results, label=args.label)
+    print(f"💾 Results saved: {path}")
+
+    # 3. Compare against a baseline
+    baseline_path = args.compare or latest_results(exclude=path)
+    if not baseline_path:
+        return
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(path) as f:
+        current = json.load(f)
+
+    print(f"📊 Compared with {baseline_path} (commit {baseline.get('commit')}):")
+    regressions = 0
+    for row in compare_results(baseline, current, threshold=args.threshold):
+        icon = {"slower": "🔴", "faster": "🟢", "same": "⚪"}[row["status"]]
+        print(f"{icon} {row['benchmark']} n={row['n']}: {row['baseline'] * 1e3:.2f} ms -> "
+              f"{row['current'] * 1e3:.2f} ms (x{row['ratio']:.2f})")
+        regressions += row["status"] == "slower"
+
+    # Non-zero exit so CI can flag regressions
+    if regressions:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
+import argparse
 import numpy as np
-import matplotlib.pyplot as plt
 from src.fairness.bandit import FairThompsonSampler
+from src.fairness.simulation import compare_fairness_floors
 
 def simulate_market():
     print("⚖️ Initializing Fair Resource Allocation...")
@@ -37,6 +38,8 @@ def simulate_market():
         rewards_history.append(reward)
 
     # --- Visualization ---
+    import matplotlib.pyplot as plt
+
     alloc_data = np.array(allocations_history)
     
     plt.figure(figsize=(12, 6))
@@ -66,5 +69,45 @@ def simulate_market():
     print("Notice how Strategy 2 (Bad) never drops below 10% allocation?")
     print("That is the 'Fairness Constraint' preventing starvation.")
 
+def compare_floors(n_replicas):
+    print(f"⚖️ Comparing Fairness Floors across {n_replicas} replicas...")
+    results = compare_fairness_floors([0.60, 0.55, 0.40], n_replicas=n_replicas, n_days=1000, seed=42)
+
+    print(f"{'Floor':>6} | {'Regret (mean)':>13} | {'p5':>7} | {'p95':>7} | {'Bad Arm Share':>13}")
+    for r in results:
+        print(f"{r['min_allocation']:>6.0%} | {r['regret']['mean']:>13.1f} | "
+              f"{r['regret']['p5']:>7.1f} | {r['regret']['p95']:>7.1f} | "
+              f"{r['pull_share'][2]['mean']:>13.1%}")
+
+def run_portfolio(strategy_names, ticker, min_allocation, cost):
+    from src.backtester.engine import BacktestEngine
+
+    print(f"⚖️ Allocating across {len(strategy_names)} strategies on {ticker}...")
+    result = BacktestEngine().bandit_portfolio(strategy_names, ticker, min_allocation=min_allocation, cost=cost, seed=42)
+    if result is None:
+        return
+
+    summary = result["summary"]
+    print(f"📈 Sharpe: {summary['sharpe']:.2f} | Max Drawdown: {summary['max_drawdown']:.2%} | "
+          f"Mean Turnover: {summary['mean_turnover']:.2%}")
+    for name, weight in sorted(summary["final_weights"].items(), key=lambda kv: -kv[1]):
+        print(f"   {name:<40} {weight:>7.1%}")
+
 if __name__ == "__main__":
-    simulate_market()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Alpha-Mechanism Phase 4: Fair Allocation")
+    parser.add_argument("--replicas", type=int, default=0,
+                        help="Run the batched Monte-Carlo floor comparison with this many replicas")
+    parser.add_argument("--portfolio", default="",
+                        help="Comma-separated generated strategies to allocate between on real returns")
+    parser.add_argument("--ticker", default="SPY")
+    parser.add_argument("--min-allocation", type=float, default=0.05)
+    parser.add_argument("--cost", type=float, default=0.0, help="Cost per unit of turnover")
+    args = parser.parse_args()
+
+    if args.portfolio:
+        run_portfolio([s.strip() for s in args.portfolio.split(",") if s.strip()], args.ticker,
+                      args.min_allocation, args.cost)
+    elif args.replicas:
+        compare_floors(args.replicas)
+    else:
+        simulate_market()
\ No newline at end of file
@@ -1,8 +1,9 @@
 import os
 import argparse
-from src.parser.pdf_processor import convert_pdf_to_images
-from src.parser.gemini_client import extract_strategy_from_images
+from src.parser.extraction_cache import extract_strategy_from_pdf
 from src.parser.generator import save_strategy_file
+from src.parser.smoke import smoke_test_strategy
+from src.parser.validator import LogicValidator
 
 def main():
     # 1. Setup Arguments
@@ -21,17 +22,24 @@ def main():
     # 3. Pipeline Execution
     print("--- 🚀 Starting Alpha-Mechanism Parser ---")
     
-    # Step A: PDF -> Images
-    images = convert_pdf_to_images(pdf_path)
-    if not images: return
-
-    # Step B: Images -> JSON (Gemini)
-    strategy_data = extract_strategy_from_images(images)
+    # Step A+B: PDF -> Images -> JSON (Gemini), cached by PDF content
+    strategy_data = extract_strategy_from_pdf(pdf_path)
     if not strategy_data: return
 
     print(f"💡 Extracted Strategy: {strategy_data['strategy_name']}")
 
-    # Step C: JSON -> Python File
+    # Step C: Reject slow or broken logic before it reaches the strategy folder
+    is_valid, message = LogicValidator.validate_strategy(strategy_data)
+    if not is_valid:
+        print(f"❌ {message}")
+        return
+    smoke = smoke_test_strategy(strategy_data)
+    if not smoke["ok"]:
+        print(f"❌ Smoke test failed: {smoke['error']}")
+        return
+    print(f"🧪 Smoke test passed: {smoke['timings']} (scaling {smoke['scaling']:.2f})")
+
+    # Step D: JSON -> Python File
     save_strategy_file(strategy_data)
 
     print("--- 🏁 Phase 1 Complete ---")
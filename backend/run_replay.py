@@ -0,0 +1,23 @@
+import argparse
+from src.backtester.engine import BacktestEngine
+from src.backtester.streaming import replay
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the streaming engine against BacktestEngine.run")
+    parser.add_argument("strategy", help="Generated strategy file name (without .py)")
+    parser.add_argument("--ticker", default="SPY")
+    parser.add_argument("--start", default="2015-01-01")
+    parser.add_argument("--end", default="2023-12-31")
+    parser.add_argument("--window", type=int, default=None, help="Ring buffer size (bars)")
+    args = parser.parse_args()
+
+    # 1. Batch run, then the same bars one at a time
+    engine = BacktestEngine(start_date=args.start, end_date=args.end)
+    result = replay(engine, args.strategy, ticker=args.ticker, window=args.window)
+
+    # 2. Non-zero exit code on any difference
+    if result is None or any(result["mismatches"].values()):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import argparse
+from src.backtester.engine import BacktestEngine
+from src.backtester.robustness import BOOTSTRAP_METHODS, DEFAULT_BLOCK, DEFAULT_PATHS
+
+def main():
+    parser = argparse.ArgumentParser(description="Bootstrap confidence bands for a generated strategy")
+    parser.add_argument("strategy", help="Generated strategy file name (without .py)")
+    parser.add_argument("--ticker", default="SPY")
+    parser.add_argument("--start", default="2015-01-01")
+    parser.add_argument("--end", default="2023-12-31")
+    parser.add_argument("--paths", type=int, default=DEFAULT_PATHS)
+    parser.add_argument("--method", choices=BOOTSTRAP_METHODS, default="stationary")
+    parser.add_argument("--block", type=int, default=DEFAULT_BLOCK, help="(Mean) block length in days")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # 1. Backtest, then resample its daily returns
+    engine = BacktestEngine(start_date=args.start, end_date=args.end)
+    bands = engine.robustness(args.strategy, ticker=args.ticker, n_paths=args.paths,
+                              method=args.method, block=args.block, seed=args.seed)
+    if bands is None:
+        raise SystemExit(1)
+
+    # 2. Report
+    print(f"🎲 {args.paths} {args.method} bootstrap paths (block {args.block}):")
+    print(bands.to_string(float_format=lambda v: f"{v:.3f}"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import asyncio
+import hashlib
+import json
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from src.api.cache import TTLCache
+from src.backtester.results_store import ResultsStore, is_final
+from src.monitoring.stats import capture, stats
+from src.strategies.registry import registry
+
+
+def build_payload(ticker, dates, market_curve, strategy_curve):
+    """
+    API payload from a run's dates and (NaN-filled) cumulative curves.
+    """
+    # Chart Data (full resolution; shaped per request by charts.shape_chart)
+    dates = np.asarray(dates, dtype="datetime64[ns]")
+    daily = (dates == dates.astype("datetime64[D]")).all()
+    chart = {
+        "date": np.datetime_as_string(dates, unit="D" if daily else "m"),
+        "market": np.asarray(market_curve, dtype=np.float64),
+        "strategy": np.asarray(strategy_curve, dtype=np.float64),
+    }
+
+    final_return = chart["strategy"][-1] - 1
+
+    return {
+        "ticker": ticker,
+        "total_return": f"{final_return:.2%}",
+        "chart": chart,
+    }
+
+
+def compute_backtest(strategy_name, ticker, start_date, end_date, results_db=None):
+    """
+    Runs one backtest and shapes it into the API payload; with 'results_db'
+    the run is also recorded in that ResultsStore.
+    Executed inside a pool worker; returns None when there is no data.
+    """
+    # Only workers need the backtester (and pandas); the API process never imports it
+    from src.backtester import metrics
+    from src.backtester.engine import BacktestEngine
+
+    engine = BacktestEngine(start_date=start_date, end_date=end_date)
+    results = engine.run(strategy_name=strategy_name, ticker=ticker)
+
+    if results is None or results.empty:
+        return None
+
+    summary = {
+        "total_return": float(metrics.total_return(results['strategy_return'].to_numpy())),
+        "market_return": float(metrics.total_return(results['market_return'].to_numpy())),
+        "sharpe": float(metrics.sharpe_ratio(results['strategy_return'].to_numpy())),
+        "max_drawdown": float(metrics.max_drawdown(results['strategy_return'].to_numpy())),
+        "bars": len(results),
+    }
+
+    # Fill NaNs
+    results = results.fillna(1.0)
+    dates = results.index.as_unit("ns").to_numpy()
+    market = results['cumulative_market'].to_numpy(dtype=np.float64)
+    strategy = results['cumulative_strategy'].to_numpy(dtype=np.float64)
+
+    if results_db:
+        # Best effort: a locked database or a strategy file changing mid-run must not fail the request
+        try:
+            with stats.stage("results_store"):
+                ResultsStore(results_db).record(
+                    strategy_name, registry.get(strategy_name).digest, ticker, start_date, end_date,
+                    dates, market, strategy, summary,
+                )
+        except Exception as e:
+            stats.count("results_store_errors")
+            print(f"⚠️ Could not record {strategy_name} on {ticker} in the results store: {e}")
+
+    return build_payload(ticker, dates, market, strategy)
+
+
+def _compute_with_stats(strategy_name, ticker, start_date, end_date, results_db=None):
+    # Pool workers have their own registry: ship what this run recorded back with the payload
+    with capture() as captured:
+        with stats.stage("backtest"):
+            payload = compute_backtest(strategy_name, ticker, start_date, end_date, results_db)
+    return payload, captured
+
+
+def stored_payload(store, key):
+    """
+    Payload rebuilt from a run already in the results store, or None.
+    Runs whose range was still open when recorded are not served (new bars
+    may have arrived since); recomputing them replaces the stored row.
+    """
+    strategy_hash, ticker, start_date, end_date = key
+    run = store.get(strategy_hash, ticker, start_date, end_date)
+    if run is None or not is_final(run):
+        return None
+    return build_payload(ticker, run["dates"], run["market_curve"], run["strategy_curve"])
+
+
+def payload_etag(payload):
+    """
+    Content hash of a payload (chart arrays hashed as raw bytes).
+    """
+    digest = hashlib.sha256(json.dumps([payload["ticker"], payload["total_return"]]).encode())
+    for name in sorted(payload["chart"]):
+        digest.update(name.encode())
+        digest.update(payload["chart"][name].tobytes())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def strategy_file_hash(strategy_name):
+    """
+    Content hash of a generated strategy, so edits invalidate cached results.
+    """
+    return registry.get(strategy_name).digest
+
+
+class BacktestService:
+    """
+    Runs backtests off the event loop on a bounded process pool.
+
+    Identical requests that arrive while one is running share its result,
+    and finished payloads are kept in an LRU/TTL cache keyed by
+    (strategy file hash, ticker, date range) together with an ETag.
+    Every run is also recorded in the persistent results store, which
+    answers cache misses (e.g. after a restart) before the pool is used.
+    """
+    def __init__(self, max_workers=None, cache_size=256, ttl=3600, results_store=None):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.cache = TTLCache(max_entries=cache_size, ttl=ttl)
+        self.results = results_store
+        self._pool = None
+        self._inflight = {}
+
+    @property
+    def pool(self):
+        # Created on first use; 'spawn' avoids forking the server's threads
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=mp.get_context("spawn"))
+        return self._pool
+
+    async def run(self, strategy_name, ticker, start_date, end_date):
+        """
+        Returns (payload, etag); payload is None when the backtest had no data.
+        """
+        # The registry may stat or rescan the strategy folder: keep that off the event loop
+        loop = asyncio.get_running_loop()
+        key = (await loop.run_in_executor(None, strategy_file_hash, strategy_name), ticker, start_date, end_date)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            stats.count("backtest_cache", result="hit")
+            return cached
+
+        # Merge with an identical request that is already running
+        task = self._inflight.get(key)
+        stats.count("backtest_cache", result="shared" if task is not None else "miss")
+        if task is None:
+            task = asyncio.ensure_future(self._compute(key, strategy_name, ticker, start_date, end_date))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        return await asyncio.shield(task)
+
+    async def _compute(self, key, strategy_name, ticker, start_date, end_date):
+        loop = asyncio.get_running_loop()
+
+        # 1. A previous run of the same strategy version (SQLite read off the event loop)
+        payload = None
+        if self.results is not None:
+            payload = await loop.run_in_executor(None, stored_payload, self.results, key)
+            stats.count("results_store", result="hit" if payload is not None else "miss")
+
+        # 2. Otherwise backtest on the pool (the worker records the run)
+        if payload is None:
+            results_db = self.results.path if self.results is not None else None
+            try:
+                payload, captured = await loop.run_in_executor(
+                    self.pool, _compute_with_stats, strategy_name, ticker, start_date, end_date, results_db
+                )
+            except BrokenProcessPool:
+                # A worker died; start a fresh pool for the next request
+                self._pool = None
+                raise
+            stats.record(captured)
+
+        etag = None
+        if payload is not None:
+            etag = payload_etag(payload)
+            self.cache.set(key, (payload, etag))
+        return payload, etag
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
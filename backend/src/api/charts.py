@@ -0,0 +1,80 @@
+import numpy as np
+
+CHART_FORMATS = ("records", "columnar")
+
+
+def lttb_indices(y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: picks 'n_out' points of 'y' (first and
+    last included) that keep the visual shape of the line.
+    Returns the chosen indices in order.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    chosen = np.empty(n_out, dtype=np.int64)
+    chosen[0], chosen[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo = hi
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = (next_lo + next_hi - 1) / 2
+        avg_y = y[next_lo:next_hi].mean()
+
+        # Keep the point forming the largest triangle with the previous pick and the next bucket's average
+        xs = np.arange(lo, hi)
+        area = np.abs((a - avg_x) * (y[lo:hi] - y[a]) - (a - xs) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        chosen[i + 1] = a
+    return chosen
+
+
+def downsample_indices(series, max_points):
+    """
+    Shared row selection for several aligned series: the union of each
+    series' LTTB points, never more than 'max_points' rows in total.
+    'max_points' of 0/None keeps every row; otherwise LTTB needs at least
+    3 points per series.
+    """
+    n = len(series[0])
+    if not max_points or n <= max_points:
+        return np.arange(n)
+    per_series = max_points // len(series)
+    if per_series < 3:
+        raise ValueError(f"max_points must be 0 (all rows) or at least {3 * len(series)} for {len(series)} series.")
+    return np.unique(np.concatenate([lttb_indices(np.asarray(s, dtype=np.float64), per_series) for s in series]))
+
+
+def shape_chart(payload, fmt="records", max_points=None):
+    """
+    Builds the /run-backtest/ response from a full-resolution payload:
+    downsampled to at most 'max_points' rows, then either one object per
+    row ('records') or parallel arrays ('columnar').
+    """
+    if fmt not in CHART_FORMATS:
+        raise ValueError(f"Unknown format '{fmt}', expected one of {CHART_FORMATS}.")
+
+    chart = payload["chart"]
+    rows = downsample_indices([chart["market"], chart["strategy"]], max_points)
+    columns = {
+        "date": chart["date"][rows].tolist(),
+        "market": chart["market"][rows].tolist(),
+        "strategy": chart["strategy"][rows].tolist(),
+    }
+
+    response = {
+        "ticker": payload["ticker"],
+        "total_return": payload["total_return"],
+        "points": len(rows),
+        "total_points": len(chart["date"]),
+    }
+    if fmt == "columnar":
+        response["chart"] = columns
+    else:
+        response["chart_data"] = [dict(zip(columns, values)) for values in zip(*columns.values())]
+    return response
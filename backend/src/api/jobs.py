@@ -0,0 +1,182 @@
+import asyncio
+import functools
+import json
+import time
+import uuid
+from collections import OrderedDict
+
+from src.parser.extraction_cache import extract_strategy_from_pdf
+from src.parser.generator import save_strategy_file
+from src.parser.smoke import smoke_test_strategy
+from src.parser.validator import LogicValidator
+from src.monitoring.stats import stats
+from src.strategies.registry import GENERATED_DIR
+
+STAGES = ("rendering", "extraction", "validation", "smoke_test", "codegen")
+
+
+def analyze_paper_pipeline(pdf_path, report, client=None, cache=None, output_dir=GENERATED_DIR):
+    """
+    PHASE 1 pipeline (blocking): PDF -> images -> strategy JSON -> .py file.
+    'report(stage, **detail)' is called as each stage starts; 'client' can be
+    a local stand-in for the model (e.g. FakeModelClient).
+    Rendering and extraction are skipped when the paper is in the cache.
+    """
+    strategy_data = extract_strategy_from_pdf(pdf_path, client=client, cache=cache, report=report)
+    if not strategy_data:
+        raise ValueError("Could not read the PDF or extract its logic")
+
+    is_valid, message = LogicValidator.validate_strategy(strategy_data)
+    report("validation", valid=is_valid, message=message)
+    if not is_valid:
+        raise ValueError(f"Strategy logic rejected: {message}")
+
+    report("smoke_test")
+    smoke = smoke_test_strategy(strategy_data)
+    if not smoke["ok"]:
+        raise ValueError(f"Strategy failed the smoke test: {smoke['error']}")
+
+    report("codegen")
+    saved_path = save_strategy_file(strategy_data, output_dir=output_dir)
+
+    return {
+        "strategy_name": strategy_data['strategy_name'],
+        "description": strategy_data['description'],
+        "file_saved_at": saved_path,
+        "smoke_timings": smoke["timings"],
+    }
+
+
+class PaperJob:
+    """
+    State of one submitted paper plus the ordered list of progress events.
+    """
+    def __init__(self, pdf_path, filename):
+        self.id = uuid.uuid4().hex
+        self.pdf_path = pdf_path
+        self.filename = filename
+        self.status = "queued"
+        self.stage = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.events = []
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+    def emit(self, event, **detail):
+        self.events.append({"event": event, "time": time.time(), **detail})
+        # Wake every listener, then arm a fresh event for the next update
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "stage": self.stage,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class PaperJobQueue:
+    """
+    Background queue for paper analysis.
+
+    Jobs are picked up by 'concurrency' worker tasks; each pipeline runs in a
+    thread so PyMuPDF rendering and the blocking model client never stall the
+    event loop. Stage changes are pushed to listeners as they happen.
+
+    'client_factory' (e.g. FakeModelClient) builds the model client handed to
+    the pipeline for each job; by default the pipeline picks its own.
+    """
+    def __init__(self, pipeline=analyze_paper_pipeline, concurrency=2, max_jobs=200, client_factory=None):
+        self.pipeline = pipeline
+        self.client_factory = client_factory
+        self.concurrency = concurrency
+        self.max_jobs = max_jobs
+        self.jobs = OrderedDict()
+        self._queue = None
+        self._workers = []
+
+    def _ensure_workers(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    def submit(self, pdf_path, filename):
+        self._ensure_workers()
+        job = PaperJob(pdf_path, filename)
+        self.jobs[job.id] = job
+        self._prune()
+        job.emit("queued")
+        self._queue.put_nowait(job)
+        return job
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def _prune(self):
+        # Forget the oldest finished jobs once the table is full
+        for job_id in [j.id for j in self.jobs.values() if j.finished]:
+            if len(self.jobs) <= self.max_jobs:
+                break
+            del self.jobs[job_id]
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+
+            def report(stage, **detail):
+                # Called from the pipeline thread
+                def _apply():
+                    job.stage = stage
+                    job.emit("stage", stage=stage, **detail)
+                loop.call_soon_threadsafe(_apply)
+
+            try:
+                run = functools.partial(self.pipeline, job.pdf_path, report)
+                if self.client_factory is not None:
+                    run = functools.partial(run, client=self.client_factory())
+                with stats.stage("paper_job"):
+                    job.result = await loop.run_in_executor(None, run)
+                job.status = "done"
+                job.emit("done", result=job.result)
+            except Exception as e:
+                print(f"❌ Job {job.id} failed: {e}")
+                job.status = "failed"
+                job.error = str(e)
+                job.emit("failed", error=job.error)
+            finally:
+                stats.count("paper_jobs", status=job.status)
+                self._queue.task_done()
+
+    async def stream(self, job_id):
+        """
+        Yields Server-Sent Events for a job: past events first, then live
+        ones, until the job is done or failed.
+        """
+        job = self.jobs[job_id]
+        sent = 0
+        while True:
+            changed = job._changed
+            while sent < len(job.events):
+                event = job.events[sent]
+                sent += 1
+                yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+            if job.finished:
+                return
+            await changed.wait()
+
+    async def shutdown(self):
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        self._queue = None
@@ -0,0 +1,242 @@
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from src.backtester.data_store import COLUMNS
+from src.backtester.metrics import TRADING_DAYS
+from src.backtester.signals import has_kernel, strategy_raw_positions
+from src.backtester.streaming import warmup_window
+from src.strategies import kernels as kn
+
+# backend/data/bars: intraday bars too large for the daily OHLCVStore
+DEFAULT_BARS_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "bars")
+)
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(DEFAULT_BARS_DIR), "chunked_results")
+DEFAULT_CHUNK = 1_000_000
+RESULT_COLUMNS = ["close", "position", "market_return", "strategy_return", "cumulative_market", "cumulative_strategy"]
+
+
+class ChunkedBars:
+    """
+    Append-only columnar bars on disk: one raw float32 file per column plus
+    int64 dates, memory-mapped on read. 'meta.json' holds the committed row
+    count, so a crash mid-append never exposes a partial write.
+    """
+    def __init__(self, folder, columns=COLUMNS, reset=False):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+        meta = None if reset else self._read_meta()
+        self.meta = meta or {"rows": 0, "columns": list(columns)}
+        if meta is None:
+            for name in ["dates"] + self.meta["columns"]:
+                open(self._path(name), "wb").close()
+            self._write_meta()
+
+    @classmethod
+    def open(cls, ticker, root=DEFAULT_BARS_DIR):
+        return cls(os.path.join(root, re.sub(r'[^A-Za-z0-9._-]', '_', ticker)))
+
+    # --- Layout -------------------------------------------------------------
+
+    def _path(self, name):
+        return os.path.join(self.folder, f"{name}.i8" if name == "dates" else f"{name}.f32")
+
+    def _read_meta(self):
+        meta_path = os.path.join(self.folder, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            return json.load(f)
+
+    def _write_meta(self):
+        tmp_path = os.path.join(self.folder, f"meta.json.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, os.path.join(self.folder, "meta.json"))
+
+    @property
+    def rows(self):
+        return self.meta["rows"]
+
+    @property
+    def columns(self):
+        return self.meta["columns"]
+
+    # --- Writes -------------------------------------------------------------
+
+    def append(self, dates, columns):
+        """
+        Appends one block of bars: 'dates' (datetime-like) and
+        {column: values} for every stored column.
+        """
+        dates = np.asarray(pd.DatetimeIndex(dates).as_unit("ns").asi8, dtype=np.int64)
+        rows = self.rows
+        for name in ["dates"] + self.columns:
+            values = dates if name == "dates" else np.asarray(columns[name], dtype=np.float32)
+            if len(values) != len(dates):
+                raise ValueError(f"Column '{name}' has {len(values)} rows, expected {len(dates)}.")
+            path = self._path(name)
+            # Drop bytes from an append that never committed
+            os.truncate(path, rows * (8 if name == "dates" else 4))
+            with open(path, "ab") as f:
+                values.tofile(f)
+
+        self.meta["rows"] = rows + len(dates)
+        self._write_meta()
+
+    def import_csv(self, path, date_column="Date", chunksize=DEFAULT_CHUNK):
+        """
+        Streams a (large) OHLCV CSV into the files, 'chunksize' rows at a time.
+        """
+        for block in pd.read_csv(path, chunksize=chunksize):
+            date_col = next((c for c in block.columns if c.lower() == date_column.lower()), block.columns[0])
+            names = {str(c).strip().title(): c for c in block.columns}
+            self.append(pd.to_datetime(block[date_col]), {c: block[names[c]].to_numpy() for c in self.columns})
+        print(f"📥 {self.rows} bars stored in {self.folder}")
+
+    def import_store(self, store, ticker, chunksize=DEFAULT_CHUNK):
+        """
+        Copies a ticker from an OHLCVStore (float64 memmaps) in slices.
+        """
+        dates, columns = store.read_arrays(ticker)
+        for lo in range(0, len(dates), chunksize):
+            hi = lo + chunksize
+            self.append(dates[lo:hi], {c: columns[c][lo:hi] for c in self.columns})
+        print(f"📥 {self.rows} bars stored in {self.folder}")
+
+    # --- Reads --------------------------------------------------------------
+
+    def _map(self, name, lo=0, hi=None):
+        # Memory map of rows [lo, hi) only; unmapped once the array is dropped
+        hi = self.rows if hi is None else hi
+        dtype = np.int64 if name == "dates" else np.float32
+        if hi <= lo:
+            return np.array([], dtype=dtype)
+        return np.memmap(self._path(name), dtype=dtype, mode="r", offset=lo * np.dtype(dtype).itemsize, shape=(hi - lo,))
+
+    def dates(self, lo=0, hi=None):
+        return self._map("dates", lo, hi).view("datetime64[ns]")
+
+    def column(self, name, lo=0, hi=None):
+        return self._map(name, lo, hi)
+
+    def chunks(self, size=DEFAULT_CHUNK, warmup=0):
+        """
+        Yields (lo, hi, start, dates, {column: float64 array}) for every chunk
+        [lo, hi); arrays start 'warmup' bars earlier (at 'start') so rolling
+        indicators are already warm at 'lo'. Only one chunk is mapped at a time.
+        """
+        for lo in range(0, self.rows, size):
+            hi = min(lo + size, self.rows)
+            start = max(lo - warmup, 0)
+            yield lo, hi, start, np.array(self.dates(lo, hi)), {
+                name: self.column(name, start, hi).astype(np.float64) for name in self.columns
+            }
+
+
+class RunningStats:
+    """
+    Mean / variance (Chan et al. parallel update) and compounded drawdown
+    of a return stream fed in chunks; matches metrics.* on the whole series.
+    """
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.curve = 1.0
+        self.peak = 1.0
+        self.max_drawdown = 0.0
+
+    def update(self, returns):
+        returns = np.nan_to_num(returns)
+        if len(returns) == 0:
+            return
+        n, mean = len(returns), returns.mean()
+        m2 = ((returns - mean) ** 2).sum()
+        delta = mean - self.mean
+        total = self.n + n
+        self.m2 += m2 + delta ** 2 * self.n * n / total
+        self.mean += delta * n / total
+        self.n = total
+
+        curve = self.curve * np.cumprod(1 + returns)
+        peaks = np.maximum(self.peak, np.maximum.accumulate(curve))
+        self.max_drawdown = min(self.max_drawdown, float((curve / peaks - 1).min()))
+        self.curve, self.peak = float(curve[-1]), float(peaks[-1])
+
+    def sharpe(self, periods=TRADING_DAYS):
+        if self.n < 2:
+            return 0.0
+        std = np.sqrt(self.m2 / (self.n - 1))
+        return float(self.mean / std * np.sqrt(periods)) if std > 0 else 0.0
+
+
+def run_chunked(strategy, bars, output_dir, chunk_size=DEFAULT_CHUNK, warmup=None, periods=TRADING_DAYS):
+    """
+    Backtests 'strategy' over ChunkedBars one chunk at a time and appends the
+    per-bar results (the columns of BacktestEngine.run, float32) to
+    'output_dir'. Each chunk is preceded by 'warmup' bars of history
+    (default: warmup_window, sized from the strategy's indicators); position,
+    last close, compounded curves and the kernel's EMA/RMA state carry across
+    chunks, so peak memory depends on chunk_size + warmup, not on the length
+    of history.
+    """
+    use_kernel = has_kernel(strategy, "entry_positions")
+    warmup = warmup if warmup is not None else warmup_window(strategy, carried=use_kernel)
+    results = ChunkedBars(output_dir, columns=RESULT_COLUMNS, reset=True)
+
+    # Carried state
+    held, prev_close, prev_position = 0.0, np.nan, np.nan
+    kernel_state = kn.CarriedState()
+    market_stats, strategy_stats = RunningStats(), RunningStats()
+
+    print(f"🧱 Chunked run over {bars.rows} bars ({chunk_size} per chunk, {warmup} warm-up)...")
+    for lo, hi, start, dates, columns in bars.chunks(chunk_size, warmup):
+        offset = lo - start
+        prices = pd.DataFrame({name.lower(): values for name, values in columns.items()})
+
+        # 1. Positions for [lo, hi), computed with the warm-up bars in view;
+        #    the hold rule continues from the previous chunk's last position
+        with kn.carry(kernel_state, whole_history=start == 0, new_bars=hi - lo):
+            position, raw = strategy_raw_positions(strategy, prices)
+        if position is None:
+            position, raw = np.zeros(hi - start), False
+        position = position[offset:]
+        if raw:
+            position = kn.hold_positions(position, initial=held).astype(np.float64)
+        held = position[-1]
+
+        # 2. Returns, with the previous chunk's last close and position
+        close = prices["close"].to_numpy()[offset:]
+        market_return = close / np.concatenate([[prev_close], close[:-1]]) - 1
+        strategy_return = np.concatenate([[prev_position], position[:-1]]) * market_return
+        prev_close, prev_position = close[-1], position[-1]
+
+        # 3. Compound and write this chunk
+        cumulative_market = market_stats.curve * np.cumprod(1 + np.nan_to_num(market_return))
+        cumulative_strategy = strategy_stats.curve * np.cumprod(1 + np.nan_to_num(strategy_return))
+        market_stats.update(market_return)
+        strategy_stats.update(strategy_return)
+        results.append(dates, {
+            "close": close,
+            "position": position,
+            "market_return": market_return,
+            "strategy_return": strategy_return,
+            "cumulative_market": cumulative_market,
+            "cumulative_strategy": cumulative_strategy,
+        })
+
+    summary = {
+        "bars": bars.rows,
+        "total_return": strategy_stats.curve - 1,
+        "market_return": market_stats.curve - 1,
+        "sharpe": strategy_stats.sharpe(periods),
+        "max_drawdown": strategy_stats.max_drawdown,
+        "output_dir": output_dir,
+    }
+    print(f"✅ Chunked Backtest Complete. 💰 Total Return: {summary['total_return']:.2%}")
+    return summary
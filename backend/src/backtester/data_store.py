@@ -0,0 +1,302 @@
+import glob
+import json
+import os
+import re
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from src.monitoring.stats import stats
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single-process use only
+    fcntl = None
+
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# backend/data/ohlcv, independent of the current working directory
+DEFAULT_STORE_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "ohlcv")
+)
+
+
+def download_yahoo(ticker, start, end):
+    """
+    Fetches daily bars from Yahoo Finance and returns them with the store's columns.
+    """
+    import yfinance as yf  # loaded on first download, not by every backtest
+
+    df = yf.download(ticker, start=start, end=end, progress=False)
+
+    # Flatten MultiIndex columns if necessary (yfinance update quirk)
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+
+    # Ensure we have a clean 'Close' column
+    if 'Close' not in df.columns and 'Adj Close' in df.columns:
+        df['Close'] = df['Adj Close']
+
+    return df
+
+
+class OHLCVStore:
+    """
+    On-disk columnar cache of daily OHLCV bars, one folder per ticker.
+
+    Every column is saved as its own .npy file and memory-mapped on read, so
+    serving a date range is a slice of the mapped file rather than a parse.
+    'meta.json' records which date range has already been fetched; requests
+    only download the gaps at either end of that range, so it stays one
+    contiguous interval. Writers (and readers) take a per-ticker file lock,
+    which keeps pool workers updating the same ticker from racing.
+    """
+    def __init__(self, root=DEFAULT_STORE_DIR, fetcher=download_yahoo):
+        self.root = root
+        self.fetcher = fetcher
+        os.makedirs(self.root, exist_ok=True)
+
+    # --- Layout -------------------------------------------------------------
+
+    def _ticker_dir(self, ticker):
+        return os.path.join(self.root, re.sub(r'[^A-Za-z0-9._-]', '_', ticker))
+
+    @contextmanager
+    def _locked(self, ticker, exclusive=True):
+        # Advisory lock on <ticker>/.lock: exclusive for writes, shared for reads
+        folder = self._ticker_dir(ticker)
+        os.makedirs(folder, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(folder, ".lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read_meta(self, ticker):
+        meta_path = os.path.join(self._ticker_dir(ticker), "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            return json.load(f)
+
+    def tickers(self):
+        """
+        Lists the tickers that have bars in the store.
+        """
+        found = []
+        for meta_path in glob.glob(os.path.join(self.root, "*", "meta.json")):
+            with open(meta_path) as f:
+                found.append(json.load(f)["ticker"])
+        return sorted(found)
+
+    def coverage(self, ticker):
+        """
+        Returns the (start, end) range already fetched for a ticker, end exclusive.
+        """
+        meta = self._read_meta(ticker)
+        if meta is None:
+            return None
+        return pd.Timestamp(meta["start"]), pd.Timestamp(meta["end"])
+
+    def missing_ranges(self, ticker, start, end):
+        """
+        Returns the [start, end) ranges that still have to be downloaded.
+        """
+        start = pd.Timestamp(start)
+        # Never mark the future (or today's unfinished bar) as covered
+        end = min(pd.Timestamp(end), pd.Timestamp.today().normalize())
+        if start >= end:
+            return []
+
+        covered = self.coverage(ticker)
+        if covered is None:
+            return [(start, end)]
+
+        # Gaps run up to / from the covered range even when the request lies
+        # wholly outside it, so coverage never jumps over unfetched days
+        cov_start, cov_end = covered
+        gaps = []
+        if start < cov_start:
+            gaps.append((start, cov_start))
+        if end > cov_end:
+            gaps.append((cov_end, end))
+        return gaps
+
+    # --- Reads --------------------------------------------------------------
+
+    def read_arrays(self, ticker, start=None, end=None):
+        """
+        Zero-copy read: returns (dates, {column: array}) as views into the
+        memory-mapped column files, restricted to [start, end).
+        """
+        if self._read_meta(ticker) is None:
+            return np.array([], dtype="datetime64[ns]"), {c: np.array([]) for c in COLUMNS}
+
+        # Maps stay valid after the lock is released, even once a writer drops this version
+        with self._locked(ticker, exclusive=False):
+            dates, files = self._map_columns(ticker)
+
+        lo = 0 if start is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start), "ns"), side="left")
+        hi = len(dates) if end is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(end), "ns"), side="left")
+
+        columns = {col: values[lo:hi] for col, values in files.items()}
+        return dates[lo:hi], columns
+
+    def _map_columns(self, ticker):
+        # Memory-maps the current version (caller holds the ticker lock)
+        meta = self._read_meta(ticker)
+        if meta is None or meta["rows"] == 0:
+            return np.array([], dtype="datetime64[ns]"), {c: np.array([]) for c in COLUMNS}
+        folder = self._ticker_dir(ticker)
+        version = meta["version"]
+        dates = np.load(os.path.join(folder, f"dates.{version}.npy"), mmap_mode="r")
+        files = {col: np.load(os.path.join(folder, f"{col}.{version}.npy"), mmap_mode="r")
+                 for col in meta["columns"]}
+        return dates, files
+
+    @staticmethod
+    def _frame(dates, columns):
+        df = pd.DataFrame(columns, index=pd.DatetimeIndex(dates, name="Date"))
+        return df[[c for c in COLUMNS if c in df.columns]]
+
+    def read(self, ticker, start=None, end=None):
+        """
+        Returns the stored bars in [start, end) as a DataFrame indexed by date.
+        The frame owns a copy of the bars; use read_arrays() for zero-copy access.
+        """
+        return self._frame(*self.read_arrays(ticker, start, end))
+
+    def get(self, ticker, start, end):
+        """
+        Fills any missing date ranges from the fetcher, then serves [start, end)
+        from disk. Fetch errors are reported and whatever is stored is returned,
+        so the engine keeps working offline.
+        """
+        gaps = self.missing_ranges(ticker, start, end)
+        stats.count("store_requests", result="fill" if gaps else "hit")
+        for gap_start, gap_end in gaps:
+            print(f"🌐 Downloading {ticker} {gap_start.date()} -> {gap_end.date()}...")
+            try:
+                with stats.stage("download"):
+                    fresh = self.fetcher(ticker, gap_start.strftime("%Y-%m-%d"), gap_end.strftime("%Y-%m-%d"))
+            except Exception as e:
+                stats.count("download_errors")
+                print(f"⚠️ Download failed for {ticker}, serving cached bars only: {e}")
+                continue
+            if fresh is None or fresh.empty:
+                # Offline yfinance returns an empty frame: leave the gap uncovered to retry later
+                stats.count("download_errors")
+                print(f"⚠️ No bars returned for {ticker} {gap_start.date()} -> {gap_end.date()}, not marking it covered")
+                continue
+            self.write(ticker, fresh, covered=(gap_start, gap_end))
+
+        with stats.stage("store_read"):
+            return self.read(ticker, start, end)
+
+    # --- Writes -------------------------------------------------------------
+
+    @staticmethod
+    def _normalize(df):
+        df = df.copy()
+        renames = {c: str(c).strip().title() for c in df.columns}
+        df = df.rename(columns=renames).rename(columns={"Adj Close": "Adj_Close"})
+        if 'Close' not in df.columns and 'Adj_Close' in df.columns:
+            df['Close'] = df['Adj_Close']
+
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        df.index = index.as_unit("ns")
+
+        df = df[[c for c in COLUMNS if c in df.columns]].astype(np.float64)
+        return df[~df.index.duplicated(keep="last")].sort_index()
+
+    def write(self, ticker, df, covered=None):
+        """
+        Merges bars into the store and extends the covered range.
+        'covered' is the [start, end) range the bars were requested for;
+        it defaults to the span of the bars themselves.
+        """
+        df = self._normalize(df)
+
+        if covered is None:
+            if df.empty:
+                return
+            covered = (df.index[0], df.index[-1] + pd.Timedelta(days=1))
+        cov_start, cov_end = pd.Timestamp(covered[0]), pd.Timestamp(covered[1])
+
+        # Read-merge-write under the ticker lock, so concurrent writers don't drop each other's bars
+        with self._locked(ticker):
+            # (not self.read: a second flock on the same file would wait on our own lock)
+            existing = self._frame(*self._map_columns(ticker))
+            meta = self._read_meta(ticker)
+            if meta is not None:
+                cov_start = min(cov_start, pd.Timestamp(meta["start"]))
+                cov_end = max(cov_end, pd.Timestamp(meta["end"]))
+
+            # New bars win over stored ones for the same date
+            merged = pd.concat([existing, df])
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            self._write_columns(ticker, merged, cov_start, cov_end, meta)
+
+    def _write_columns(self, ticker, df, cov_start, cov_end, old_meta):
+        folder = self._ticker_dir(ticker)
+        os.makedirs(folder, exist_ok=True)
+        version = 0 if old_meta is None else old_meta["version"] + 1
+
+        # Write a new version of every column, then swap meta.json atomically
+        np.save(os.path.join(folder, f"dates.{version}.npy"), df.index.values.astype("datetime64[ns]"))
+        for col in df.columns:
+            np.save(os.path.join(folder, f"{col}.{version}.npy"), np.ascontiguousarray(df[col].values))
+
+        meta = {
+            "ticker": ticker,
+            "version": version,
+            "rows": len(df),
+            "columns": list(df.columns),
+            "start": cov_start.strftime("%Y-%m-%d"),
+            "end": cov_end.strftime("%Y-%m-%d"),
+        }
+        tmp_path = os.path.join(folder, f"meta.json.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(folder, "meta.json"))
+
+        # Drop superseded versions (open memory maps stay valid on POSIX)
+        for path in glob.glob(os.path.join(folder, "*.npy")):
+            if not path.endswith(f".{version}.npy"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    # --- Offline imports ----------------------------------------------------
+
+    def import_csv(self, path, ticker=None, date_column="Date"):
+        """
+        Imports a local OHLCV CSV (e.g. a Yahoo Finance export).
+        The ticker defaults to the file name without extension.
+        """
+        ticker = ticker or os.path.splitext(os.path.basename(path))[0]
+        df = pd.read_csv(path)
+
+        date_col = next((c for c in df.columns if c.lower() == date_column.lower()), df.columns[0])
+        df.index = pd.to_datetime(df.pop(date_col))
+
+        self.write(ticker, df)
+        print(f"📥 Imported {len(df)} bars for {ticker} from {path}")
+        return ticker
+
+    def import_csv_dir(self, directory, date_column="Date"):
+        """
+        Bulk-imports every '<TICKER>.csv' file in a directory.
+        """
+        return [
+            self.import_csv(path, date_column=date_column)
+            for path in sorted(glob.glob(os.path.join(directory, "*.csv")))
+        ]
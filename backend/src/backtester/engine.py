@@ -1,54 +1,51 @@
 import pandas as pd
 import numpy as np
-import yfinance as yf
-import importlib.util
 import os
-import sys
+from src.backtester.data_store import OHLCVStore
+from src.backtester import metrics, robustness, sweep, walk_forward
+from src.backtester.chunked import DEFAULT_BARS_DIR, DEFAULT_CHUNK, DEFAULT_RESULTS_DIR, ChunkedBars, run_chunked
+from src.backtester.signals import strategy_positions
+from src.backtester.indicators import IndicatorCache, data_version
+from src.backtester.streaming import StreamingEngine
+from src.fairness import portfolio
+from src.monitoring.stats import stats
+from src.strategies.registry import registry
 
 class BacktestEngine:
-    def __init__(self, start_date="2020-01-01", end_date="2023-01-01"):
+    def __init__(self, start_date="2020-01-01", end_date="2023-01-01", store=None, indicator_cache=None,
+                 strategies=None):
         self.start_date = start_date
         self.end_date = end_date
+        # Local bar cache: only missing date ranges hit the network
+        self.store = store if store is not None else OHLCVStore()
+        # Indicators shared by every strategy run through this engine (the session)
+        self.indicator_cache = indicator_cache if indicator_cache is not None else IndicatorCache()
+        # Generated strategy index (shared by every engine in the process)
+        self.strategies = strategies if strategies is not None else registry
 
     def load_strategy(self, strategy_name):
         """
-        Dynamically imports the generated strategy file.
+        A fresh instance of a generated strategy (see StrategyRegistry:
+        files are indexed once and only recompiled when they change).
         """
-        # Construct path to generated strategy
-        file_path = os.path.join("src", "strategies", "generated", f"{strategy_name}.py")
-        
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"Strategy file not found: {file_path}")
-
-        # Magic to import a file by path
-        spec = importlib.util.spec_from_file_location("StrategyModule", file_path)
-        module = importlib.util.module_from_spec(spec)
-        sys.modules["StrategyModule"] = module
-        spec.loader.exec_module(module)
-        
-        # Find the class (assuming it ends with 'Strategy')
-        for attribute_name in dir(module):
-            if attribute_name.endswith("Strategy"):
-                strategy_class = getattr(module, attribute_name)
-                return strategy_class()
-                
-        raise ValueError("No class ending with 'Strategy' found in file.")
+        return self.strategies.create(strategy_name)
+
+    def bind_indicators(self, strategy, ticker, df):
+        """
+        Points a generated strategy at the session's indicator cache for these bars.
+        """
+        if hasattr(strategy, "indicator_cache"):
+            strategy.indicator_cache = self.indicator_cache.view(ticker, data_version(df))
 
     def get_data(self, ticker):
         """
-        Fetches daily data from Yahoo Finance.
+        Returns daily data from the local store, downloading only the
+        date ranges it does not have yet from Yahoo Finance.
         """
         print(f"📉 Fetching data for {ticker}...")
-        df = yf.download(ticker, start=self.start_date, end=self.end_date, progress=False)
-        
-        # Flatten MultiIndex columns if necessary (yfinance update quirk)
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.get_level_values(0)
-            
-        # Ensure we have a clean 'Close' column
-        if 'Close' not in df.columns and 'Adj Close' in df.columns:
-            df['Close'] = df['Adj Close']
-            
+        with stats.stage("data_fetch"):
+            df = self.store.get(ticker, self.start_date, self.end_date)
+        stats.count("data_rows", len(df))
         return df
 
     def run(self, strategy_name, ticker="SPY"):
@@ -66,27 +63,173 @@ class BacktestEngine:
         # --- FIX: Normalize columns to lowercase immediately ---
         df.columns = [c.lower() for c in df.columns]
 
-        # 2. Run Strategy Logic
+        # 2. Run Strategy Logic (NumPy kernel when the strategy has one)
         print(f"🧠 Running {strategy_name} on {ticker}...")
-        df = strategy.generate_signals(df)
+        self.bind_indicators(strategy, ticker, df)
+        with stats.stage("strategy_logic"):
+            position = strategy_positions(strategy, df)
         
         # --- FIX: Handle missing logic gracefully ---
-        # If strategy crashed and returned empty DF, stop here
-        if 'position' not in df.columns:
+        # If strategy crashed and returned no positions, stop here
+        if position is None:
             print("⚠️ Strategy failed to generate 'position' column.")
             return None
+        df['position'] = position
 
         # 3. Calculate Returns (Using lowercase 'close')
         # Strategy Return = Position * Market Return (shifted to avoid lookahead)
-        df['market_return'] = df['close'].pct_change()
-        df['strategy_return'] = df['position'].shift(1) * df['market_return']
-        
-        # 4. Calculate Cumulative Metrics
-        df['cumulative_market'] = (1 + df['market_return']).cumprod()
-        df['cumulative_strategy'] = (1 + df['strategy_return']).cumprod()
+        with stats.stage("returns"):
+            df['market_return'] = df['close'].pct_change()
+            df['strategy_return'] = df['position'].shift(1) * df['market_return']
+
+            # 4. Calculate Cumulative Metrics
+            df['cumulative_market'] = (1 + df['market_return']).cumprod()
+            df['cumulative_strategy'] = (1 + df['strategy_return']).cumprod()
         
         total_return = df['cumulative_strategy'].iloc[-1] - 1
         print(f"✅ Backtest Complete.")
         print(f"💰 Total Return: {total_return:.2%}")
         
-        return df
\ No newline at end of file
+        return df
+
+    def run_universe(self, strategy_name, tickers, return_curves=False):
+        """
+        Runs one strategy over many tickers at once.
+        All symbols are aligned into a single dates x tickers matrix, so
+        returns, shifting and compounding happen in one vectorized pass.
+        Returns {"summary": per-ticker DataFrame, "curves": dict or None}.
+        """
+        strategy = self.load_strategy(strategy_name)
+
+        # 1. Signals per ticker (strategies work on one series at a time)
+        closes, positions = {}, {}
+        for ticker in tickers:
+            df = self.get_data(ticker)
+            if df.empty:
+                print(f"⚠️ No data for {ticker}, skipping.")
+                continue
+
+            df.columns = [c.lower() for c in df.columns]
+            self.bind_indicators(strategy, ticker, df)
+            with stats.stage("strategy_logic"):
+                position = strategy_positions(strategy, df)
+            if position is None:
+                print(f"⚠️ Strategy failed to generate 'position' column for {ticker}.")
+                continue
+
+            closes[ticker] = df['close']
+            positions[ticker] = pd.Series(position, index=df.index)
+
+        if not closes:
+            print("❌ No data found.")
+            return None
+
+        # 2. Align into dates x tickers matrices (holidays differ across markets)
+        close = pd.DataFrame(closes).sort_index()
+        dates, names = close.index, list(close.columns)
+        bars = close.notna().sum().to_numpy()
+        close = close.ffill().to_numpy(dtype=np.float64)
+        position = pd.DataFrame(positions).reindex(index=dates, columns=names)
+        position = np.nan_to_num(position.ffill().to_numpy(dtype=np.float64))
+
+        # 3. Returns for every ticker at once (position shifted to avoid lookahead)
+        market_return = np.zeros_like(close)
+        market_return[1:] = np.nan_to_num(close[1:] / close[:-1] - 1)
+        strategy_return = np.zeros_like(close)
+        strategy_return[1:] = position[:-1] * market_return[1:]
+
+        summary = pd.DataFrame({
+            "total_return": metrics.total_return(strategy_return),
+            "market_return": metrics.total_return(market_return),
+            "sharpe": metrics.sharpe_ratio(strategy_return),
+            "max_drawdown": metrics.max_drawdown(strategy_return),
+            "bars": bars,
+        }, index=pd.Index(names, name="ticker"))
+
+        curves = None
+        if return_curves:
+            curves = {
+                "market": pd.DataFrame(np.cumprod(1 + market_return, axis=0), index=dates, columns=names),
+                "strategy": pd.DataFrame(np.cumprod(1 + strategy_return, axis=0), index=dates, columns=names),
+            }
+
+        print(f"✅ Universe Backtest Complete ({len(names)} tickers).")
+        return {"summary": summary, "curves": curves}
+
+
+    def sweep(self, strategy_name, ticker, param_grid, rank_by="sharpe", n_jobs=None):
+        """
+        Evaluates every parameter combination, e.g. {"lookback": range(3, 61)},
+        and returns a table ranked by 'rank_by'.
+        """
+        return sweep.run_sweep(self, strategy_name, ticker, param_grid, rank_by=rank_by, n_jobs=n_jobs)
+
+    def walk_forward(self, strategy_name, ticker, train_size=504, test_size=126, step=None,
+                     anchored=False, param_grid=None, rank_by="sharpe", n_jobs=None):
+        """
+        Rolling train/test evaluation with folds run in parallel; see
+        walk_forward.walk_forward. Returns {"folds", "aggregate"}.
+        """
+        return walk_forward.walk_forward(
+            self, strategy_name, ticker, train_size=train_size, test_size=test_size, step=step,
+            anchored=anchored, param_grid=param_grid, rank_by=rank_by, n_jobs=n_jobs,
+        )
+
+    def cross_validate(self, strategy_name, ticker, k=5, param_grid=None, rank_by="sharpe", n_jobs=None):
+        """
+        k-fold evaluation over contiguous blocks of history.
+        """
+        return walk_forward.cross_validate(
+            self, strategy_name, ticker, k=k, param_grid=param_grid, rank_by=rank_by, n_jobs=n_jobs,
+        )
+
+    def robustness(self, strategy_name, ticker="SPY", n_paths=robustness.DEFAULT_PATHS, method="stationary",
+                   block=robustness.DEFAULT_BLOCK, seed=None):
+        """
+        Bootstrap confidence bands for the run's total return, Sharpe and
+        max drawdown; see robustness.bootstrap.
+        """
+        results = self.run(strategy_name, ticker)
+        if results is None:
+            return None
+        with stats.stage("bootstrap"):
+            return robustness.bootstrap(results['strategy_return'].rename(strategy_name), n_paths=n_paths,
+                                        method=method, block=block, seed=seed)
+
+    def run_chunked(self, strategy_name, ticker, output_dir=None, chunk_size=DEFAULT_CHUNK,
+                    warmup=None, periods=metrics.TRADING_DAYS, bars_root=DEFAULT_BARS_DIR):
+        """
+        Out-of-core run over float32 bars in bars_root/<ticker> (see
+        ChunkedBars.import_csv / import_store). Results are appended to
+        'output_dir' chunk by chunk; returns the summary metrics.
+        """
+        bars = ChunkedBars.open(ticker, root=bars_root)
+        if bars.rows == 0:
+            print("❌ No data found.")
+            return None
+        output_dir = output_dir or os.path.join(DEFAULT_RESULTS_DIR, f"{strategy_name}-{os.path.basename(bars.folder)}")
+        strategy = self.load_strategy(strategy_name)
+        return run_chunked(strategy, bars, output_dir, chunk_size=chunk_size, warmup=warmup, periods=periods)
+
+    def bandit_portfolio(self, strategy_names, ticker="SPY", min_allocation=0.05, cost=0.0, seed=None):
+        """
+        Runs several strategies on 'ticker' and allocates capital between them
+        day by day with the fair Thompson sampler; see
+        portfolio.run_bandit_portfolio.
+        """
+        returns = portfolio.strategy_return_matrix(self, strategy_names, ticker)
+        if returns is None:
+            print("❌ No strategy returns to allocate.")
+            return None
+        with stats.stage("portfolio"):
+            result = portfolio.run_bandit_portfolio(returns, min_allocation=min_allocation, cost=cost, seed=seed)
+        print(f"✅ Bandit Portfolio Complete ({len(returns)} strategies). "
+              f"💰 Total Return: {result['summary']['total_return']:.2%}")
+        return result
+
+    def stream(self, strategy_name, window=None):
+        """
+        Paper-trading session: feed bars one at a time with
+        session.update(ticker, close, ...) instead of re-running history.
+        """
+        return StreamingEngine(self.load_strategy(strategy_name), window=window)
@@ -0,0 +1,116 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from src.monitoring.stats import stats
+
+
+def data_version(df):
+    """
+    Short fingerprint of a price frame (dates + close), so cached indicators
+    are only reused for exactly the same bars.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(pd.DatetimeIndex(df.index).asi8).tobytes())
+    close = next((c for c in df.columns if str(c).lower() == "close"), None)
+    if close is not None:
+        digest.update(np.ascontiguousarray(df[close].to_numpy(dtype=np.float64)).tobytes())
+    digest.update(str(len(df)).encode())
+    return digest.hexdigest()
+
+
+def compute_indicator(df, name, params):
+    """
+    Runs a pandas_ta indicator (e.g. 'rsi', {'length': 14}) and returns its
+    columns as a DataFrame, named exactly as 'append=True' would name them.
+    """
+    import pandas_ta  # noqa: F401 -- registers the df.ta accessor
+
+    result = getattr(df.ta, name)(**params)
+    if isinstance(result, pd.Series):
+        result = result.to_frame()
+    return result
+
+
+class IndicatorCache:
+    """
+    LRU cache of indicator columns shared by every strategy in a backtest
+    session, keyed by (ticker, data version, indicator, params).
+    Memory is bounded by 'max_bytes'; least recently used entries go first.
+    """
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                stats.count("indicator_cache", result="hit")
+                return self._entries[key]
+            self.misses += 1
+        stats.count("indicator_cache", result="miss")
+
+        value = compute()
+        size = int(value.memory_usage(index=False, deep=False).sum())
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = value
+                self.bytes += size
+            while self.bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= int(evicted.memory_usage(index=False, deep=False).sum())
+        return value
+
+    def __getstate__(self):
+        # Worker processes start with an empty cache of the same size
+        return {"max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def view(self, ticker, version):
+        """
+        Cache handle bound to one ticker's bars, handed to strategies.
+        """
+        return IndicatorView(self, ticker, version)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+
+class IndicatorView:
+    def __init__(self, cache, ticker, version):
+        self.cache = cache
+        self.ticker = ticker
+        self.version = version
+
+    def get(self, df, name, params):
+        key = (self.ticker, self.version, name, tuple(sorted(params.items())))
+        return self.cache.get(key, lambda: compute_indicator(df, name, params))
+
+
+def attach_indicators(df, specs, cache=None):
+    """
+    Adds the columns of every (name, params) indicator in 'specs' to df,
+    through the session cache when one is bound.
+    """
+    for name, params in specs:
+        if cache is not None:
+            columns = cache.get(df, name, params)
+        else:
+            columns = compute_indicator(df, name, params)
+        for column in columns.columns:
+            df[column] = columns[column].to_numpy()
+    return df
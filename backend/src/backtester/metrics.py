@@ -0,0 +1,32 @@
+import numpy as np
+
+TRADING_DAYS = 252
+
+
+def total_return(returns, axis=0):
+    """
+    Compounded return of a return series (or of every column of a matrix).
+    Missing returns count as flat days.
+    """
+    return np.prod(1 + np.nan_to_num(returns), axis=axis) - 1
+
+
+def sharpe_ratio(returns, periods=TRADING_DAYS, axis=0):
+    """
+    Annualised Sharpe ratio (risk-free rate 0). Flat series score 0.
+    """
+    returns = np.nan_to_num(returns)
+    mean = returns.mean(axis=axis)
+    std = returns.std(axis=axis, ddof=1) if returns.shape[axis] > 1 else np.zeros_like(mean)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(periods), 0.0)
+    return sharpe
+
+
+def max_drawdown(returns, axis=0):
+    """
+    Largest peak-to-trough loss of the compounded curve, as a negative fraction.
+    """
+    curve = np.cumprod(1 + np.nan_to_num(returns), axis=axis)
+    peaks = np.maximum.accumulate(curve, axis=axis)
+    return (curve / peaks - 1).min(axis=axis)
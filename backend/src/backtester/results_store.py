@@ -0,0 +1,179 @@
+import datetime
+import json
+import os
+import sqlite3
+import time
+import zlib
+from contextlib import contextmanager
+
+import numpy as np
+
+# backend/data/results.sqlite, independent of the current working directory
+DEFAULT_RESULTS_DB = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "results.sqlite")
+)
+# Columns a leaderboard can rank by (each has a global and a per-ticker index)
+LEADERBOARD_METRICS = ("sharpe", "total_return", "max_drawdown")
+SUMMARY_COLUMNS = ("strategy", "strategy_hash", "ticker", "start_date", "end_date", "params",
+                   "total_return", "market_return", "sharpe", "max_drawdown", "bars", "created_at")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    strategy TEXT NOT NULL,
+    strategy_hash TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    params TEXT NOT NULL,
+    total_return REAL,
+    market_return REAL,
+    sharpe REAL,
+    max_drawdown REAL,
+    bars INTEGER,
+    created_at REAL NOT NULL,
+    dates BLOB,
+    market_curve BLOB,
+    strategy_curve BLOB,
+    UNIQUE (strategy_hash, ticker, start_date, end_date, params)
+);
+CREATE INDEX IF NOT EXISTS runs_strategy ON runs (strategy, ticker);
+""" + "".join(
+    f"CREATE INDEX IF NOT EXISTS runs_{m} ON runs ({m} DESC);\n"
+    f"CREATE INDEX IF NOT EXISTS runs_ticker_{m} ON runs (ticker, {m} DESC);\n"
+    for m in LEADERBOARD_METRICS
+)
+
+
+def pack_array(values, dtype):
+    return zlib.compress(np.ascontiguousarray(values, dtype=dtype).tobytes(), 6)
+
+
+def unpack_array(blob, dtype):
+    return np.frombuffer(zlib.decompress(blob), dtype=dtype)
+
+
+def canonical_params(params):
+    # Same parameters -> same key, whatever the dict order
+    return json.dumps(params or {}, sort_keys=True, separators=(",", ":"))
+
+
+def is_final(run):
+    """
+    True if the run's [start, end) range had already closed when it was
+    recorded, so its curve can no longer gain bars. Runs ending on or after
+    their record day (or with an unreadable end) must be recomputed.
+    """
+    try:
+        end = datetime.date.fromisoformat(str(run["end_date"])[:10])
+    except ValueError:
+        return False
+    return end <= datetime.date.fromtimestamp(run["created_at"])
+
+
+class ResultsStore:
+    """
+    SQLite table of finished backtests: summary metrics plus the
+    zlib-compressed date / market / strategy curves, one row per
+    (strategy hash, ticker, date range, parameters). Re-running the same
+    key replaces the row. Connections are opened per call, so the store can
+    be shared by threads and pool workers (WAL journal).
+    """
+    def __init__(self, path=DEFAULT_RESULTS_DB):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per call: committed on success, always closed
+        db = sqlite3.connect(self.path, timeout=30)
+        db.row_factory = sqlite3.Row
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def record(self, strategy, strategy_hash, ticker, start_date, end_date, dates, market_curve, strategy_curve,
+               summary, params=None):
+        """
+        Stores one run. 'dates' are datetime64 values, the curves float64
+        arrays and 'summary' holds total_return, market_return, sharpe,
+        max_drawdown and bars.
+        """
+        row = {
+            "strategy": strategy,
+            "strategy_hash": strategy_hash,
+            "ticker": ticker,
+            "start_date": start_date,
+            "end_date": end_date,
+            "params": canonical_params(params),
+            **{name: summary.get(name) for name in ("total_return", "market_return", "sharpe", "max_drawdown", "bars")},
+            "created_at": time.time(),
+            "dates": pack_array(np.asarray(dates, dtype="datetime64[ns]").view(np.int64), np.int64),
+            "market_curve": pack_array(market_curve, np.float64),
+            "strategy_curve": pack_array(strategy_curve, np.float64),
+        }
+        columns = ", ".join(row)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in row)
+        with self._connect() as db:
+            db.execute(
+                f"INSERT INTO runs ({columns}) VALUES ({', '.join('?' * len(row))}) "
+                f"ON CONFLICT (strategy_hash, ticker, start_date, end_date, params) DO UPDATE SET {updates}",
+                list(row.values()),
+            )
+
+    def get(self, strategy_hash, ticker, start_date, end_date, params=None):
+        """
+        The stored run for a key with its curves decompressed, or None.
+        """
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT * FROM runs WHERE strategy_hash = ? AND ticker = ? AND start_date = ? AND end_date = ? "
+                "AND params = ?",
+                (strategy_hash, ticker, start_date, end_date, canonical_params(params)),
+            ).fetchone()
+        if row is None:
+            return None
+        run = {c: row[c] for c in SUMMARY_COLUMNS}
+        run["params"] = json.loads(run["params"])
+        run["dates"] = unpack_array(row["dates"], np.int64).view("datetime64[ns]")
+        run["market_curve"] = unpack_array(row["market_curve"], np.float64)
+        run["strategy_curve"] = unpack_array(row["strategy_curve"], np.float64)
+        return run
+
+    def leaderboard(self, metric="sharpe", ticker=None, per_ticker=False, hashes=None, limit=20):
+        """
+        Best runs by 'metric' (highest first), served from the metric
+        indexes. per_ticker=True returns the top 'limit' of every ticker;
+        'hashes' restricts the ranking to those strategy versions.
+        """
+        if metric not in LEADERBOARD_METRICS:
+            raise ValueError(f"metric must be one of {LEADERBOARD_METRICS}")
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        if hashes is not None and not hashes:
+            return []
+
+        where, args = [], []
+        if ticker:
+            where.append("ticker = ?")
+            args.append(ticker)
+        if hashes is not None:
+            where.append(f"strategy_hash IN ({', '.join('?' * len(hashes))})")
+            args.extend(hashes)
+        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+        columns = ", ".join(SUMMARY_COLUMNS)
+
+        if per_ticker:
+            sql = (f"SELECT * FROM (SELECT {columns}, ROW_NUMBER() OVER (PARTITION BY ticker ORDER BY {metric} DESC) "
+                   f"AS rank FROM runs {where_sql}) WHERE rank <= ? ORDER BY ticker, rank")
+        else:
+            sql = f"SELECT {columns} FROM runs {where_sql} ORDER BY {metric} DESC LIMIT ?"
+
+        with self._connect() as db:
+            rows = db.execute(sql, args + [limit]).fetchall()
+        return [dict(row, params=json.loads(row["params"])) for row in rows]
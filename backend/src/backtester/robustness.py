@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+from src.backtester import metrics
+
+BOOTSTRAP_METHODS = ("stationary", "block")
+DEFAULT_PATHS = 10_000
+DEFAULT_BLOCK = 20
+# Paths resampled at once; bounds memory at about chunk x days x 8 bytes per array
+DEFAULT_CHUNK = 1_000
+DEFAULT_PERCENTILES = (5, 50, 95)
+METRICS = ("total_return", "sharpe", "max_drawdown")
+
+
+def stationary_indices(rng, n_paths, n_days, mean_block=DEFAULT_BLOCK):
+    """
+    Politis-Romano stationary bootstrap: each day starts a new block (at a
+    random day) with probability 1 / mean_block, otherwise continues the
+    current one, wrapping around the end. Returns (paths x days) indices.
+    """
+    new_block = rng.random((n_paths, n_days)) < 1.0 / mean_block
+    new_block[:, 0] = True
+
+    # Day each position's block started, and a random source day per block
+    flat = new_block.ravel()
+    positions = np.arange(flat.size)
+    block_start = np.maximum.accumulate(np.where(flat, positions, 0))
+    sources = rng.integers(0, n_days, int(flat.sum()))
+    block_id = np.cumsum(flat) - 1
+    return ((sources[block_id] + positions - block_start) % n_days).reshape(n_paths, n_days)
+
+
+def block_indices(rng, n_paths, n_days, block=DEFAULT_BLOCK):
+    """
+    Circular moving-block bootstrap: fixed 'block'-day runs starting at random
+    days. Returns (paths x days) indices.
+    """
+    n_blocks = -(-n_days // block)
+    sources = rng.integers(0, n_days, (n_paths, n_blocks))
+    days = np.arange(n_days)
+    return (sources[:, days // block] + days % block) % n_days
+
+
+def _indices(rng, method, n_paths, n_days, block):
+    if method == "stationary":
+        return stationary_indices(rng, n_paths, n_days, block)
+    if method == "block":
+        return block_indices(rng, n_paths, n_days, block)
+    raise ValueError(f"method must be one of {BOOTSTRAP_METHODS}")
+
+
+def resample_paths(returns, n_paths, method="stationary", block=DEFAULT_BLOCK, seed=None):
+    """
+    (paths x days) array of bootstrapped copies of one return series.
+    Missing returns count as flat days.
+    """
+    returns = np.nan_to_num(np.asarray(returns, dtype=np.float64))
+    rng = np.random.default_rng(seed)
+    return returns[_indices(rng, method, n_paths, len(returns), block)]
+
+
+def path_metrics(paths, periods=metrics.TRADING_DAYS):
+    """
+    Total return, Sharpe and max drawdown of every row of a (paths x days) array.
+    """
+    return {
+        "total_return": metrics.total_return(paths, axis=1),
+        "sharpe": metrics.sharpe_ratio(paths, periods=periods, axis=1),
+        "max_drawdown": metrics.max_drawdown(paths, axis=1),
+    }
+
+
+def bootstrap(returns, n_paths=DEFAULT_PATHS, method="stationary", block=DEFAULT_BLOCK,
+              percentiles=DEFAULT_PERCENTILES, chunk=DEFAULT_CHUNK, periods=metrics.TRADING_DAYS, seed=None):
+    """
+    Confidence bands for total return, Sharpe and max drawdown from
+    'n_paths' resampled versions of a strategy's daily returns.
+
+    'returns' is one series (1-D / Series) or a series x days matrix
+    (e.g. portfolio.strategy_return_matrix); every series is resampled with
+    the same day indices, so cross-strategy correlation is kept. Paths are
+    generated 'chunk' at a time, so memory does not grow with n_paths.
+
+    Returns a DataFrame with one row per (series, metric): the observed
+    value, the bootstrap mean and the requested percentiles ('p5', ...).
+    """
+    for name, value in (("n_paths", n_paths), ("block", block), ("chunk", chunk)):
+        if value < 1:
+            raise ValueError(f"{name} must be at least 1, got {value}")
+    if method not in BOOTSTRAP_METHODS:
+        raise ValueError(f"method must be one of {BOOTSTRAP_METHODS}")
+
+    # 1. Series x days, missing returns as flat days
+    if isinstance(returns, pd.DataFrame):
+        names, matrix = list(returns.index), returns.to_numpy(dtype=np.float64)
+    elif isinstance(returns, pd.Series):
+        names, matrix = [returns.name or "strategy"], returns.to_numpy(dtype=np.float64)[None, :]
+    else:
+        matrix = np.asarray(returns, dtype=np.float64)
+        matrix = matrix[None, :] if matrix.ndim == 1 else matrix
+        names = ["strategy"] if len(matrix) == 1 else list(range(len(matrix)))
+    matrix = np.nan_to_num(matrix)
+    n_series, n_days = matrix.shape
+
+    # 2. Resample chunk by chunk, keeping only the per-path metrics
+    rng = np.random.default_rng(seed)
+    samples = {name: np.empty((n_series, n_paths)) for name in METRICS}
+    for lo in range(0, n_paths, chunk):
+        hi = min(lo + chunk, n_paths)
+        indices = _indices(rng, method, hi - lo, n_days, block)
+        for s in range(n_series):
+            for name, values in path_metrics(matrix[s][indices], periods).items():
+                samples[name][s, lo:hi] = values
+
+    # 3. Bands next to the observed values
+    observed = path_metrics(matrix, periods)
+    rows = []
+    for s, series in enumerate(names):
+        for name in METRICS:
+            row = {"series": series, "metric": name, "observed": float(observed[name][s]),
+                   "mean": float(samples[name][s].mean())}
+            for q, value in zip(percentiles, np.percentile(samples[name][s], percentiles)):
+                row[f"p{q:g}"] = float(value)
+            rows.append(row)
+    return pd.DataFrame(rows).set_index(["series", "metric"])
@@ -0,0 +1,109 @@
+import json
+import os
+import tempfile
+import uuid
+
+import numpy as np
+import pandas as pd
+
+# RAM-backed where available, so the segment never touches disk
+SHARED_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+class SharedMarketData:
+    """
+    Aligned price arrays for one or more tickers in a single memory-mapped
+    segment that any number of worker processes attach to read-only.
+
+    The segment holds int64 dates followed by a float64 (tickers x columns x
+    dates) block; the manifest (path, tickers, columns, dates) is all that
+    gets pickled, so handing this object to a pool costs a few hundred bytes
+    and every worker reads the same physical pages.
+    """
+    def __init__(self, manifest, owner=False):
+        self.manifest = manifest
+        self.owner = owner
+        self.tickers = manifest["tickers"]
+        self.columns = manifest["columns"]
+        self._index = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+        n_dates = manifest["n_dates"]
+        shape = (len(self.tickers), len(self.columns), n_dates)
+        dates = np.memmap(manifest["path"], dtype=np.int64, mode="r", shape=(n_dates,))
+        self.dates = dates.view(f"datetime64[{manifest['date_unit']}]")
+        self.prices = np.memmap(manifest["path"], dtype=np.float64, mode="r", offset=n_dates * 8, shape=shape)
+
+    @classmethod
+    def create(cls, frames, folder=SHARED_DIR):
+        """
+        Writes {ticker: OHLCV DataFrame} into a new segment, aligned on the
+        union of their dates (bars a ticker does not have are NaN).
+        Columns are taken from the first frame.
+        """
+        if not frames:
+            raise ValueError("No market data to share.")
+        columns = [str(c) for c in next(iter(frames.values())).columns]
+        dates = pd.DatetimeIndex(sorted(set().union(*(df.index for df in frames.values()))))
+
+        manifest = {
+            "path": os.path.join(folder, f"alpha-market-{os.getpid()}-{uuid.uuid4().hex[:8]}.bin"),
+            "tickers": list(frames),
+            "columns": columns,
+            "n_dates": len(dates),
+            "date_unit": dates.unit,
+        }
+
+        # 1. Dates, then one (columns x dates) block per ticker
+        with open(manifest["path"], "wb") as f:
+            np.asarray(dates.asi8, dtype=np.int64).tofile(f)
+            for df in frames.values():
+                aligned = df.reindex(index=dates, columns=columns)
+                np.ascontiguousarray(aligned.to_numpy(dtype=np.float64).T).tofile(f)
+
+        print(f"🧩 Shared {len(frames)} ticker(s) x {len(dates)} bars in {manifest['path']}")
+        return cls(manifest, owner=True)
+
+    @classmethod
+    def attach(cls, manifest):
+        """
+        Read-only view of a segment created elsewhere (manifest dict or JSON).
+        """
+        return cls(json.loads(manifest) if isinstance(manifest, str) else manifest)
+
+    def __getstate__(self):
+        # Pickles as its manifest; the receiving process maps the same file
+        return {"manifest": self.manifest}
+
+    def __setstate__(self, state):
+        self.__init__(state["manifest"])
+
+    def arrays(self, ticker):
+        """
+        {column: read-only float64 array} over every shared date (no copy).
+        """
+        block = self.prices[self._index[ticker]]
+        return {column: block[j] for j, column in enumerate(self.columns)}
+
+    def frame(self, ticker):
+        """
+        The ticker's bars as a DataFrame backed by the shared pages. Dates
+        the ticker has no bar for are dropped (which copies only in that case).
+        """
+        block = self.prices[self._index[ticker]]
+        df = pd.DataFrame(block.T, index=pd.DatetimeIndex(self.dates, name="Date"), columns=self.columns, copy=False)
+        present = ~np.isnan(block).all(axis=0)
+        return df if present.all() else df[present]
+
+    def close(self):
+        """
+        Removes the segment (owner only); attached workers keep their mapping.
+        """
+        self.prices = self.dates = None
+        if self.owner and os.path.exists(self.manifest["path"]):
+            os.remove(self.manifest["path"])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,66 @@
+import numpy as np
+
+PRICE_FIELDS = ("close", "high", "low", "volume")
+
+
+def price_arrays(df):
+    """
+    Contiguous float64 (close, high, low, volume) arrays from an OHLCV frame,
+    matching column names case-insensitively. Missing fields are None.
+    """
+    columns = {str(c).lower(): c for c in df.columns}
+    return tuple(
+        np.ascontiguousarray(df[columns[name]].to_numpy(dtype=np.float64)) if name in columns else None
+        for name in PRICE_FIELDS
+    )
+
+
+def has_kernel(strategy, entry_point="generate_positions"):
+    """
+    True if the strategy has that NumPy entry point and the generator checked
+    it against generate_signals ('kernel_verified'). Unchecked kernels are
+    never preferred over the DataFrame path.
+    """
+    return getattr(strategy, "kernel_verified", False) is True and hasattr(strategy, entry_point)
+
+
+def strategy_positions(strategy, df):
+    """
+    Position per bar for 'df', or None if the strategy produced none.
+
+    Prefers the strategy's verified NumPy entry point 'generate_positions(close,
+    high, low, volume)' and falls back to the DataFrame 'generate_signals' path
+    when it is missing, unverified or fails.
+    """
+    if has_kernel(strategy):
+        try:
+            positions = strategy.generate_positions(*price_arrays(df))
+            return np.asarray(positions, dtype=np.float64)
+        except Exception as e:
+            print(f"⚠️ NumPy kernel failed, falling back to generate_signals: {e}")
+
+    signals = strategy.generate_signals(df)
+    if 'position' not in signals.columns:
+        return None
+    return np.nan_to_num(signals['position'].to_numpy(dtype=np.float64))
+
+
+def strategy_raw_positions(strategy, df):
+    """
+    Position each bar asks for before the hold rule (0/NaN = keep the
+    previous one), for runs that carry the held position across windows.
+    Returns (positions, raw): strategies that only expose held positions
+    (generated before 'raw_position' existed) give raw=False.
+    """
+    if has_kernel(strategy, "entry_positions"):
+        try:
+            return np.asarray(strategy.entry_positions(*price_arrays(df)), dtype=np.float64), True
+        except Exception as e:
+            print(f"⚠️ NumPy kernel failed, falling back to generate_signals: {e}")
+
+    signals = strategy.generate_signals(df)
+    if 'raw_position' in signals.columns:
+        return signals['raw_position'].to_numpy(dtype=np.float64), True
+    if 'position' not in signals.columns:
+        return None, False
+    return np.nan_to_num(signals['position'].to_numpy(dtype=np.float64)), False
@@ -0,0 +1,246 @@
+import ast
+import copy
+
+import numpy as np
+import pandas as pd
+
+from src.backtester.signals import PRICE_FIELDS, has_kernel, strategy_raw_positions
+from src.strategies import kernels as kn
+
+DEFAULT_WINDOW = 512
+MIN_WINDOW = 64
+# Indicators whose value depends on every earlier bar (exponential smoothing)
+RECURSIVE_INDICATORS = {"ema", "rma", "rsi", "atr", "natr", "macd", "ppo", "adx", "dema", "tema", "trix", "kc", "ewm"}
+# Arguments that hold a window length (besides positional ints)
+LENGTH_KEYWORDS = {"length", "fast", "slow", "signal", "window", "span", "com", "n", "period"}
+# pandas_ta / kernel defaults when a recursive indicator is called without a length
+DEFAULT_LENGTHS = {"macd": 26, "ppo": 26, "ema": 10, "rma": 10, "dema": 10, "tema": 10, "kc": 20}
+# Bars after which an exponential seed weighs less than float64 resolution, per unit of length
+SEED_DECAY_BARS = 37
+OUTPUT_COLUMNS = ("close", "position", "market_return", "strategy_return", "cumulative_market", "cumulative_strategy")
+
+
+def _length_value(node, lookback):
+    # Literal ints, and 'lookback' / 'self.lookback' as the strategy's value
+    if isinstance(node, ast.Constant) and isinstance(node.value, int) and not isinstance(node.value, bool):
+        return node.value
+    if isinstance(node, ast.Name) and node.id == "lookback":
+        return lookback
+    if isinstance(node, ast.Attribute) and node.attr == "lookback":
+        return lookback
+    return None
+
+
+def indicator_lengths(strategy):
+    """
+    (longest window, longest recursive indicator) a strategy uses, read from
+    its source (kn.*, .rolling, .ewm, df.ta.* calls) and its hoisted
+    indicator specs. Unreadable sources count as 'lookback' bars.
+    """
+    lookback = int(getattr(strategy, "lookback", 0) or 0)
+    calls = [(name, [v for k, v in params.items() if k in LENGTH_KEYWORDS and isinstance(v, int)])
+             for name, params in getattr(strategy, "indicators", None) or []]
+
+    try:
+        # Via a method's code object: generated modules are not always in sys.modules
+        with open(type(strategy).__init__.__code__.co_filename) as f:
+            tree = ast.parse(f.read())
+    except (AttributeError, OSError, SyntaxError):
+        tree = ast.Module(body=[], type_ignores=[])
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        func = node.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", "")
+        args = list(node.args) + [kw.value for kw in node.keywords if kw.arg in LENGTH_KEYWORDS]
+        calls.append((name, [v for v in (_length_value(arg, lookback) for arg in args) if v is not None]))
+
+    longest, recursive = lookback, 0
+    for name, values in calls:
+        length = max(values, default=0)
+        if name in RECURSIVE_INDICATORS:
+            length = length or DEFAULT_LENGTHS.get(name, 14)
+            recursive = max(recursive, length)
+        longest = max(longest, length)
+    return longest, recursive
+
+
+def warmup_window(strategy, carried=False):
+    """
+    Bars a StreamingBacktest keeps. Covers twice the longest indicator; when
+    recursive indicators are recomputed on the window (carried=False, i.e.
+    the pandas path) it also lets their seed decay below float64 resolution.
+    """
+    longest, recursive = indicator_lengths(strategy)
+    window = max(MIN_WINDOW, 2 * longest + 1)
+    if recursive and not carried:
+        window = max(window, (SEED_DECAY_BARS + 1) * recursive)
+    return window
+
+
+class RingBuffer:
+    """
+    Fixed-size float64 history. Every value is written twice (slot and
+    slot + capacity), so the last n values are always one contiguous view.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.count = 0
+        self._data = np.full(2 * capacity, np.nan)
+
+    def append(self, value):
+        slot = self.count % self.capacity
+        self._data[slot] = value
+        self._data[slot + self.capacity] = value
+        self.count += 1
+
+    def view(self):
+        """
+        Oldest-to-newest values currently held (no copy).
+        """
+        n = min(self.count, self.capacity)
+        end = (self.count - 1) % self.capacity + self.capacity + 1
+        return self._data[end - n:end]
+
+
+class StreamingBacktest:
+    """
+    One strategy on one symbol, fed one bar at a time.
+
+    Keeps the last 'window' bars in ring buffers and carries the held
+    position, PnL and cumulative curves between bars, so each update costs
+    the same no matter how long the history is. On the NumPy kernel path the
+    EMA/RMA state is carried too (kernels.carry), so recursive indicators
+    match BacktestEngine.run exactly and the window only has to span the
+    longest rolling window (see warmup_window and replay()).
+    """
+    def __init__(self, strategy, window=None):
+        self.strategy = strategy
+        self.use_kernel = has_kernel(strategy, "entry_positions")
+        self.window = window or warmup_window(strategy, carried=self.use_kernel)
+        self.buffers = {}
+        self.kernel_state = kn.CarriedState()
+
+        # Carried state
+        self.bars = 0
+        self.position = 0.0
+        self.last_close = np.nan
+        self.cumulative_market = 1.0
+        self.cumulative_strategy = 1.0
+
+    def _target_position(self):
+        # (position the newest bar asks for, whether it is raw or already held)
+        if self.use_kernel:
+            arrays = [self.buffers[name].view() if name in self.buffers else None for name in PRICE_FIELDS]
+            try:
+                # The window still holds every bar until it first fills up
+                with kn.carry(self.kernel_state, whole_history=self.bars < self.window):
+                    return float(self.strategy.entry_positions(*arrays)[-1]), True
+            except Exception as e:
+                # Its carried state is now out of step: stay on generate_signals
+                self.use_kernel = False
+                print(f"⚠️ NumPy kernel failed, falling back to generate_signals: {e}")
+
+        frame = pd.DataFrame({name: buffer.view() for name, buffer in self.buffers.items()})
+        positions, raw = strategy_raw_positions(self.strategy, frame)
+        return (np.nan if positions is None else float(positions[-1])), raw
+
+    def update(self, close, high=None, low=None, volume=None, date=None):
+        """
+        Adds one bar and returns that bar's row: position, market/strategy
+        return and the cumulative curves.
+        """
+        # 1. Append to the rolling history
+        bar = {"close": close, "high": high, "low": low, "volume": volume}
+        for name in PRICE_FIELDS:
+            if bar[name] is None:
+                continue
+            if name not in self.buffers:
+                self.buffers[name] = RingBuffer(self.window)
+            self.buffers[name].append(bar[name])
+
+        # 2. Returns use the position held going into this bar
+        market_return = close / self.last_close - 1
+        strategy_return = (self.position if self.bars else np.nan) * market_return
+
+        # 3. Compound (NaN bars are skipped, like cumprod)
+        cumulative_market = cumulative_strategy = np.nan
+        if not np.isnan(market_return):
+            self.cumulative_market *= 1 + market_return
+            cumulative_market = self.cumulative_market
+        if not np.isnan(strategy_return):
+            self.cumulative_strategy *= 1 + strategy_return
+            cumulative_strategy = self.cumulative_strategy
+
+        # 4. Hold the last non-zero position (replace(0, nan).ffill())
+        target, raw = self._target_position()
+        if raw:
+            if target != 0 and not np.isnan(target):
+                self.position = float(np.rint(target))
+        else:
+            self.position = 0.0 if np.isnan(target) else target
+
+        self.last_close = close
+        self.bars += 1
+        return {
+            "date": date,
+            "close": close,
+            "position": self.position,
+            "market_return": market_return,
+            "strategy_return": strategy_return,
+            "cumulative_market": cumulative_market,
+            "cumulative_strategy": cumulative_strategy,
+        }
+
+
+class StreamingEngine:
+    """
+    Paper-trading session: one StreamingBacktest per symbol, created on the
+    first bar each symbol receives.
+    """
+    def __init__(self, strategy, window=None):
+        self.strategy = strategy
+        self.window = window
+        self.books = {}
+
+    def update(self, ticker, close, high=None, low=None, volume=None, date=None):
+        if ticker not in self.books:
+            self.books[ticker] = StreamingBacktest(copy.copy(self.strategy), self.window)
+        return self.books[ticker].update(close, high, low, volume, date)
+
+    def positions(self):
+        return {ticker: book.position for ticker, book in self.books.items()}
+
+
+def replay(engine, strategy_name, ticker="SPY", window=None):
+    """
+    Feeds the bars of engine.run() one at a time through a StreamingBacktest
+    and checks that every output column is identical.
+    Returns {"bars", "mismatches": {column: count}, "frame": streamed rows}.
+    """
+    # 1. Batch reference
+    expected = engine.run(strategy_name, ticker)
+    if expected is None:
+        return None
+
+    # 2. Stream the same bars
+    stream = StreamingBacktest(engine.load_strategy(strategy_name), window)
+    fields = [name for name in PRICE_FIELDS if name in expected.columns]
+    columns = [expected[name].to_numpy(dtype=np.float64) for name in fields]
+    rows = []
+    for i, date in enumerate(expected.index):
+        rows.append(stream.update(**{name: values[i] for name, values in zip(fields, columns)}, date=date))
+    streamed = pd.DataFrame(rows).set_index("date")
+
+    # 3. Compare bit for bit (NaN == NaN)
+    mismatches = {}
+    for column in OUTPUT_COLUMNS:
+        a = expected[column].to_numpy(dtype=np.float64)
+        b = streamed[column].to_numpy(dtype=np.float64)
+        mismatches[column] = int(np.sum(~((a == b) | (np.isnan(a) & np.isnan(b)))))
+
+    if any(mismatches.values()):
+        print(f"❌ Replay mismatch for {strategy_name} on {ticker}: {mismatches}")
+    else:
+        print(f"✅ Replay matches run() on all {len(streamed)} bars.")
+    return {"bars": len(streamed), "mismatches": mismatches, "frame": streamed}
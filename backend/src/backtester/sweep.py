@@ -0,0 +1,112 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.backtester import metrics
+from src.backtester.shared_data import SharedMarketData
+from src.backtester.signals import strategy_positions
+
+
+def expand_grid(param_grid):
+    """
+    {"lookback": [10, 20], "threshold": [0, 1]} -> list of 4 parameter dicts.
+    """
+    names = list(param_grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(param_grid[n] for n in names))]
+
+
+def combo_positions(strategy, df, combos):
+    """
+    Evaluates the strategy once per parameter combination (NumPy kernel
+    when available). Returns a (dates x combos) position matrix.
+    """
+    positions = np.zeros((len(df), len(combos)), dtype=np.float64)
+    for j, combo in enumerate(combos):
+        for name, value in combo.items():
+            setattr(strategy, name, value)
+        position = strategy_positions(strategy, df)
+        if position is not None:
+            positions[:, j] = position
+    return positions
+
+
+def _positions_worker(engine, strategy_name, ticker, shared, combos):
+    # Runs inside a pool process: load a private strategy instance over the shared bars
+    df = shared.frame(ticker)
+    strategy = engine.load_strategy(strategy_name)
+    engine.bind_indicators(strategy, ticker, df)
+    return combo_positions(strategy, df, combos)
+
+
+def grid_positions(engine, strategy_name, ticker, df, combos, n_jobs=None):
+    """
+    Builds the (dates x combos) position matrix, fanning large grids out
+    over a process pool.
+    """
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1 or len(combos) < 2 * n_jobs:
+        strategy = engine.load_strategy(strategy_name)
+        engine.bind_indicators(strategy, ticker, df)
+        return combo_positions(strategy, df, combos)
+
+    # A few chunks per worker keeps the pool busy; tasks carry the shared
+    # segment's manifest instead of a pickled copy of df
+    n_chunks = min(len(combos), n_jobs * 4)
+    chunks = [list(c) for c in np.array_split(np.arange(len(combos)), n_chunks)]
+    with SharedMarketData.create({ticker: df}) as shared, ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        parts = pool.map(
+            _positions_worker,
+            itertools.repeat(engine),
+            itertools.repeat(strategy_name),
+            itertools.repeat(ticker),
+            itertools.repeat(shared),
+            [[combos[i] for i in chunk] for chunk in chunks],
+        )
+        return np.concatenate(list(parts), axis=1)
+
+
+def score_positions(close, positions):
+    """
+    Return metrics for every column of a (dates x combos) position matrix.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    market_return = np.zeros(len(close))
+    market_return[1:] = np.nan_to_num(close[1:] / close[:-1] - 1)
+
+    # Position shifted by one bar to avoid lookahead
+    strategy_return = np.zeros_like(positions)
+    strategy_return[1:] = positions[:-1] * market_return[1:, None]
+
+    return {
+        "total_return": metrics.total_return(strategy_return),
+        "sharpe": metrics.sharpe_ratio(strategy_return),
+        "max_drawdown": metrics.max_drawdown(strategy_return),
+    }
+
+
+def run_sweep(engine, strategy_name, ticker, param_grid, rank_by="sharpe", n_jobs=None):
+    """
+    Evaluates every combination of 'param_grid' and returns a ranked table
+    of total return, Sharpe and max drawdown (best first).
+    """
+    combos = expand_grid(param_grid)
+    if not combos:
+        raise ValueError("Parameter grid is empty.")
+
+    df = engine.get_data(ticker)
+    if df.empty:
+        print("❌ No data found.")
+        return None
+    df.columns = [c.lower() for c in df.columns]
+
+    print(f"🔬 Sweeping {len(combos)} combinations of {strategy_name} on {ticker}...")
+    positions = grid_positions(engine, strategy_name, ticker, df, combos, n_jobs=n_jobs)
+    scores = score_positions(df['close'].to_numpy(), positions)
+
+    table = pd.concat([pd.DataFrame(combos), pd.DataFrame(scores)], axis=1)
+    table = table.sort_values(rank_by, ascending=False).reset_index(drop=True)
+    print(f"✅ Sweep Complete. Best {rank_by}: {table[rank_by].iloc[0]:.3f}")
+    return table
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from src.backtester.metrics import TRADING_DAYS
+
+# (annual drift, annual volatility) per regime
+REGIMES = {
+    "bull": (0.15, 0.12),
+    "bear": (-0.20, 0.30),
+    "sideways": (0.0, 0.08),
+}
+# Probability of staying in the current regime from one bar to the next
+REGIME_PERSISTENCE = 0.995
+MINUTES_PER_DAY = 390
+
+
+def synthetic_ohlcv(n_bars, seed=0, start="2000-01-03", freq=None, start_price=100.0, bars_per_year=None):
+    """
+    Seeded OHLCV bars from a geometric Brownian motion whose drift and
+    volatility switch between REGIMES (a sticky Markov chain).
+    Columns match yfinance (Open, High, Low, Close, Volume); the index is
+    business days up to 50k bars and minutes beyond that (drift and
+    volatility are scaled to the bar size).
+    """
+    rng = np.random.default_rng(seed)
+    freq = freq or ("B" if n_bars <= 50_000 else "min")
+    bars_per_year = bars_per_year or (TRADING_DAYS if freq == "B" else TRADING_DAYS * MINUTES_PER_DAY)
+
+    # 1. Regime path: switch with probability 1 - persistence, to a random other regime
+    names = list(REGIMES)
+    switches = rng.random(n_bars) > REGIME_PERSISTENCE
+    jumps = np.where(switches, rng.integers(1, len(names), n_bars), 0)
+    regime = np.cumsum(jumps) % len(names)
+
+    # 2. GBM log returns with the regime's drift and volatility
+    drift = np.array([REGIMES[n][0] for n in names])[regime] / bars_per_year
+    vol = np.array([REGIMES[n][1] for n in names])[regime] / np.sqrt(bars_per_year)
+    log_returns = (drift - 0.5 * vol ** 2) + vol * rng.standard_normal(n_bars)
+    close = start_price * np.exp(np.cumsum(log_returns))
+
+    # 3. Bars around the close path
+    open_ = np.empty(n_bars)
+    open_[0] = start_price
+    open_[1:] = close[:-1]
+    wick = np.abs(rng.standard_normal(n_bars)) * vol * close * 0.5
+    high = np.maximum(open_, close) + wick
+    low = np.minimum(open_, close) - wick
+    volume = rng.lognormal(mean=13.0, sigma=0.4, size=n_bars) * (1 + 5 * np.abs(log_returns))
+
+    index = pd.date_range(start=start, periods=n_bars, freq=freq, name="Date")
+    return pd.DataFrame({
+        "Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume.round(),
+    }, index=index)
+
+
+class SyntheticStore:
+    """
+    Drop-in for OHLCVStore that serves synthetic bars (one seed per ticker),
+    for benchmarks and offline runs: BacktestEngine(store=SyntheticStore(n)).
+    """
+    def __init__(self, n_bars, seed=0):
+        self.n_bars = n_bars
+        self.seed = seed
+        self._frames = {}
+
+    def get(self, ticker, start=None, end=None):
+        if ticker not in self._frames:
+            seed = self.seed + sum(ticker.encode())
+            self._frames[ticker] = synthetic_ohlcv(self.n_bars, seed=seed)
+        return self._frames[ticker].copy()
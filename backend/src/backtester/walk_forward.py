@@ -0,0 +1,208 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.backtester import metrics
+from src.backtester.shared_data import SharedMarketData
+from src.backtester.sweep import combo_positions, expand_grid, score_positions
+
+# Market data for the current pool worker, set once by _init_worker
+_WORKER = {}
+
+
+def walk_forward_splits(n_bars, train_size, test_size, step=None, anchored=False):
+    """
+    Rolling (train, test) bar ranges: train on 'train_size' bars, test on the
+    next 'test_size', then move forward by 'step' (default: test_size).
+    With anchored=True every training window starts at bar 0.
+    Returns [((train_start, train_end), (test_start, test_end)), ...].
+    """
+    step = step or test_size
+    splits = []
+    start = 0
+    while start + train_size + test_size <= n_bars:
+        train = (0 if anchored else start, start + train_size)
+        test = (start + train_size, start + train_size + test_size)
+        splits.append((train, test))
+        start += step
+    return splits
+
+
+def kfold_splits(n_bars, k=5):
+    """
+    k contiguous test folds; each trains on every bar outside its fold.
+    Returns [((train_start, train_end) ranges, (test_start, test_end)), ...].
+    """
+    if k < 2:
+        raise ValueError("k must be at least 2.")
+    edges = np.linspace(0, n_bars, k + 1).astype(int)
+    splits = []
+    for i in range(k):
+        test = (int(edges[i]), int(edges[i + 1]))
+        train = [r for r in ((0, test[0]), (test[1], n_bars)) if r[1] > r[0]]
+        splits.append((train, test))
+    return splits
+
+
+def _window_score(close, positions, start, end):
+    # Includes the bar before 'start' so the first return inside the window counts
+    lo = max(start - 1, 0)
+    return score_positions(close[lo:end], positions[lo:end])
+
+
+def _select_params(strategy, df, close, train, combos, rank_by):
+    # Scores every combination on the training ranges and keeps the best one
+    end = max(r[1] for r in train)
+    positions = combo_positions(strategy, df.iloc[:end], combos)
+    returns = []
+    for start, stop in train:
+        lo = max(start - 1, 0)
+        market = close[lo + 1:stop] / close[lo:stop - 1] - 1
+        returns.append(positions[lo:stop - 1] * np.nan_to_num(market)[:, None])
+    returns = np.concatenate(returns)
+    scores = {
+        "total_return": metrics.total_return(returns),
+        "sharpe": metrics.sharpe_ratio(returns),
+        "max_drawdown": metrics.max_drawdown(returns),
+    }
+    best = int(np.argmax(scores[rank_by]))
+    return combos[best], float(scores[rank_by][best])
+
+
+def run_fold(strategy, df, fold, combos=None, rank_by="sharpe"):
+    """
+    Evaluates one (train, test) split: optionally re-tunes the parameters on
+    the training bars, then scores the test bars out of sample.
+    Returns (fold row, test strategy returns).
+    """
+    train, test = fold
+    train = [train] if isinstance(train[0], (int, np.integer)) else list(train)
+    close = df['close'].to_numpy(dtype=np.float64)
+
+    # 1. Re-tune on the training window
+    row = {}
+    if combos:
+        params, train_score = _select_params(strategy, df, close, train, combos, rank_by)
+        row.update(params)
+        row[f"train_{rank_by}"] = train_score
+    else:
+        params = {}
+
+    # 2. Positions use bars up to the end of the test window only (no lookahead)
+    positions = combo_positions(strategy, df.iloc[:test[1]], [params])
+    scores = _window_score(close, positions, *test)
+    market = _window_score(close, np.ones_like(positions), *test)
+
+    lo = max(test[0] - 1, 0)
+    returns = positions[lo:test[1] - 1, 0] * np.nan_to_num(close[lo + 1:test[1]] / close[lo:test[1] - 1] - 1)
+
+    row.update({
+        "train_start": df.index[min(r[0] for r in train)],
+        "train_end": df.index[max(r[1] for r in train) - 1],
+        "test_start": df.index[test[0]],
+        "test_end": df.index[test[1] - 1],
+        "total_return": float(scores["total_return"][0]),
+        "sharpe": float(scores["sharpe"][0]),
+        "max_drawdown": float(scores["max_drawdown"][0]),
+        "market_return": float(market["total_return"][0]),
+    })
+    return row, returns
+
+
+def _init_worker(engine, strategy_name, shared, ticker):
+    # Runs once per pool process: the shared bars and strategy are reused by every fold
+    _WORKER["strategy"] = engine.load_strategy(strategy_name)
+    _WORKER["df"] = shared.frame(ticker)
+
+
+def _fold_worker(fold, combos, rank_by):
+    return run_fold(_WORKER["strategy"], _WORKER["df"], fold, combos, rank_by)
+
+
+def stitch_returns(splits, fold_returns):
+    """
+    One out-of-sample return per bar from every fold's test returns.
+    Overlapping test windows (step < test_size) would count some bars twice;
+    each bar keeps the return of the latest fold that tested it.
+    """
+    # Bar each return belongs to (see run_fold: bars lo+1 .. test_end-1)
+    bars = np.concatenate([np.arange(max(test[0] - 1, 0) + 1, test[1]) for _, test in splits])
+    returns = np.concatenate(fold_returns)
+    order = np.argsort(bars, kind="stable")
+    bars, returns = bars[order], returns[order]
+    last = np.append(bars[1:] != bars[:-1], True)
+    return returns[last]
+
+
+def run_folds(engine, strategy_name, ticker, make_splits, param_grid=None, rank_by="sharpe", n_jobs=None):
+    """
+    Runs every split of make_splits(n_bars) across a process pool (workers
+    attach to one shared copy of the bars) and returns {"folds": per-fold DataFrame,
+    "aggregate": dict}. The aggregate stitches the out-of-sample test
+    returns of all folds together, counting every bar once (stitch_returns).
+    """
+    df = engine.get_data(ticker)
+    if df.empty:
+        print("❌ No data found.")
+        return None
+    df.columns = [c.lower() for c in df.columns]
+
+    splits = make_splits(len(df))
+    if not splits:
+        raise ValueError("Not enough history for a single fold.")
+    combos = expand_grid(param_grid) if param_grid else None
+
+    # 1. Evaluate folds (in-process when a pool would not pay off)
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(splits))
+    print(f"🧪 Evaluating {len(splits)} folds of {strategy_name} on {ticker}...")
+    if n_jobs == 1:
+        strategy = engine.load_strategy(strategy_name)
+        results = [run_fold(strategy, df, fold, combos, rank_by) for fold in splits]
+    else:
+        with SharedMarketData.create({ticker: df}) as shared, ProcessPoolExecutor(
+                max_workers=n_jobs, initializer=_init_worker, initargs=(engine, strategy_name, shared, ticker)) as pool:
+            results = list(pool.map(_fold_worker, splits, [combos] * len(splits), [rank_by] * len(splits)))
+
+    # 2. Per-fold table and stitched out-of-sample metrics
+    folds = pd.DataFrame([row for row, _ in results])
+    folds.index.name = "fold"
+    oos = stitch_returns(splits, [returns for _, returns in results])
+    aggregate = {
+        "folds": len(folds),
+        "oos_bars": len(oos),
+        "mean_return": float(folds["total_return"].mean()),
+        "mean_sharpe": float(folds["sharpe"].mean()),
+        "std_sharpe": float(folds["sharpe"].std(ddof=1)) if len(folds) > 1 else 0.0,
+        "worst_drawdown": float(folds["max_drawdown"].min()),
+        "hit_rate": float((folds["total_return"] > 0).mean()),
+        "oos_total_return": float(metrics.total_return(oos)),
+        "oos_sharpe": float(metrics.sharpe_ratio(oos)),
+        "oos_max_drawdown": float(metrics.max_drawdown(oos)),
+    }
+    print(f"✅ Out-of-sample Sharpe: {aggregate['oos_sharpe']:.3f} over {len(folds)} folds")
+    return {"folds": folds, "aggregate": aggregate}
+
+
+def walk_forward(engine, strategy_name, ticker, train_size=504, test_size=126, step=None,
+                 anchored=False, param_grid=None, rank_by="sharpe", n_jobs=None):
+    """
+    Rolling walk-forward test. Pass param_grid={"lookback": range(5, 121, 5)}
+    to re-tune the lookback on every training window.
+    """
+    return run_folds(
+        engine, strategy_name, ticker,
+        lambda n: walk_forward_splits(n, train_size, test_size, step=step, anchored=anchored),
+        param_grid=param_grid, rank_by=rank_by, n_jobs=n_jobs,
+    )
+
+
+def cross_validate(engine, strategy_name, ticker, k=5, param_grid=None, rank_by="sharpe", n_jobs=None):
+    """
+    k-fold cross-validation over contiguous blocks of history.
+    """
+    return run_folds(
+        engine, strategy_name, ticker, lambda n: kfold_splits(n, k),
+        param_grid=param_grid, rank_by=rank_by, n_jobs=n_jobs,
+    )
@@ -0,0 +1,90 @@
+import json
+import os
+import subprocess
+import sys
+
+from src.benchmarks.suite import BASE_DIR
+
+# The PDF / model stack and other heavy optional dependencies
+AI_MODULES = ("google.generativeai", "fitz", "PIL")
+HEAVY_MODULES = AI_MODULES + ("yfinance", "pandas_ta", "matplotlib", "torch", "stable_baselines3")
+
+# Writes a generated strategy (with a hoisted pandas_ta indicator) to a scratch folder
+_STRATEGY_SETUP = """
+import contextlib, importlib.util, io, tempfile
+from src.parser.generator import save_strategy_file
+data = {
+    "strategy_name": "Import Budget", "lookback_period": 14, "required_columns": ["close"],
+    "entry_logic": "df.ta.rsi(length=14, append=True); df['entry_signal'] = np.where(df['RSI_14'] < 30, 1, 0)",
+    "exit_logic": "False",
+}
+# Removed when the child exits
+folder = tempfile.TemporaryDirectory()
+with contextlib.redirect_stdout(io.StringIO()):
+    path = save_strategy_file(data, output_dir=folder.name)
+spec = importlib.util.spec_from_file_location("budget_strategy", path)
+"""
+
+# name -> what a cold process imports, its time budget (seconds) and the modules it must not load
+IMPORT_BUDGETS = {
+    "api": {"code": "import main", "seconds": 1.5, "forbidden": HEAVY_MODULES + ("pandas",)},
+    "backtester": {"code": "import src.backtester.engine", "seconds": 1.5, "forbidden": HEAVY_MODULES},
+    "parser": {"code": "import src.parser.extraction_cache, src.parser.generator, src.parser.smoke",
+               "seconds": 0.5, "forbidden": HEAVY_MODULES + ("pandas",)},
+    "rl_env": {"code": "import src.rl_agent.envs.tuning_env", "seconds": 2.0,
+               "forbidden": AI_MODULES + ("yfinance", "pandas_ta", "matplotlib")},
+    "generated_strategy": {"setup": _STRATEGY_SETUP,
+                           "code": "spec.loader.exec_module(importlib.util.module_from_spec(spec))",
+                           "seconds": 1.0, "forbidden": HEAVY_MODULES},
+}
+
+_CHILD = """
+import json, sys, time
+{setup}
+start = time.perf_counter()
+{code}
+print(json.dumps({{"seconds": time.perf_counter() - start, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure_import(code, setup="", repeats=3):
+    """
+    Seconds a fresh interpreter spends on 'code' (best of 'repeats') and the
+    modules loaded by the end of it.
+    """
+    best, modules = None, []
+    for _ in range(repeats):
+        proc = subprocess.run(
+            [sys.executable, "-c", _CHILD.format(setup=setup, code=code)],
+            cwd=BASE_DIR, capture_output=True, text=True, env=dict(os.environ, PYTHONWARNINGS="ignore"),
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if best is None or result["seconds"] < best:
+            best, modules = result["seconds"], result["modules"]
+    return best, modules
+
+
+def check_import_budgets(budgets=None, repeats=3):
+    """
+    Measures every entry of IMPORT_BUDGETS. Returns one row per entry:
+    {"name", "seconds", "budget", "loaded" (forbidden modules seen), "ok"}.
+    """
+    rows = []
+    for name, spec in (budgets or IMPORT_BUDGETS).items():
+        try:
+            seconds, modules = measure_import(spec["code"], spec.get("setup", ""), repeats=repeats)
+        except RuntimeError as e:
+            rows.append({"name": name, "seconds": None, "budget": spec["seconds"], "loaded": [], "ok": False,
+                         "error": str(e)})
+            continue
+        loaded = [m for m in spec["forbidden"] if m in modules]
+        rows.append({
+            "name": name,
+            "seconds": seconds,
+            "budget": spec["seconds"],
+            "loaded": loaded,
+            "ok": seconds <= spec["seconds"] and not loaded,
+        })
+    return rows
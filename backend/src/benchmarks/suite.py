@@ -0,0 +1,251 @@
+import contextlib
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from src.backtester.synthetic import SyntheticStore, synthetic_ohlcv
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RESULTS_DIR = os.path.join(BASE_DIR, "data", "benchmarks")
+BUNDLED_PDF = os.path.join(BASE_DIR, "data", "input_papers", "ts_momentum.pdf")
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+
+# Extraction used to generate the benchmark strategy (same shape as the model's output)
+BENCH_STRATEGY = {
+    "strategy_name": "Benchmark Momentum",
+    "description": "Long above the 'lookback'-bar average, short below it, flat near the rolling low.",
+    "asset_universe": "Synthetic",
+    "lookback_period": 20,
+    "required_columns": ["close"],
+    "entry_logic": "df['entry_signal'] = np.where(df['close'] > df['close'].rolling(lookback).mean(), 1, -1)",
+    "exit_logic": "df['exit_signal'] = (df['close'] < df['close'].rolling(lookback).min() * 1.01).astype(int)",
+    "numpy_logic": "entry_signal = np.where(close > kn.sma(close, lookback), 1, -1)\n"
+                   "exit_signal = (close < kn.rolling_min(close, lookback) * 1.01).astype(int)",
+}
+
+# name -> {"setup": setup(n) returning the timed callable, "sized", "max_bars", "per"}
+BENCHMARKS = {}
+
+
+def benchmark(name, sized=True, max_bars=None, per="call"):
+    """
+    Registers a benchmark. The decorated function does the (untimed) setup
+    for 'n' bars and returns the zero-argument callable that gets timed.
+    """
+    def register(setup):
+        BENCHMARKS[name] = {"setup": setup, "sized": sized, "max_bars": max_bars, "per": per}
+        return setup
+    return register
+
+
+def load_bench_strategy(with_kernel=True):
+    """
+    Generates the benchmark strategy from the real template into a temp
+    directory and returns its class (the directory is removed once loaded).
+    """
+    from src.parser.generator import save_strategy_file
+
+    data = dict(BENCH_STRATEGY)
+    if not with_kernel:
+        data.pop("numpy_logic")
+    with tempfile.TemporaryDirectory(prefix="bench_strategy_") as output_dir:
+        file_path = save_strategy_file(data, output_dir=output_dir)
+
+        spec = importlib.util.spec_from_file_location("BenchStrategyModule", file_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return module.BenchmarkMomentumStrategy
+
+
+def _engine(n, strategy_class):
+    from src.backtester.engine import BacktestEngine
+
+    engine = BacktestEngine(store=SyntheticStore(n))
+    engine.load_strategy = lambda name: strategy_class()
+    return engine
+
+
+@benchmark("engine.run[template]")
+def bench_engine_run_template(n):
+    engine = _engine(n, load_bench_strategy(with_kernel=False))
+    return lambda: engine.run("benchmark", ticker="SYN")
+
+
+@benchmark("engine.run[kernel]")
+def bench_engine_run_kernel(n):
+    engine = _engine(n, load_bench_strategy(with_kernel=True))
+    return lambda: engine.run("benchmark", ticker="SYN")
+
+
+@benchmark("template.generate_signals")
+def bench_generate_signals(n):
+    strategy = load_bench_strategy(with_kernel=False)()
+    df = synthetic_ohlcv(n)
+    return lambda: strategy.generate_signals(df)
+
+
+@benchmark("tuning_env.step", max_bars=1_000_000, per="1000 steps")
+def bench_env_step(n):
+    from src.rl_agent.envs.tuning_env import StrategyTuningEnv
+
+    env = StrategyTuningEnv(load_bench_strategy(with_kernel=True), synthetic_ohlcv(n))
+    actions = np.random.default_rng(0).integers(0, env.action_space.n, 1000)
+
+    def steps():
+        env.reset()
+        for action in actions:
+            _, _, done, _, _ = env.step(action)
+            if done:
+                env.reset()
+    return steps
+
+
+@benchmark("bandit.select_arm+update", sized=False, per="1000 rounds")
+def bench_bandit(n):
+    from src.fairness.bandit import FairThompsonSampler
+
+    rewards = np.random.default_rng(0).random((1000, 10)) < np.linspace(0.4, 0.6, 10)
+
+    def rounds():
+        bandit = FairThompsonSampler(n_arms=10, min_allocation=0.05)
+        for t in range(1000):
+            arm, _ = bandit.select_arm()
+            bandit.update(arm, rewards[t, arm])
+    return rounds
+
+
+@benchmark("pdf.convert_pdf_to_images", sized=False)
+def bench_pdf(n):
+    from src.parser.pdf_processor import convert_pdf_to_images
+
+    if not os.path.exists(BUNDLED_PDF):
+        raise FileNotFoundError(BUNDLED_PDF)
+    return lambda: convert_pdf_to_images(BUNDLED_PDF)
+
+
+def time_callable(fn, budget=2.0, max_repeats=20):
+    """
+    One warm-up call, then as many timed calls as fit in 'budget' seconds
+    (at least 1, at most max_repeats). Returns timing stats in seconds.
+    """
+    start = time.perf_counter()
+    fn()
+    first = time.perf_counter() - start
+
+    repeats = int(min(max(budget // max(first, 1e-9), 1), max_repeats))
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {
+        "repeats": repeats,
+        "min": min(times),
+        "median": float(np.median(times)),
+        "mean": float(np.mean(times)),
+    }
+
+
+def _quiet(fn):
+    # The engine and parser print progress; keep the benchmark output readable
+    def call():
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            return fn()
+    return call
+
+
+def run_suite(sizes=DEFAULT_SIZES, only=None, budget=2.0):
+    """
+    Runs every registered benchmark (or those whose name contains one of
+    'only') at each size. Failing setups (e.g. a missing optional
+    dependency) are recorded as skipped. Returns a list of result rows.
+    """
+    results = []
+    for name, spec in BENCHMARKS.items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        for n in (sizes if spec["sized"] else [None]):
+            if n and spec["max_bars"] and n > spec["max_bars"]:
+                continue
+            row = {"benchmark": name, "n": n, "per": spec["per"]}
+            try:
+                fn = _quiet(lambda: spec["setup"](n))()
+                row.update(time_callable(_quiet(fn), budget=budget))
+                print(f"⏱️  {name} n={n}: median {row['median'] * 1e3:.2f} ms ({row['repeats']} runs)")
+            except Exception as e:
+                row["skipped"] = f"{type(e).__name__}: {e}"
+                print(f"⏭️  {name} n={n}: skipped ({row['skipped']})")
+            results.append(row)
+    return results
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=BASE_DIR)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def save_results(results, results_dir=RESULTS_DIR, label=None):
+    """
+    Writes a run to results_dir/<timestamp>[-label].json with enough
+    environment info to tell runs apart. Returns the file path.
+    """
+    os.makedirs(results_dir, exist_ok=True)
+    now = datetime.now(timezone.utc)
+    run = {
+        "created": now.isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "label": label,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} cpus)",
+        "results": results,
+    }
+    name = now.strftime("%Y%m%dT%H%M%S") + (f"-{label}" if label else "") + ".json"
+    file_path = os.path.join(results_dir, name)
+    with open(file_path, "w") as f:
+        json.dump(run, f, indent=2)
+    return file_path
+
+
+def latest_results(results_dir=RESULTS_DIR, exclude=None):
+    """
+    Path of the most recent stored run (optionally skipping 'exclude').
+    """
+    if not os.path.isdir(results_dir):
+        return None
+    runs = sorted(f for f in os.listdir(results_dir) if f.endswith(".json"))
+    runs = [os.path.join(results_dir, f) for f in runs]
+    runs = [p for p in runs if not exclude or os.path.abspath(p) != os.path.abspath(exclude)]
+    return runs[-1] if runs else None
+
+
+def compare_results(baseline, current, threshold=0.10):
+    """
+    Matches rows by (benchmark, n) and reports median time ratios
+    (current / baseline). Ratios above 1 + threshold are regressions.
+    Returns a list of {"benchmark", "n", "baseline", "current", "ratio", "status"}.
+    """
+    base = {(r["benchmark"], r["n"]): r for r in baseline["results"] if "median" in r}
+    rows = []
+    for r in current["results"]:
+        old = base.get((r["benchmark"], r["n"]))
+        if old is None or "median" not in r:
+            continue
+        ratio = r["median"] / old["median"]
+        status = "slower" if ratio > 1 + threshold else "faster" if ratio < 1 - threshold else "same"
+        rows.append({
+            "benchmark": r["benchmark"], "n": r["n"],
+            "baseline": old["median"], "current": r["median"],
+            "ratio": ratio, "status": status,
+        })
+    return rows
@@ -1,5 +1,20 @@
 import numpy as np
 
+def fair_allocations(sampled_theta, min_allocation):
+    """
+    Turns sampled success rates into fair allocation weights along the last axis:
+    proportional to theta, floored at min_allocation, then re-normalized.
+    Works on a single (arms,) draw or a (replicas x arms) batch.
+    """
+    # Softmax-like allocation: allocate based on confidence, not just the max
+    allocations = sampled_theta / np.sum(sampled_theta, axis=-1, keepdims=True)
+
+    # Fairness Constraint: clip so everyone gets at least min_allocation
+    allocations = np.maximum(allocations, min_allocation)
+
+    # Re-normalize so they sum to 1.0
+    return allocations / np.sum(allocations, axis=-1, keepdims=True)
+
 class FairThompsonSampler:
     """
     A Multi-Armed Bandit that manages capital allocation across different strategies.
@@ -25,17 +40,8 @@ class FairThompsonSampler:
         # 1. Thompson Sampling: Draw a random probability from each arm's distribution
         sampled_theta = np.random.beta(self.alpha, self.beta)
         
-        # 2. Calculate Probabilities (Softmax-like allocation)
-        # Instead of just picking the max, we want to allocate based on confidence
-        total_theta = np.sum(sampled_theta)
-        allocations = sampled_theta / total_theta
-        
-        # 3. Apply Fairness Constraint (The "Dr. Jain" Logic)
-        # Clip allocations so everyone gets at least min_allocation
-        allocations = np.maximum(allocations, self.min_allocation)
-        
-        # Re-normalize so they sum to 1.0
-        allocations = allocations / np.sum(allocations)
+        # 2-3. Confidence-weighted allocation + Fairness Constraint (The "Dr. Jain" Logic)
+        allocations = fair_allocations(sampled_theta, self.min_allocation)
         
         # 4. Choose one arm based on these fair probabilities
         chosen_arm = np.random.choice(self.n_arms, p=allocations)
@@ -49,4 +55,43 @@ class FairThompsonSampler:
         if reward > 0:
             self.alpha[arm_index] += 1  # Success!
         else:
-            self.beta[arm_index] += 1   # Failure
\ No newline at end of file
+            self.beta[arm_index] += 1   # Failure
+
+class BatchedFairThompsonSampler:
+    """
+    Many independent FairThompsonSampler replicas advanced in lock-step.
+    Alpha/Beta are (replicas x arms) arrays, so one select/update call moves
+    every replica forward with a handful of vectorized NumPy operations.
+    """
+    def __init__(self, n_replicas, n_arms, min_allocation=0.05, seed=None):
+        self.n_replicas = n_replicas
+        self.n_arms = n_arms
+        self.min_allocation = min_allocation
+        self.rng = np.random.default_rng(seed)
+
+        # Uniform Beta(1, 1) prior for every replica/arm
+        self.alpha = np.ones((n_replicas, n_arms))
+        self.beta = np.ones((n_replicas, n_arms))
+
+    def select_arms(self):
+        """
+        Returns (chosen_arms, allocations): one arm per replica and the
+        (replicas x arms) fair weights it was drawn from.
+        """
+        sampled_theta = self.rng.beta(self.alpha, self.beta)
+        allocations = fair_allocations(sampled_theta, self.min_allocation)
+
+        # Inverse-CDF categorical draw, one uniform per replica
+        cdf = np.cumsum(allocations, axis=1)
+        u = self.rng.random((self.n_replicas, 1))
+        chosen_arms = np.minimum((cdf < u).sum(axis=1), self.n_arms - 1)
+        return chosen_arms, allocations
+
+    def update(self, chosen_arms, rewards):
+        """
+        Updates each replica's chosen arm; rewards is a (replicas,) array.
+        """
+        wins = (np.asarray(rewards) > 0).astype(np.float64)
+        rows = np.arange(self.n_replicas)
+        self.alpha[rows, chosen_arms] += wins
+        self.beta[rows, chosen_arms] += 1.0 - wins
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+from src.backtester import metrics
+from src.backtester.signals import strategy_positions
+from src.fairness.bandit import fair_allocations
+
+# Days processed per vectorized block (bounds memory for long histories)
+DEFAULT_BLOCK = 256
+
+
+def strategy_return_matrix(engine, strategy_names, ticker="SPY"):
+    """
+    Daily returns of several strategies on one ticker as a strategies x dates
+    DataFrame (the same returns BacktestEngine.run reports). Strategies that
+    fail to load or produce no positions are skipped.
+    """
+    df = engine.get_data(ticker)
+    if df.empty:
+        print("❌ No data found.")
+        return None
+    df.columns = [c.lower() for c in df.columns]
+    close = df['close'].to_numpy(dtype=np.float64)
+    market_return = np.full(len(close), np.nan)
+    market_return[1:] = close[1:] / close[:-1] - 1
+
+    rows = {}
+    for name in strategy_names:
+        try:
+            strategy = engine.load_strategy(name)
+        except FileNotFoundError as e:
+            print(f"⚠️ {e}, skipping.")
+            continue
+        engine.bind_indicators(strategy, ticker, df)
+        position = strategy_positions(strategy, df)
+        if position is None:
+            print(f"⚠️ Strategy {name} failed to generate 'position' column, skipping.")
+            continue
+
+        # Position shifted to avoid lookahead
+        strategy_return = np.full(len(close), np.nan)
+        strategy_return[1:] = position[:-1] * market_return[1:]
+        rows[name] = strategy_return
+
+    if not rows:
+        return None
+    return pd.DataFrame.from_dict(rows, orient="index", columns=df.index)
+
+
+def run_bandit_portfolio(returns, min_allocation=0.05, cost=0.0, seed=None, block=DEFAULT_BLOCK):
+    """
+    Backtests a portfolio whose daily weights come from the fair Thompson
+    sampler, rewarded with each strategy's realised return.
+
+    'returns' is a strategies x dates matrix (DataFrame or array). Every
+    morning the posterior is sampled and turned into fair_allocations weights;
+    after the close every arm is updated (return > 0 is a win, < 0 a loss;
+    flat or missing days leave it unchanged and earn nothing). 'cost' is
+    charged per unit of turnover.
+
+    Returns {"equity", "returns", "turnover", "weights", "capital", "summary"};
+    weights/capital are dates x strategies.
+    """
+    # 1. Dates x strategies, missing returns as flat days
+    if isinstance(returns, pd.DataFrame):
+        names, dates = list(returns.index), returns.columns
+        matrix = returns.to_numpy(dtype=np.float64).T
+    else:
+        matrix = np.asarray(returns, dtype=np.float64).T
+        names, dates = list(range(matrix.shape[1])), pd.RangeIndex(matrix.shape[0])
+    n_days, n_arms = matrix.shape
+    wins = (matrix > 0).astype(np.float64)
+    losses = (matrix < 0).astype(np.float64)
+    matrix = np.nan_to_num(matrix)
+
+    rng = np.random.default_rng(seed)
+    weights = np.empty((n_days, n_arms))
+    capital = np.empty((n_days, n_arms))
+    portfolio_return = np.empty(n_days)
+    turnover = np.empty(n_days)
+    equity = np.empty(n_days)
+
+    # Carried state: Beta(1, 1) prior, start fully in cash
+    alpha, beta = np.ones(n_arms), np.ones(n_arms)
+    drifted = np.zeros(n_arms)
+    start_equity = 1.0
+
+    for lo in range(0, n_days, block):
+        hi = min(lo + block, n_days)
+        r = matrix[lo:hi]
+
+        # 2. Posterior each morning: prior + every outcome before that day
+        cum_wins = np.cumsum(wins[lo:hi], axis=0)
+        cum_losses = np.cumsum(losses[lo:hi], axis=0)
+        day_alpha = alpha + cum_wins - wins[lo:hi]
+        day_beta = beta + cum_losses - losses[lo:hi]
+        alpha, beta = alpha + cum_wins[-1], beta + cum_losses[-1]
+
+        # 3. Thompson draw -> fair weights for every day of the block
+        w = fair_allocations(rng.beta(day_alpha, day_beta), min_allocation)
+
+        # 4. Turnover against yesterday's weights after they drifted with returns
+        gross = w * (1 + r)
+        growth = gross.sum(axis=1, keepdims=True)
+        previous = np.vstack([drifted[None, :], gross[:-1] / growth[:-1]])
+        drifted = gross[-1] / growth[-1]
+        t = np.abs(w - previous).sum(axis=1)
+
+        # 5. Compound the net portfolio return
+        net = growth[:, 0] - 1 - cost * t
+        curve = start_equity * np.cumprod(1 + net)
+        opening = np.concatenate([[start_equity], curve[:-1]])
+        start_equity = curve[-1]
+
+        weights[lo:hi] = w
+        capital[lo:hi] = opening[:, None] * gross  # before costs
+        portfolio_return[lo:hi] = net
+        turnover[lo:hi] = t
+        equity[lo:hi] = curve
+
+    summary = {
+        "strategies": n_arms,
+        "days": n_days,
+        "total_return": float(metrics.total_return(portfolio_return)) if n_days else 0.0,
+        "sharpe": float(metrics.sharpe_ratio(portfolio_return)) if n_days else 0.0,
+        "max_drawdown": float(metrics.max_drawdown(portfolio_return)) if n_days else 0.0,
+        "mean_turnover": float(turnover.mean()) if n_days else 0.0,
+        "final_weights": dict(zip(names, weights[-1].tolist())) if n_days else {},
+    }
+    return {
+        "equity": pd.Series(equity, index=dates, name="equity"),
+        "returns": pd.Series(portfolio_return, index=dates, name="returns"),
+        "turnover": pd.Series(turnover, index=dates, name="turnover"),
+        "weights": pd.DataFrame(weights, index=dates, columns=names),
+        "capital": pd.DataFrame(capital, index=dates, columns=names),
+        "summary": summary,
+    }
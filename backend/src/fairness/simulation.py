@@ -0,0 +1,66 @@
+import numpy as np
+from src.fairness.bandit import BatchedFairThompsonSampler
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+def _distribution(values):
+    return {
+        "mean": float(np.mean(values)),
+        "std": float(np.std(values)),
+        **{f"p{q}": float(v) for q, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))},
+    }
+
+def simulate_bernoulli_bandits(true_probabilities, n_replicas=1000, n_days=1000,
+                               min_allocation=0.10, seed=None):
+    """
+    Monte-Carlo run of the fair bandit against Bernoulli strategies.
+    All replicas advance together, one vectorized step per day.
+
+    Returns regret and allocation statistics:
+    - regret: distribution of final cumulative (pseudo-)regret across replicas
+    - regret_curve: mean cumulative regret per day
+    - allocation_curve: mean fair weight per (day, arm)
+    - final_allocation: per-arm distribution of the last day's weights
+    - pull_share: per-arm distribution of the fraction of days an arm was chosen
+    """
+    p = np.asarray(true_probabilities, dtype=np.float64)
+    n_arms = len(p)
+    bandit = BatchedFairThompsonSampler(n_replicas, n_arms, min_allocation=min_allocation, seed=seed)
+
+    regret = np.zeros((n_days, n_replicas))
+    allocation_sum = np.zeros((n_days, n_arms))
+    pulls = np.zeros((n_replicas, n_arms))
+    rows = np.arange(n_replicas)
+
+    for t in range(n_days):
+        chosen, allocations = bandit.select_arms()
+        rewards = bandit.rng.random(n_replicas) < p[chosen]
+        bandit.update(chosen, rewards)
+
+        regret[t] = p.max() - p[chosen]
+        allocation_sum[t] = allocations.sum(axis=0)
+        pulls[rows, chosen] += 1
+
+    cumulative_regret = np.cumsum(regret, axis=0)
+    pull_share = pulls / n_days
+
+    return {
+        "min_allocation": min_allocation,
+        "regret": _distribution(cumulative_regret[-1]),
+        "regret_curve": cumulative_regret.mean(axis=1),
+        "allocation_curve": allocation_sum / n_replicas,
+        "final_allocation": [_distribution(allocations[:, k]) for k in range(n_arms)],
+        "pull_share": [_distribution(pull_share[:, k]) for k in range(n_arms)],
+    }
+
+def compare_fairness_floors(true_probabilities, floors=(0.0, 0.05, 0.10, 0.20),
+                            n_replicas=1000, n_days=1000, seed=None):
+    """
+    Runs the batched simulation for several min_allocation values
+    (same seed for each) so their regret distributions can be compared.
+    """
+    return [
+        simulate_bernoulli_bandits(true_probabilities, n_replicas=n_replicas, n_days=n_days,
+                                   min_allocation=floor, seed=seed)
+        for floor in floors
+    ]
@@ -0,0 +1,138 @@
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+NAMESPACE = "alpha"
+# Upper bounds (seconds) of the stage duration histogram buckets
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
+
+# Per-request (or per-task) collectors; see capture()
+_collectors = contextvars.ContextVar("stats_collectors", default=())
+
+
+class StatsRegistry:
+    """
+    Process-wide stage timers and counters, rendered in the Prometheus text
+    format. Stages are histograms of seconds labelled by stage name;
+    counters are monotonic totals with optional labels.
+    """
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._stages = {}
+
+    def count(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        for collector in _collectors.get():
+            collector["counters"].append((name, value, labels))
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = {"count": 0, "sum": 0.0, "buckets": [0] * len(self.buckets)}
+            entry["count"] += 1
+            entry["sum"] += seconds
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    entry["buckets"][i] += 1
+        for collector in _collectors.get():
+            collector["stages"].append((stage, seconds))
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Times the block as stage 'name' (recorded even if it raises).
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name):
+        """
+        Decorator form of stage(): times every call of the function.
+        """
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def record(self, captured):
+        """
+        Replays stages and counters captured elsewhere (e.g. in a pool worker).
+        """
+        for stage, seconds in captured["stages"]:
+            self.observe(stage, seconds)
+        for name, value, labels in captured["counters"]:
+            self.count(name, value, **labels)
+
+    def render(self):
+        """
+        Prometheus text exposition of every stage and counter.
+        """
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            stages = sorted((k, dict(v, buckets=list(v["buckets"]))) for k, v in self._stages.items())
+
+        metric = f"{NAMESPACE}_stage_seconds"
+        lines += [f"# HELP {metric} Time spent per pipeline stage.", f"# TYPE {metric} histogram"]
+        for stage, entry in stages:
+            for bound, n in zip(self.buckets, entry["buckets"]):
+                lines.append(f'{metric}_bucket{{stage="{stage}",le="{bound}"}} {n}')
+            lines.append(f'{metric}_bucket{{stage="{stage}",le="+Inf"}} {entry["count"]}')
+            lines.append(f'{metric}_sum{{stage="{stage}"}} {entry["sum"]:.6f}')
+            lines.append(f'{metric}_count{{stage="{stage}"}} {entry["count"]}')
+
+        declared = set()
+        for (name, labels), value in counters:
+            metric = f"{NAMESPACE}_{name}_total"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} counter")
+                declared.add(metric)
+            label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+            lines.append(f"{metric}{{{label_text}}} {value}" if label_text else f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._stages.clear()
+
+
+@contextmanager
+def capture():
+    """
+    Collects every stage and counter recorded in this context (thread or
+    task) while the block runs: {"stages": [(stage, s)], "counters": [...]}.
+    """
+    collector = {"stages": [], "counters": []}
+    token = _collectors.set(_collectors.get() + (collector,))
+    try:
+        yield collector
+    finally:
+        _collectors.reset(token)
+
+
+def server_timing(captured):
+    """
+    Server-Timing header value, one entry per stage (durations summed, in ms).
+    """
+    totals = {}
+    for stage, seconds in captured["stages"]:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in totals.items())
+
+
+# Shared registry for the process
+stats = StatsRegistry()
@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+
+from src.parser.gemini_client import PROMPT_VERSION, extract_strategy_from_images, make_client
+from src.parser.pdf_processor import convert_pdf_to_images
+from src.parser.validator import LogicValidator
+from src.monitoring.stats import stats
+
+# backend/data/extraction_cache, independent of the current working directory
+DEFAULT_CACHE_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "extraction_cache")
+)
+
+class ExtractionCache:
+    """
+    On-disk cache of extracted strategy JSON, one file per key.
+    The key covers the PDF's content (not its name), the prompt/schema
+    version and the model, so re-uploads of the same paper are free while
+    prompt or model changes miss naturally.
+    """
+    def __init__(self, root=DEFAULT_CACHE_DIR):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def key(pdf_path, model_name, prompt_version=None):
+        # The current PROMPT_VERSION unless told otherwise
+        prompt_version = prompt_version or PROMPT_VERSION
+        digest = hashlib.sha256()
+        with open(pdf_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        digest.update(f"|prompt={prompt_version}|model={model_name}".encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.root, f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def set(self, key, data):
+        tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self._path(key))
+
+def extract_strategy_from_pdf(pdf_path, client=None, cache=None, report=None):
+    """
+    PDF -> strategy JSON, served from the cache when this paper was already
+    extracted with the same prompt version and model. Only validated
+    extractions are cached. 'report(stage, **detail)' receives progress.
+    """
+    client = client or make_client()
+    cache = cache or ExtractionCache()
+    report = report or (lambda stage, **detail: None)
+
+    key = cache.key(pdf_path, client.model_name)
+    cached = cache.get(key)
+    stats.count("extraction_cache", result="hit" if cached is not None else "miss")
+    if cached is not None:
+        print(f"♻️ Extraction cache hit for {os.path.basename(pdf_path)}")
+        report("extraction", cached=True)
+        return cached
+
+    report("rendering")
+    images = convert_pdf_to_images(pdf_path)
+    if not images:
+        return None
+
+    report("extraction", pages=len(images), cached=False)
+    data = extract_strategy_from_images(images, client=client)
+    if data and LogicValidator.validate_strategy(data)[0]:
+        cache.set(key, data)
+    return data
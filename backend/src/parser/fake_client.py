@@ -0,0 +1,32 @@
+import json
+
+# A small, valid extraction used when no responses are supplied
+DEFAULT_STRATEGY = {
+    "strategy_name": "Local Time Series Momentum",
+    "description": "Long when the close is above its value 'lookback' bars ago, short otherwise.",
+    "asset_universe": "Any liquid asset",
+    "lookback_period": 20,
+    "required_columns": ["close"],
+    "entry_logic": "df['entry_signal'] = np.where(df['close'] > df['close'].shift(lookback), 1, -1)",
+    "exit_logic": "False",
+    "numpy_logic": "entry_signal = np.where(close > kn.shift(close, lookback), 1, -1)",
+}
+
+class FakeModelClient:
+    """
+    Deterministic local stand-in for GeminiClient.
+
+    Returns the given responses in order (repeating the last one) and records
+    every call, so the extraction pipeline can run in tests without network
+    access. Its model id always carries a 'fake-' prefix, so canned
+    extractions are cached apart from (and never served to) a real model.
+    """
+    def __init__(self, responses=None, model_name="local"):
+        self.responses = list(responses) if responses else [DEFAULT_STRATEGY]
+        self.model_name = model_name if model_name.startswith("fake-") else f"fake-{model_name}"
+        self.calls = []
+
+    def generate_json(self, contents):
+        self.calls.append(contents)
+        response = self.responses[min(len(self.calls), len(self.responses)) - 1]
+        return response if isinstance(response, str) else json.dumps(response)
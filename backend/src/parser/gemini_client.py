@@ -1,12 +1,17 @@
 import os
 import json
-import google.generativeai as genai
 import typing_extensions as typing
 from dotenv import load_dotenv
 from src.parser.validator import LogicValidator
+from src.monitoring.stats import stats
 
 load_dotenv()
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+
+MODEL_NAME = 'gemini-2.5-flash'
+
+# Bump whenever the prompt, indicator list or schema changes: it is part of
+# the extraction cache key, so old cached results stop matching.
+PROMPT_VERSION = "3"
 
 # Strict Schema
 class StrategySchema(typing.TypedDict):
@@ -17,6 +22,7 @@ class StrategySchema(typing.TypedDict):
     required_columns: list[str]
     entry_logic: str
     exit_logic: str
+    numpy_logic: str
 
 # LIST OF REAL INDICATORS (Grounding the Model)
 SUPPORTED_INDICATORS = """
@@ -30,8 +36,43 @@ pandas_ta supported functions:
 - df.ta.adx(length=14, append=True) -> columns: ['ADX_14', 'DMP_14', 'DMN_14']
 """
 
-def extract_strategy_from_images(images, max_retries=2):
-    model = genai.GenerativeModel('gemini-2.5-flash') # Or 2.5-flash if available
+class GeminiClient:
+    """
+    Model client backed by Google Gemini.
+    Any object with 'model_name' and 'generate_json(contents) -> str' can
+    stand in for it (see fake_client.FakeModelClient).
+    """
+    def __init__(self, model_name=MODEL_NAME):
+        # The SDK is heavy: imported only when a real client is built
+        import google.generativeai as genai
+
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate_json(self, contents):
+        import google.generativeai as genai
+
+        response = self.model.generate_content(
+            contents,
+            generation_config=genai.GenerationConfig(
+                response_mime_type="application/json",
+                response_schema=StrategySchema
+            )
+        )
+        return response.text
+
+def make_client():
+    """
+    Default client: Gemini, or the local fake when MODEL_CLIENT=fake.
+    """
+    if os.getenv("MODEL_CLIENT", "").lower() == "fake":
+        from src.parser.fake_client import FakeModelClient
+        return FakeModelClient()
+    return GeminiClient()
+
+def extract_strategy_from_images(images, max_retries=2, client=None):
+    client = client or make_client()
     
     prompt = f"""
     Act as a Quantitative Python Developer. Extract the trading strategy.
@@ -46,6 +87,15 @@ def extract_strategy_from_images(images, max_retries=2):
        - WRONG: if previous_position == 1...
        - CORRECT: df['position'].shift(1)
     5. OUTPUT: Create a column 'entry_signal' (1=Buy, -1=Sell).
+    6. 'numpy_logic': the SAME rules again as multi-line NumPy code on 1-D float
+       arrays 'close', 'high', 'low', 'volume' (no DataFrame, no pandas).
+       Use only 'np', 'lookback' and these helpers from 'kn':
+       kn.shift(x, n), kn.pct_change(x, n), kn.sma(x, n), kn.ema(x, n),
+       kn.rolling_std(x, n), kn.rolling_max(x, n), kn.rolling_min(x, n),
+       kn.rsi(close, n), kn.bbands(close, n, std) -> (lower, mid, upper),
+       kn.atr(high, low, close, n).
+       Assign an array 'entry_signal' (1=Buy, -1=Sell, 0=no change) and
+       optionally 'exit_signal' (1=flatten).
     
     OUTPUT JSON ONLY.
     """
@@ -54,15 +104,10 @@ def extract_strategy_from_images(images, max_retries=2):
     
     # 1. Initial Generation
     try:
-        response = model.generate_content(
-            [prompt] + images,
-            generation_config=genai.GenerationConfig(
-                response_mime_type="application/json",
-                response_schema=StrategySchema
-            )
-        )
-        data = json.loads(response.text)
+        with stats.stage("model_call"):
+            data = json.loads(client.generate_json([prompt] + images))
     except Exception as e:
+        stats.count("model_errors")
         print(f"❌ Initial Generation Failed: {e}")
         return None
 
@@ -75,28 +120,26 @@ def extract_strategy_from_images(images, max_retries=2):
             return data
             
         print(f"⚠️ Validation Failed: {error_msg}. Retrying...")
+        stats.count("model_retries")
         
         # Refinement Prompt
         refine_prompt = f"""
-        The previous strategy extraction had Python Syntax Errors.
+        The previous strategy extraction failed validation (syntax errors,
+        loops / row-by-row access, or undefined names).
         ERROR: {error_msg}
         
         CURRENT JSON:
         {json.dumps(data)}
         
-        Fix the 'entry_logic' or 'exit_logic' strings to be valid Python.
+        Fix the 'entry_logic', 'exit_logic' or 'numpy_logic' strings to be valid,
+        vectorized Python that only uses the provided names.
         """
         
         try:
-            response = model.generate_content(
-                refine_prompt,
-                generation_config=genai.GenerationConfig(
-                    response_mime_type="application/json",
-                    response_schema=StrategySchema
-                )
-            )
-            data = json.loads(response.text)
+            with stats.stage("model_call"):
+                data = json.loads(client.generate_json(refine_prompt))
         except Exception as e:
+            stats.count("model_errors")
             print(f"❌ Refinement Failed: {e}")
             break
 
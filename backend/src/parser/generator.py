@@ -1,10 +1,18 @@
+import ast
 import os
 import re
+import tempfile
+import textwrap
+
+from src.monitoring.stats import stats
+from src.strategies.registry import GENERATED_DIR
 
 TEMPLATE = """
 import pandas as pd
 import numpy as np
-import pandas_ta as ta
+{ta_import}
+from src.strategies import kernels as kn
+from src.backtester.indicators import attach_indicators
 
 class {class_name}:
     '''
@@ -15,6 +23,10 @@ class {class_name}:
     def __init__(self):
         self.lookback = {lookback}
         self.required_columns = {columns}
+        # (pandas_ta name, params) computed before the logic runs;
+        # the engine may bind a shared session cache to indicator_cache
+        self.indicators = {indicators}
+        self.indicator_cache = None
         
     def generate_signals(self, df: pd.DataFrame):
         '''
@@ -33,6 +45,9 @@ class {class_name}:
         
         # 4. Run AI Logic
         try:
+            # Indicators
+            df = attach_indicators(df, self.indicators, self.indicator_cache)
+            
             # Entry Logic
             {entry_logic}
             
@@ -40,6 +55,9 @@ class {class_name}:
             {exit_logic}
             
             pass # Ensures the try block is never empty
+        except ImportError:
+            # A missing dependency (e.g. pandas_ta) must not look like a flat strategy
+            raise
         except Exception as e:
             print(f"Error in strategy logic: {{e}}")
             return df
@@ -64,13 +82,125 @@ class {class_name}:
             mask = (df['exit_signal'] == 1) | (df['exit_signal'] == True)
             df.loc[mask, 'position'] = 0
             
-        # 8. Clean up and Hold
+        # 8. Clean up and Hold (raw_position keeps each bar's own target for chunked runs)
+        df['raw_position'] = df['position']
         df['position'] = df['position'].replace(0, np.nan).ffill().fillna(0)
         
         return df
 """
 
-def save_strategy_file(data, output_dir="src/strategies/generated"):
+# Appended when the extraction includes 'numpy_logic'
+KERNEL_TEMPLATE = """
+    def entry_positions(self, close, high=None, low=None, volume=None):
+        '''
+        The NumPy entry/exit rules: the position each bar asks for before
+        holding (the streaming engine reads the last bar of this).
+        '''
+        lookback = self.lookback
+        entry_signal = np.zeros(len(close))
+        exit_signal = None
+
+{numpy_logic}
+
+        return kn.raw_positions(entry_signal, exit_signal)
+
+    def generate_positions(self, close, high=None, low=None, volume=None):
+        '''
+        NumPy fast path of generate_signals: the same rules on contiguous
+        arrays, returning an int8 position array without any DataFrame.
+        '''
+        return kn.hold_positions(self.entry_positions(close, high, low, volume))
+
+    # True once the generator saw generate_positions reproduce generate_signals;
+    # the engine only prefers verified kernels
+    kernel_verified = {kernel_verified}
+"""
+
+def uses_pandas_ta(logic):
+    """
+    True if logic still refers to 'ta' or the 'df.ta' accessor after the
+    indicator calls were hoisted (pandas_ta then has to be imported).
+    """
+    try:
+        tree = ast.parse(logic)
+    except SyntaxError:
+        return "ta" in logic
+    return any(
+        (isinstance(node, ast.Name) and node.id == "ta") or (isinstance(node, ast.Attribute) and node.attr == "ta")
+        for node in ast.walk(tree)
+    )
+
+def _indicator_spec(stmt):
+    # Matches a bare 'df.ta.<name>(key=literal, ..., append=True)' statement
+    if not (isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call)):
+        return None
+    call = stmt.value
+    func = call.func
+    if not (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Attribute)
+            and func.value.attr == "ta" and isinstance(func.value.value, ast.Name)
+            and func.value.value.id == "df"):
+        return None
+    if call.args or any(kw.arg is None for kw in call.keywords):
+        return None
+
+    try:
+        params = {kw.arg: ast.literal_eval(kw.value) for kw in call.keywords}
+    except ValueError:
+        return None
+    if params.pop("append", None) is not True:
+        return None
+    return (func.attr, params)
+
+def extract_indicators(logic):
+    """
+    Splits literal 'df.ta.<name>(..., append=True)' calls out of a one-line
+    logic string. Returns (remaining_logic, [(name, params), ...]) so the
+    indicators can come from the engine's shared cache instead.
+    """
+    try:
+        tree = ast.parse(logic)
+    except SyntaxError:
+        return logic, []
+
+    specs, kept = [], []
+    for stmt in tree.body:
+        spec = _indicator_spec(stmt)
+        if spec:
+            specs.append(spec)
+        else:
+            kept.append(ast.unparse(stmt))
+
+    # The template takes a single line; leave compound logic untouched
+    if not specs or any("\n" in code for code in kept):
+        return logic, []
+    return "; ".join(kept) or "pass", specs
+
+def _kernel_matches(code, output_dir, strategy_name):
+    """
+    Compares a candidate file's NumPy kernel with its generate_signals (see
+    smoke.compare_kernel). Raises ValueError when they disagree; returns False,
+    leaving the kernel unverified, when the comparison could not run.
+    """
+    from src.parser.smoke import compare_kernel
+
+    # '_' prefix: the registry never indexes the candidate
+    fd, path = tempfile.mkstemp(suffix=".py", prefix="_kernel_check_", dir=output_dir)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(code)
+        outcome = compare_kernel(path)
+    finally:
+        os.remove(path)
+
+    if outcome["ok"]:
+        return True
+    if outcome["mismatch"]:
+        raise ValueError(f"numpy_logic of {strategy_name} does not match its entry/exit logic: {outcome['error']}")
+    print(f"⚠️ Could not check the NumPy kernel of {strategy_name}, it stays unverified: {outcome['error']}")
+    return False
+
+@stats.timed("codegen")
+def save_strategy_file(data, output_dir=GENERATED_DIR, check_kernel=True):
     if not data:
         return
 
@@ -85,16 +215,36 @@ def save_strategy_file(data, output_dir="src/strategies/generated"):
     filename = clean_name.lower() + ".py"
     filepath = os.path.join(output_dir, filename)
     
-    # 2. Fill Template with .get() safety
+    # 2. Hoist indicator calls so they can be shared across strategies
+    entry_logic, entry_indicators = extract_indicators(data.get('entry_logic', 'False'))
+    exit_logic, exit_indicators = extract_indicators(data.get('exit_logic', 'False'))
+    indicators = []
+    for spec in entry_indicators + exit_indicators:
+        if spec not in indicators:
+            indicators.append(spec)
+
+    # 3. Fill Template with .get() safety (pandas_ta is imported only if the logic still needs it)
+    needs_ta = uses_pandas_ta(entry_logic) or uses_pandas_ta(exit_logic)
     code = TEMPLATE.format(
+        ta_import="import pandas_ta as ta  # registers the df.ta accessor" if needs_ta else "# (no pandas_ta needed)",
         class_name=class_name,
         description=data.get('description', 'No description'),
         universe=data.get('asset_universe', 'Unknown'),
         lookback=data.get('lookback_period', 14),
         columns=data.get('required_columns', []),
-        entry_logic=data.get('entry_logic', 'False'),
-        exit_logic=data.get('exit_logic', 'False')
+        indicators=indicators,
+        entry_logic=entry_logic,
+        exit_logic=exit_logic
     )
+
+    # 4. Optional NumPy kernel (every line indented into the method body),
+    #    marked verified only once it reproduces generate_signals
+    numpy_logic = textwrap.dedent(data.get('numpy_logic') or '').strip()
+    if numpy_logic and numpy_logic != 'False':
+        body = textwrap.indent(numpy_logic, " " * 8)
+        candidate = code + KERNEL_TEMPLATE.format(numpy_logic=body, kernel_verified=False)
+        verified = check_kernel and _kernel_matches(candidate, output_dir, clean_name)
+        code += KERNEL_TEMPLATE.format(numpy_logic=body, kernel_verified=verified)
     
     with open(filepath, "w") as f:
         f.write(code)
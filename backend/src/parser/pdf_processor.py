@@ -1,34 +1,135 @@
-import fitz  # PyMuPDF
-import PIL.Image
-import io
+import multiprocessing as mp
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
-def convert_pdf_to_images(pdf_path, zoom=2.0):
+from src.monitoring.stats import stats
+
+# Full-resolution pixel budget per paper (None = every page at full zoom).
+# e.g. 96 * 1024 * 1024 covers ~16 A4 pages at 2x; pages past it drop to 1x.
+DEFAULT_MAX_BYTES = None
+
+# Words and symbols that suggest a page holds formulas or trading rules
+FORMULA_HINTS = re.compile(
+    r"algorithm|equation|formula|signal|lookback|momentum|moving average|volatility|"
+    r"threshold|position|portfolio|return|[=∑Σσμ∂√≤≥±]",
+    re.IGNORECASE,
+)
+
+def score_page(page):
+    """
+    Cheap text-only estimate of how likely a page holds formulas or algorithms.
+    """
+    text = page.get_text()
+    if not text:
+        return 0.0
+    return len(FORMULA_HINTS.findall(text)) / (1 + len(text) / 1000)
+
+def _render_page(pdf_path, page_number, zoom):
+    # Runs in a worker process: returns raw RGB samples, no PNG encoding
+    import fitz  # PyMuPDF, loaded on first use
+
+    with fitz.open(pdf_path) as doc:
+        pix = doc[page_number].get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        return pix.width, pix.height, pix.samples
+
+def plan_pages(doc, zoom=2.0, low_zoom=1.0, min_score=None, max_bytes=None):
+    """
+    Decides the zoom for every page: [(page_number, zoom), ...] in page order.
+    Pages scoring below 'min_score' are dropped. If 'max_bytes' is set, the
+    highest-scoring pages get full zoom until the budget runs out and the
+    rest are rendered at 'low_zoom'.
+    """
+    scores = [score_page(page) for page in doc]
+    keep = [i for i, s in enumerate(scores) if min_score is None or s >= min_score]
+    zooms = {i: zoom for i in keep}
+
+    if max_bytes is not None:
+        budget = max_bytes
+        for i in sorted(keep, key=lambda i: scores[i], reverse=True):
+            rect = doc[i].rect
+            full_bytes = int(rect.width * zoom) * int(rect.height * zoom) * 3
+            if full_bytes <= budget:
+                budget -= full_bytes
+            else:
+                zooms[i] = low_zoom
+
+        downgraded = sorted(i for i in keep if zooms[i] != zoom)
+        if downgraded:
+            stats.count("pdf_pages_downgraded", len(downgraded))
+            print(f"⚠️ Pixel budget spent: {len(downgraded)} of {len(keep)} pages rendered at {low_zoom}x "
+                  f"(pages {', '.join(str(i + 1) for i in downgraded)})")
+
+    return [(i, zooms[i]) for i in keep]
+
+def iter_pdf_images(pdf_path, zoom=2.0, low_zoom=1.0, min_score=None, max_bytes=None, workers=None):
+    """
+    Yields (page_number, PIL.Image) in page order.
+    Pages are rendered in parallel across processes (at most a few pages in
+    flight per worker) and turned into images straight from the pixmap samples.
+    """
+    import fitz
+    import PIL.Image
+
+    with fitz.open(pdf_path) as doc:
+        plan = plan_pages(doc, zoom=zoom, low_zoom=low_zoom, min_score=min_score, max_bytes=max_bytes)
+
+    workers = workers or min(4, os.cpu_count() or 1)
+    if workers == 1 or len(plan) < 2:
+        for page_number, page_zoom in plan:
+            width, height, samples = _render_page(pdf_path, page_number, page_zoom)
+            yield page_number, PIL.Image.frombytes("RGB", (width, height), samples)
+        return
+
+    # 'spawn' is safe to call from the API's worker threads
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as pool:
+        pending = deque()
+        todo = iter(plan)
+        for page_number, page_zoom in todo:
+            pending.append((page_number, pool.submit(_render_page, pdf_path, page_number, page_zoom)))
+            if len(pending) >= workers * 2:
+                break
+
+        while pending:
+            page_number, future = pending.popleft()
+            width, height, samples = future.result()
+            # Keep the window full before handing this page to the caller
+            for next_number, next_zoom in todo:
+                pending.append((next_number, pool.submit(_render_page, pdf_path, next_number, next_zoom)))
+                break
+            yield page_number, PIL.Image.frombytes("RGB", (width, height), samples)
+
+def convert_pdf_to_images(pdf_path, zoom=2.0, max_bytes=DEFAULT_MAX_BYTES, min_score=None, workers=None):
     """
     Converts a PDF into a list of PIL Images.
     Args:
         pdf_path (str): Path to the PDF file.
         zoom (float): Zoom factor. 2.0 = 200% resolution (crucial for math symbols).
+        max_bytes (int): Pixel budget for full-resolution pages; pages least likely
+            to hold formulas drop to 1x once it is spent (logged). None (default)
+            = no budget.
+        min_score (float): Skip pages whose formula score is below this.
+        workers (int): Render processes (default: up to 4).
     Returns:
         list[PIL.Image]: List of page images.
     """
     try:
-        doc = fitz.open(pdf_path)
-        images = []
-        
-        print(f"📄 Processing: {pdf_path} ({len(doc)} pages)")
-        
-        for i, page in enumerate(doc):
-            # Create a transformation matrix for higher resolution
-            mat = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=mat)
-            
-            # Convert to PIL Image
-            img_data = pix.tobytes("png")
-            img = PIL.Image.open(io.BytesIO(img_data))
-            images.append(img)
-            
+        import fitz
+
+        with fitz.open(pdf_path) as doc:
+            print(f"📄 Processing: {pdf_path} ({len(doc)} pages)")
+
+        with stats.stage("pdf_render"):
+            images = [
+                img for _, img in iter_pdf_images(
+                    pdf_path, zoom=zoom, min_score=min_score, max_bytes=max_bytes, workers=workers
+                )
+            ]
+        stats.count("pdf_pages_rendered", len(images))
+        stats.count("pdf_bytes_rendered", sum(img.width * img.height * len(img.getbands()) for img in images))
         return images
-        
+
     except Exception as e:
         print(f"❌ Error processing PDF: {e}")
-        return []
\ No newline at end of file
+        return []
@@ -0,0 +1,210 @@
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from src.monitoring.stats import stats
+
+# backend/, so the child can import 'src.*' the way the API does
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_TIMEOUT = 60.0
+# Largest acceptable log-log slope of runtime against bars (1.0 = linear)
+MAX_SCALING = 1.5
+# Slowest acceptable cost per bar at the largest size
+MAX_SECONDS_PER_BAR = 1e-5
+# Bars on which a NumPy kernel is compared with generate_signals before it is trusted
+KERNEL_CHECK_SIZES = (500, 5_000)
+
+
+def _load_class(path):
+    spec = importlib.util.spec_from_file_location("smoke_strategy", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    for name, value in vars(module).items():
+        if name.endswith("Strategy") and isinstance(value, type) and value.__module__ == module.__name__:
+            return value
+    raise ValueError(f"No strategy class in {path}")
+
+
+def first_mismatch(expected, positions):
+    """
+    First bar where two position arrays differ (NaN matches NaN), or None.
+    """
+    expected = np.asarray(expected, dtype=np.float64)
+    positions = np.asarray(positions, dtype=np.float64)
+    if np.array_equal(expected, positions, equal_nan=True):
+        return None
+    if len(expected) != len(positions):
+        return min(len(expected), len(positions))
+    same = (expected == positions) | (np.isnan(expected) & np.isnan(positions))
+    return int(np.flatnonzero(~same)[0])
+
+
+def _compare_child(path, sizes):
+    """
+    Child process body for compare_kernel: returns {"ok", "error", "mismatch"}.
+    """
+    from src.backtester.signals import price_arrays
+    from src.backtester.synthetic import synthetic_ohlcv
+
+    strategy = _load_class(path)()
+    for size in sizes:
+        df = synthetic_ohlcv(size, seed=size)
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            signals = strategy.generate_signals(df)
+        if "Error in strategy logic" in output.getvalue() or "position" not in signals.columns:
+            error = output.getvalue().strip() or f"no 'position' column for {size} bars"
+            return {"ok": False, "error": error, "mismatch": False}
+
+        try:
+            positions = strategy.generate_positions(*price_arrays(df))
+        except Exception as e:
+            return {"ok": False, "error": f"NumPy kernel failed: {e}", "mismatch": True}
+        bar = first_mismatch(signals['position'], positions)
+        if bar is not None:
+            error = f"kernel position differs from generate_signals at bar {bar} of {size}"
+            return {"ok": False, "error": error, "mismatch": True}
+    return {"ok": True, "error": "", "mismatch": False}
+
+
+def _spawn(args, timeout):
+    # Runs 'python -m src.parser.smoke <args>' and returns the JSON outcome it prints
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-m", "src.parser.smoke", *args],
+            cwd=BACKEND_DIR, capture_output=True, text=True, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return {"ok": False, "error": f"timed out after {timeout:.0f}s"}
+
+    lines = proc.stdout.strip().splitlines()
+    try:
+        return json.loads(lines[-1])
+    except (IndexError, ValueError):
+        return {"ok": False, "error": (proc.stderr.strip().splitlines() or ["strategy process crashed"])[-1]}
+
+
+def _run_child(path, sizes):
+    """
+    Child process body: runs the strategy on synthetic bars of each size and
+    returns {"ok", "error", "timings": {size: seconds}}.
+    """
+    from src.backtester.signals import price_arrays
+    from src.backtester.synthetic import synthetic_ohlcv
+
+    strategy = _load_class(path)()
+    timings = {}
+    for size in sizes:
+        df = synthetic_ohlcv(size, seed=size)
+
+        # 1. DataFrame path (the template prints and swallows logic errors)
+        output = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            signals = strategy.generate_signals(df)
+        elapsed = time.perf_counter() - start
+        if "Error in strategy logic" in output.getvalue():
+            return {"ok": False, "error": output.getvalue().strip(), "timings": timings}
+        if "position" not in signals.columns or len(signals) != size:
+            return {"ok": False, "error": f"no 'position' column for {size} bars", "timings": timings}
+
+        # 2. NumPy kernel, when the strategy has one: it must reproduce the DataFrame path
+        if hasattr(strategy, "generate_positions"):
+            start = time.perf_counter()
+            try:
+                positions = strategy.generate_positions(*price_arrays(df))
+            except Exception as e:
+                return {"ok": False, "error": f"NumPy kernel failed: {e}", "timings": timings}
+            elapsed = max(elapsed, time.perf_counter() - start)
+            if len(positions) != size:
+                return {"ok": False, "error": f"kernel returned {len(positions)} positions for {size} bars", "timings": timings}
+            bar = first_mismatch(signals['position'], positions)
+            if bar is not None:
+                error = f"kernel position differs from generate_signals at bar {bar} of {size}"
+                return {"ok": False, "error": error, "timings": timings}
+
+        timings[size] = elapsed
+    return {"ok": True, "error": "", "timings": timings}
+
+
+def smoke_test(path, sizes=DEFAULT_SIZES, timeout=DEFAULT_TIMEOUT,
+               max_scaling=MAX_SCALING, max_seconds_per_bar=MAX_SECONDS_PER_BAR):
+    """
+    Runs a generated strategy file in a separate Python process on synthetic
+    data of each size (killed after 'timeout' seconds) and checks that it
+    works, stays fast and scales roughly linearly.
+    Returns {"ok", "error", "timings": {bars: seconds}, "scaling"}.
+    """
+    sizes = sorted(sizes)
+    result = {"ok": False, "error": "", "timings": {}, "scaling": None}
+
+    # 1. Execute in a child process (a hung or crashing strategy can't take the caller down)
+    with stats.stage("smoke_test"):
+        child = _spawn([os.path.abspath(path), *map(str, sizes)], timeout)
+    result["timings"] = {int(size): seconds for size, seconds in child.get("timings", {}).items()}
+    if not child["ok"]:
+        result["error"] = child["error"]
+        return result
+
+    # 2. Scaling: slope of log(runtime) against log(bars)
+    bars = np.array(list(result["timings"]), dtype=np.float64)
+    seconds = np.maximum(np.array(list(result["timings"].values())), 1e-6)
+    if len(bars) > 1:
+        result["scaling"] = float(np.polyfit(np.log(bars), np.log(seconds), 1)[0])
+    if result["scaling"] is not None and result["scaling"] > max_scaling:
+        result["error"] = f"runtime grows as bars^{result['scaling']:.2f} (limit {max_scaling})"
+        return result
+    if seconds[-1] / bars[-1] > max_seconds_per_bar:
+        result["error"] = f"{seconds[-1] / bars[-1] * 1e6:.1f}µs per bar at {int(bars[-1])} bars"
+        return result
+
+    result["ok"] = True
+    return result
+
+
+def compare_kernel(path, sizes=KERNEL_CHECK_SIZES, timeout=DEFAULT_TIMEOUT):
+    """
+    Checks, in a child process, that a generated file's 'generate_positions'
+    reproduces the 'position' column of its 'generate_signals' on synthetic
+    bars of each size.
+    Returns {"ok", "error", "mismatch"}: 'mismatch' is True when the kernel
+    disagreed or failed, False when the comparison itself could not run.
+    """
+    with stats.stage("kernel_check"):
+        child = _spawn(["--kernel", os.path.abspath(path), *map(str, sizes)], timeout)
+    return {"ok": child["ok"], "error": child["error"], "mismatch": child.get("mismatch", False)}
+
+
+def smoke_test_strategy(data, **kwargs):
+    """
+    Generates the strategy from an extraction into a scratch folder and
+    smoke-tests it, so nothing reaches src/strategies/generated unless it passes.
+    """
+    from src.parser.generator import save_strategy_file
+
+    with tempfile.TemporaryDirectory() as folder:
+        # The smoke test compares the kernel itself, at every size
+        path = save_strategy_file(data, output_dir=folder, check_kernel=False)
+        return smoke_test(path, **kwargs)
+
+
+if __name__ == "__main__":
+    # Child entry point: python -m src.parser.smoke [--kernel] <strategy.py> <bars> ...
+    args, child = sys.argv[1:], _run_child
+    if args[0] == "--kernel":
+        args, child = args[1:], _compare_child
+    try:
+        outcome = child(args[0], [int(n) for n in args[1:]])
+    except Exception as e:
+        outcome = {"ok": False, "error": f"{type(e).__name__}: {e}", "timings": {}}
+    print(json.dumps(outcome))
@@ -1,20 +1,74 @@
 import ast
+import builtins
 import logging
+import textwrap
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("CodeValidator")
 
+# Names the generated strategy file provides to each kind of logic
+MODULE_NAMES = {"pd", "np", "ta", "kn", "self"}
+PANDAS_NAMES = MODULE_NAMES | {"df", "lookback"}
+NUMPY_NAMES = MODULE_NAMES | {"close", "high", "low", "volume", "lookback", "entry_signal", "exit_signal"}
+BUILTIN_NAMES = set(dir(builtins))
+
+# Row-at-a-time pandas access that defeats vectorization
+ROW_ITERATORS = {"iterrows", "itertuples"}
+SCALAR_ACCESSORS = {"iat", "at"}
+
+def _is_int(node):
+    return (isinstance(node, ast.Constant) and isinstance(node.value, int)) or (
+        isinstance(node, ast.UnaryOp) and isinstance(node.operand, ast.Constant) and isinstance(node.operand.value, int))
+
+def _parse_logic(code_str):
+    # Logic as the generator emits it: leading indentation is not significant
+    return ast.parse(textwrap.dedent(code_str).strip())
+
+def _assigned_names(tree):
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            names.add(node.id)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+    return names
+
+def _performance_issues(tree):
+    issues = []
+    for node in ast.walk(tree):
+        line = getattr(node, "lineno", 1)
+        if isinstance(node, (ast.For, ast.AsyncFor, ast.While)):
+            issues.append(f"loop at line {line} (use vectorized column/array operations)")
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            issues.append(f"import at line {line} (pd, np, ta and kn are already available)")
+        elif isinstance(node, ast.comprehension):
+            it = node.iter
+            if isinstance(it, ast.Call) and isinstance(it.func, ast.Name) and it.func.id == "range":
+                issues.append(f"comprehension over range() at line {line} (use vectorized operations)")
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            if node.func.attr in ROW_ITERATORS:
+                issues.append(f"'.{node.func.attr}()' at line {line} iterates row by row")
+            elif node.func.attr == "apply" and any(
+                    kw.arg == "axis" and isinstance(kw.value, ast.Constant) and kw.value.value in (1, "columns")
+                    for kw in node.keywords):
+                issues.append(f"row-wise '.apply(axis=1)' at line {line}")
+        elif isinstance(node, ast.Subscript) and isinstance(node.value, ast.Attribute):
+            if node.value.attr in SCALAR_ACCESSORS or (node.value.attr == "iloc" and _is_int(node.slice)):
+                issues.append(f"scalar '.{node.value.attr}[...]' at line {line} reduces the series to one bar")
+    return issues
+
 class LogicValidator:
     """
     Checks if the extracted strategy logic strings are valid Python syntax.
     """
     
     @staticmethod
-    def is_valid_python(code_str: str) -> tuple[bool, str]:
+    def is_valid_python(code_str: str, multiline: bool = False) -> tuple[bool, str]:
         """
         Returns (True, "") if valid.
         Returns (False, error_message) if invalid.
+        'multiline' indents every line (as the generator does for numpy_logic).
         """
         if not code_str or code_str == "False":
             return True, ""
@@ -22,7 +76,11 @@ class LogicValidator:
         try:
             # Wrap in a function to ensure it parses as valid execution logic
             # We mock 'df' and 'ta' availability
-            wrapped_code = f"def logic(df, np, ta):\n    {code_str}"
+            if multiline:
+                body = textwrap.indent(textwrap.dedent(code_str).strip(), "    ")
+                wrapped_code = f"def logic(close, high, low, volume, np, kn):\n{body}"
+            else:
+                wrapped_code = f"def logic(df, np, ta):\n    {code_str}"
             ast.parse(wrapped_code)
             return True, ""
         except SyntaxError as e:
@@ -30,6 +88,36 @@ class LogicValidator:
         except Exception as e:
             return False, str(e)
 
+    @staticmethod
+    def lint_logic(code_str: str, multiline: bool = False, defined=()) -> tuple[bool, str]:
+        """
+        Rejects logic that would fail or crawl at backtest time: loops, row
+        iteration, scalar .iloc/.at access, imports and names that are
+        never defined. 'defined' are names assigned by earlier logic
+        (exit logic runs after entry logic). Expects valid syntax.
+        """
+        if not code_str or code_str == "False":
+            return True, ""
+
+        try:
+            tree = _parse_logic(code_str)
+        except SyntaxError as e:
+            # e.g. 'return' parses inside is_valid_python's wrapper but not on its own
+            return False, f"Syntax Error: {e.msg} at line {e.lineno}"
+        issues = _performance_issues(tree)
+
+        known = (NUMPY_NAMES if multiline else PANDAS_NAMES) | BUILTIN_NAMES | set(defined) | _assigned_names(tree)
+        undefined = sorted({
+            node.id for node in ast.walk(tree)
+            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load) and node.id not in known
+        })
+        if undefined:
+            issues.append(f"undefined name(s) {', '.join(undefined)}")
+
+        if issues:
+            return False, "Performance Lint: " + "; ".join(issues)
+        return True, ""
+
     @staticmethod
     def validate_strategy(data: dict) -> tuple[bool, str]:
         """
@@ -45,4 +133,25 @@ class LogicValidator:
         if not is_valid:
             return False, f"Exit Logic Error: {err}"
 
+        # 3. Check NumPy Kernel Logic (optional)
+        is_valid, err = LogicValidator.is_valid_python(data.get('numpy_logic', ''), multiline=True)
+        if not is_valid:
+            return False, f"NumPy Logic Error: {err}"
+
+        # 4. Lint for non-vectorized patterns and undefined names
+        entry_logic = data.get('entry_logic', '')
+        is_valid, err = LogicValidator.lint_logic(entry_logic)
+        if not is_valid:
+            return False, f"Entry Logic Error: {err}"
+
+        # (lint_logic above already parsed the entry logic the same way)
+        entry_names = _assigned_names(_parse_logic(entry_logic)) if entry_logic and entry_logic != "False" else set()
+        is_valid, err = LogicValidator.lint_logic(data.get('exit_logic', ''), defined=entry_names)
+        if not is_valid:
+            return False, f"Exit Logic Error: {err}"
+
+        is_valid, err = LogicValidator.lint_logic(data.get('numpy_logic', ''), multiline=True)
+        if not is_valid:
+            return False, f"NumPy Logic Error: {err}"
+
         return True, "Valid"
\ No newline at end of file
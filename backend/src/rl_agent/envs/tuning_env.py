@@ -1,82 +1,184 @@
+import copy
+import os
+import uuid
 import gymnasium as gym
 import numpy as np
 import pandas as pd
 from gymnasium import spaces
+from src.backtester.shared_data import SHARED_DIR, SharedMarketData
+from src.backtester.signals import strategy_positions
+
+MIN_LOOKBACK = 3
+MAX_LOOKBACK = 60
+OBS_WINDOW = 30
+# Precomputed arrays that share() moves into memory-mapped files
+SHARED_ARRAYS = ("signal_table", "volatility", "recent_return", "market_returns")
 
 class StrategyTuningEnv(gym.Env):
     """
     Custom Environment where the Agent learns to tune the 'lookback' parameter
     of a strategy based on market volatility.
+
+    Everything step() needs is precomputed once at construction: the position
+    for every lookback at every timestep (an int8 lookbacks x timesteps table),
+    plus the rolling volatility/return features and the one-bar market returns.
+    A step is then a couple of array lookups instead of a pandas pipeline.
     """
     def __init__(self, strategy_class, df, initial_balance=10000):
         super(StrategyTuningEnv, self).__init__()
-        
+
         self.strategy = strategy_class()
         self.df = df
         self.initial_balance = initial_balance
-        
+        self.shared = None
+
         # Action Space: The Agent chooses a lookback period between 3 and 60 days
         # We map Discrete(58) -> 3..60
-        self.action_space = spaces.Discrete(58) 
-        
+        self.action_space = spaces.Discrete(MAX_LOOKBACK - MIN_LOOKBACK + 1)
+
         # Observation Space: [Recent Volatility, Recent Return, Current Lookback]
         self.observation_space = spaces.Box(low=-np.inf, high=np.inf, shape=(3,), dtype=np.float32)
-        
-        self.current_step = 60 # Start after enough data exists
+
+        self._precompute()
+
+        self.current_step = MAX_LOOKBACK # Start after enough data exists
         self.balance = initial_balance
         self.positions = 0
-        
+
+    def _precompute(self):
+        """
+        Builds the signal table and observation features for the whole history.
+
+        Row t of the table is the position a full-history backtest holds at t
+        with that lookback. This intentionally differs from the old per-step
+        call on a (lookback + 2)-bar slice: the held position now carries over
+        from earlier entries instead of restarting flat in every slice, and
+        recursive indicators (EMA, RSI) are warmed up on all prior bars rather
+        than seeded inside the slice. It stays causal, since generated
+        strategies only look at rows <= t.
+        """
+        close = self.df['Close'].astype(np.float64)
+        default_lookback = self.strategy.lookback
+
+        # 1. Position for every (lookback, timestep) pair
+        lookbacks = range(MIN_LOOKBACK, MAX_LOOKBACK + 1)
+        self.signal_table = np.zeros((len(lookbacks), len(close)), dtype=np.int8)
+        for i, lookback in enumerate(lookbacks):
+            self.strategy.lookback = lookback
+            position = strategy_positions(self.strategy, self.df)
+            if position is not None:
+                self.signal_table[i] = np.clip(np.rint(position), -1, 1).astype(np.int8)
+        self.strategy.lookback = default_lookback
+
+        # 2. Observation features for a step at t use the window [t-30, t)
+        returns = close.pct_change()
+        self.volatility = returns.rolling(OBS_WINDOW - 1).std().shift(1).to_numpy(dtype=np.float32)
+        self.recent_return = (close.shift(1) / close.shift(OBS_WINDOW) - 1).to_numpy(dtype=np.float32)
+
+        # 3. One-bar market return earned when stepping from t-1 to t
+        self.market_returns = returns.fillna(0.0).to_numpy(dtype=np.float64)
+
+    def clone(self):
+        """
+        Returns a fresh env that shares this one's precomputed (read-only) arrays.
+        Only the strategy instance and episode state are copied.
+        """
+        env = copy.copy(self)
+        env.strategy = copy.copy(self.strategy)
+        env.reset()
+        return env
+
+    def share(self, folder=SHARED_DIR):
+        """
+        Moves the market data and precomputed arrays into memory-mapped files.
+        The env (and its clones) then pickles as file paths, so spawned
+        processes map the same pages instead of unpickling copies.
+        The process that called share() removes the files with release().
+        """
+        if self.shared is not None:
+            return self
+        arrays = {}
+        for name in SHARED_ARRAYS:
+            values = np.ascontiguousarray(getattr(self, name))
+            path = os.path.join(folder, f"alpha-env-{os.getpid()}-{uuid.uuid4().hex[:8]}-{name}.bin")
+            values.tofile(path)
+            arrays[name] = (path, values.dtype.str, values.shape)
+        self.shared = {"market": SharedMarketData.create({"env": self.df}, folder=folder), "arrays": arrays}
+        self._attach()
+        return self
+
+    def _attach(self):
+        self.df = self.shared["market"].frame("env")
+        for name, (path, dtype, shape) in self.shared["arrays"].items():
+            setattr(self, name, np.memmap(path, dtype=dtype, mode="r", shape=shape))
+
+    def release(self):
+        """
+        Deletes the files created by share(); existing mappings stay valid.
+        """
+        if self.shared is None:
+            return
+        self.shared["market"].close()
+        for path, _, _ in self.shared["arrays"].values():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.shared = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if state.get("shared") is not None:
+            # Shared envs travel as their file manifests (see share())
+            state.pop("df")
+            for name in SHARED_ARRAYS:
+                state.pop(name)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.shared is not None:
+            self._attach()
+
     def reset(self, seed=None, options=None):
         super().reset(seed=seed)
-        self.current_step = 60
+        self.current_step = MAX_LOOKBACK
         self.balance = self.initial_balance
         self.positions = 0
         return self._get_observation(), {}
 
     def _get_observation(self):
-        # Look at the last 30 days window
-        window = self.df.iloc[self.current_step-30 : self.current_step]
-        
-        volatility = window['Close'].pct_change().std()
-        recent_return = (window['Close'].iloc[-1] / window['Close'].iloc[0]) - 1
-        current_lookback = self.strategy.lookback
-        
-        return np.array([volatility, recent_return, current_lookback], dtype=np.float32)
+        # Features for the last 30 days window, looked up from the precomputed arrays
+        return np.array([
+            self.volatility[self.current_step],
+            self.recent_return[self.current_step],
+            self.strategy.lookback,
+        ], dtype=np.float32)
 
     def step(self, action):
         # 1. Agent adjusts the strategy (Action 0 -> Lookback 3)
-        new_lookback = action + 3 
+        action = int(action)
+        new_lookback = action + MIN_LOOKBACK
         self.strategy.lookback = new_lookback
-        
-        # 2. Get Data Slice for Strategy Logic
-        # We need enough history for the NEW lookback to work
-        slice_start = self.current_step - new_lookback - 1
-        data_slice = self.df.iloc[slice_start : self.current_step + 1].copy()
-        
-        # 3. Ask Strategy: "Buy or Sell?"
-        # We modify the strategy instance to use the new lookback
-        processed_df = self.strategy.generate_signals(data_slice)
-        
-        # Get the signal for the *current* timestep (the last row)
-        position = processed_df['position'].iloc[-1]
-        
-        # 4. Step Market Forward
+
+        # 2. Ask Strategy: "Buy or Sell?" for the *current* timestep
+        position = self.signal_table[action, self.current_step]
+
+        # 3. Step Market Forward
         self.current_step += 1
         if self.current_step >= len(self.df) - 1:
             terminated = True
             market_return = 0
         else:
             terminated = False
-            # Calculate PnL for holding this position for 1 day
-            current_price = self.df['Close'].iloc[self.current_step-1]
-            next_price = self.df['Close'].iloc[self.current_step]
-            market_return = (next_price - current_price) / current_price
-            
-        # 5. Calculate Reward (Daily Profit)
+            # PnL for holding this position for 1 day
+            market_return = self.market_returns[self.current_step]
+
+        # 4. Calculate Reward (Daily Profit)
         daily_reward = position * market_return * 100 # Scale up for RL stability
-        
+
         self.balance *= (1 + (position * market_return))
-        
+
         info = {"balance": self.balance, "lookback": new_lookback}
-        
-        return self._get_observation(), daily_reward, terminated, False, info
\ No newline at end of file
+
+        return self._get_observation(), daily_reward, terminated, False, info
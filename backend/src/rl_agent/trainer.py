@@ -1,55 +1,194 @@
-import pandas as pd
-import yfinance as yf
+import glob
+import multiprocessing as mp
+import os
+import re
+import sys
+from multiprocessing.connection import wait
+
 from stable_baselines3 import PPO
+from stable_baselines3.common.callbacks import CheckpointCallback
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
+from src.backtester.engine import BacktestEngine
 from src.rl_agent.envs.tuning_env import StrategyTuningEnv
-from backend.src.strategies.generated.timeseriesmomentumtsmom import TimeSeriesMomentumStrategy
+from src.strategies.generated.timeseriesmomentum import TimeSeriesMomentumStrategy
+
+def load_market_data(ticker, start, end):
+    """
+    Daily bars from the local OHLCV store (downloads only missing ranges).
+    """
+    return BacktestEngine(start_date=start, end_date=end).get_data(ticker)
 
 def train_agent():
     # 1. Get Training Data
     print("📉 Fetching Training Data (BTC-USD)...")
-    df = yf.download("BTC-USD", start="2018-01-01", end="2022-01-01", progress=False)
-    
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = df.columns.get_level_values(0)
-    
+    df = load_market_data("BTC-USD", "2018-01-01", "2022-01-01")
+
     # 2. Initialize Environment
     # We pass the class (not instance) so the Env can create fresh ones
     env = StrategyTuningEnv(TimeSeriesMomentumStrategy, df)
-    
+
     # 3. Setup PPO Agent
     print("🧠 Initializing PPO Agent...")
     model = PPO("MlpPolicy", env, verbose=1)
-    
+
     # 4. Train
     print("🚀 Starting Training Loop (10,000 steps)...")
     model.learn(total_timesteps=10000)
-    
+
     # 5. Save the Brain
     model.save("ppo_momentum_tuner")
     print("✅ Model Saved as 'ppo_momentum_tuner.zip'")
 
+def _start_method():
+    # fork only on Linux: the parent has imported torch (via stable_baselines3),
+    # and forking such a process is unsafe on macOS; elsewhere spawn + shared files
+    return "fork" if sys.platform.startswith("linux") else "spawn"
+
+def _env_factory(template, seed):
+    # Each copy shares the template's precomputed market arrays
+    def _init():
+        env = template.clone()
+        env.reset(seed=seed)
+        return env
+    return _init
+
+def _latest_checkpoint(run_dir):
+    checkpoints = glob.glob(os.path.join(run_dir, "ppo_*_steps.zip"))
+    if not checkpoints:
+        return None
+    return max(checkpoints, key=lambda p: int(re.search(r"_(\d+)_steps", p).group(1)))
+
+def _train_run(templates, seed, n_envs, total_timesteps, run_dir, checkpoint_every, vec_env):
+    """
+    One independent PPO run: n_envs env copies cycling over the templates.
+    Resumes from the newest checkpoint in run_dir if there is one.
+    """
+    import torch
+    torch.set_num_threads(1) # Parallelism comes from processes, not BLAS threads
+
+    os.makedirs(run_dir, exist_ok=True)
+    final_path = os.path.join(run_dir, "final.zip")
+    if os.path.exists(final_path):
+        print(f"⏭️ Run seed={seed} already finished ({final_path})")
+        return final_path
+
+    env_fns = [_env_factory(templates[k % len(templates)], seed + k) for k in range(n_envs)]
+    if vec_env == "subproc" and n_envs > 1:
+        env = SubprocVecEnv(env_fns, start_method=_start_method())
+    else:
+        env = DummyVecEnv(env_fns)
+
+    checkpoint = _latest_checkpoint(run_dir)
+    if checkpoint:
+        print(f"♻️ Resuming seed={seed} from {checkpoint}")
+        model = PPO.load(checkpoint, env=env)
+    else:
+        model = PPO("MlpPolicy", env, seed=seed, verbose=0)
+
+    remaining = total_timesteps - model.num_timesteps
+    if remaining > 0:
+        callback = CheckpointCallback(
+            save_freq=max(checkpoint_every // n_envs, 1),
+            save_path=run_dir,
+            name_prefix="ppo",
+        )
+        model.learn(total_timesteps=remaining, callback=callback, reset_num_timesteps=False)
+
+    model.save(final_path)
+    env.close()
+    print(f"✅ Run seed={seed} saved to {final_path}")
+    return final_path
+
+def train_parallel(tickers=("BTC-USD",), windows=(("2018-01-01", "2022-01-01"),), seeds=(0,),
+                   n_envs=8, total_timesteps=100_000, max_parallel_runs=None,
+                   output_dir="ppo_runs", checkpoint_every=10_000, vec_env="subproc",
+                   strategy_class=TimeSeriesMomentumStrategy):
+    """
+    Trains one PPO agent per seed, each on a vectorized env of n_envs copies
+    spread across every (ticker, date window) pair.
+
+    Market data and the env's signal tables are built once in this process.
+    On Linux env and run processes are forked from it; elsewhere they are
+    spawned and the templates are moved into shared memory-mapped files first
+    (StrategyTuningEnv.share), so either way every process reads the same
+    arrays instead of receiving pickled copies. Runs checkpoint every
+    'checkpoint_every' steps and resume from their latest checkpoint.
+    """
+    # 1. Build one precomputed env per (ticker, window)
+    templates = []
+    for ticker in tickers:
+        for start, end in windows:
+            print(f"📉 Fetching Training Data ({ticker} {start} -> {end})...")
+            df = load_market_data(ticker, start, end)
+            if df.empty:
+                print(f"⚠️ No data for {ticker}, skipping.")
+                continue
+            templates.append(StrategyTuningEnv(strategy_class, df))
+
+    if not templates:
+        raise ValueError("No training data for any ticker/window.")
+
+    # 2. Without fork, children map the templates' arrays from shared files
+    ctx = mp.get_context(_start_method())
+    if ctx.get_start_method() == "spawn":
+        templates = [template.share() for template in templates]
+
+    # 3. Launch independent runs, at most max_parallel_runs at a time
+    max_parallel_runs = max_parallel_runs or max(1, (os.cpu_count() or 1) // n_envs)
+    print(f"🚀 Training {len(seeds)} runs x {n_envs} envs ({max_parallel_runs} runs at a time)...")
+    try:
+        _run_all(ctx, templates, seeds, n_envs, total_timesteps, max_parallel_runs, output_dir,
+                 checkpoint_every, vec_env)
+    finally:
+        for template in templates:
+            template.release()
+
+    return sorted(glob.glob(os.path.join(output_dir, "seed_*", "final.zip")))
+
+def _run_all(ctx, templates, seeds, n_envs, total_timesteps, max_parallel_runs, output_dir, checkpoint_every,
+             vec_env):
+    pending = list(seeds)
+    running = []
+    while pending or running:
+        while pending and len(running) < max_parallel_runs:
+            seed = pending.pop(0)
+            run_dir = os.path.join(output_dir, f"seed_{seed}")
+            # Non-daemonic so each run can start its own env subprocesses
+            process = ctx.Process(
+                target=_train_run,
+                args=(templates, seed, n_envs, total_timesteps, run_dir, checkpoint_every, vec_env),
+            )
+            process.start()
+            running.append((seed, process))
+
+        # Refill as soon as any run finishes
+        wait([process.sentinel for _, process in running])
+        for seed, process in [r for r in running if not r[1].is_alive()]:
+            process.join()
+            running.remove((seed, process))
+            if process.exitcode != 0:
+                print(f"❌ Run seed={seed} failed (exit code {process.exitcode}); rerun to resume.")
+
 def test_agent():
     # Load separate testing data
     print("\n📉 Fetching Test Data (2022-2024)...")
-    df_test = yf.download("BTC-USD", start="2022-01-02", end="2024-01-01", progress=False)
-    if isinstance(df_test.columns, pd.MultiIndex):
-        df_test.columns = df_test.columns.get_level_values(0)
-        
+    df_test = load_market_data("BTC-USD", "2022-01-02", "2024-01-01")
+
     env = StrategyTuningEnv(TimeSeriesMomentumStrategy, df_test)
     model = PPO.load("ppo_momentum_tuner")
-    
+
     obs, _ = env.reset()
     done = False
-    
+
     print("🎮 Running Live Test...")
     while not done:
         action, _ = model.predict(obs)
         obs, reward, done, truncated, info = env.step(action)
-        
+
         # Print periodically to show it's "thinking"
         if env.current_step % 100 == 0:
             print(f"Step {env.current_step}: Agent chose Lookback={info['lookback']} days. Balance=${info['balance']:.0f}")
 
 if __name__ == "__main__":
     train_agent()
-    test_agent()
\ No newline at end of file
+    test_agent()
@@ -0,0 +1,203 @@
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+# NumPy building blocks for the 'generate_positions' fast path of generated
+# strategies. Every function takes and returns plain float64 arrays aligned
+# with the input (leading values are NaN until the window is full), mirroring
+# the pandas / pandas_ta indicators used by 'generate_signals'.
+
+def shift(x, n=1):
+    out = np.full(len(x), np.nan)
+    if abs(n) >= len(x):
+        return out
+    if n >= 0:
+        out[n:] = x[:len(x) - n]
+    else:
+        out[:n] = x[-n:]
+    return out
+
+def pct_change(x, n=1):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return x / shift(x, n) - 1
+
+def rolling_sum(x, n):
+    out = np.full(len(x), np.nan)
+    if n <= len(x):
+        csum = np.cumsum(np.insert(x, 0, 0.0))
+        out[n - 1:] = csum[n:] - csum[:-n]
+    return out
+
+def sma(x, n):
+    return rolling_sum(x, n) / n
+
+def rolling_std(x, n, ddof=1):
+    # Window-wise std: the sum-of-squares shortcut loses precision on large prices
+    out = np.full(len(x), np.nan)
+    if n <= len(x):
+        out[n - 1:] = np.lib.stride_tricks.sliding_window_view(x, n).std(axis=1, ddof=ddof)
+    return out
+
+def rolling_max(x, n):
+    out = np.full(len(x), np.nan)
+    if n <= len(x):
+        out[n - 1:] = np.lib.stride_tricks.sliding_window_view(x, n).max(axis=1)
+    return out
+
+def rolling_min(x, n):
+    out = np.full(len(x), np.nan)
+    if n <= len(x):
+        out[n - 1:] = np.lib.stride_tricks.sliding_window_view(x, n).min(axis=1)
+    return out
+
+def exp_smooth(x, alpha, seed):
+    """
+    y[k] = alpha * x[k] + (1 - alpha) * y[k-1], starting from y[-1] = seed.
+    Uses the closed form y[k] = w^k * (seed + alpha * cumsum(x[j] / w^j))
+    with w = 1 - alpha, block by block so w^-j stays within float64 range.
+    """
+    w = 1.0 - alpha
+    if w == 0:
+        return np.array(x, dtype=np.float64)
+    out = np.empty(len(x))
+    # Longest block whose w^-j (j <= block) stays below ~1e250
+    block = max(1, int(575.0 / -np.log(w)))
+    powers = w ** np.arange(1, min(block, len(x)) + 1)
+    for lo in range(0, len(x), block):
+        chunk = x[lo:lo + block]
+        p = powers[:len(chunk)]
+        out[lo:lo + len(chunk)] = p * (seed + alpha * np.cumsum(chunk / p))
+        seed = out[lo + len(chunk) - 1]
+    return out
+
+class CarriedState:
+    """
+    Recursive-indicator state carried between calls on a sliding window
+    (streaming.StreamingBacktest, chunked.run_chunked). Every ema/rma call
+    site keeps its output over the window; once the window no longer holds
+    the whole history, only the bars added since the previous call are
+    computed, from the carried last value, so the result keeps matching a
+    full-history run however short the window is.
+    """
+    def __init__(self):
+        self.slots = []
+        self.calls = 0
+        self.whole_history = True
+        self.new_bars = 1
+
+_carried = threading.local()
+
+@contextmanager
+def carry(state, whole_history, new_bars=1):
+    """
+    Routes ema/rma calls made inside the block through 'state'.
+    'whole_history' is True while the window still starts at the first bar;
+    'new_bars' is how many bars were appended since the previous call (the
+    rest of the window overlaps the previous one).
+    """
+    state.calls = 0
+    state.whole_history = whole_history
+    state.new_bars = new_bars
+    _carried.state = state
+    try:
+        yield state
+    finally:
+        _carried.state = None
+
+def _carried_mean(state, x, alpha, n):
+    # Call sites are told apart by their order within one evaluation (logic has no loops)
+    slot = state.calls
+    state.calls += 1
+    previous = state.slots[slot] if slot < len(state.slots) else None
+
+    keep = len(x) - state.new_bars
+    if state.whole_history or previous is None or not 0 < keep <= len(previous):
+        out = _recursive_mean(x, alpha, n, carried=False)
+    else:
+        # Window moved forward: reuse the overlapping values, extend the recursion over the new bars
+        out = np.empty(len(x))
+        out[:keep] = previous[len(previous) - keep:]
+        if state.new_bars == 1:
+            out[-1] = alpha * x[-1] + (1 - alpha) * previous[-1]
+        else:
+            out[keep:] = exp_smooth(x[keep:], alpha, previous[-1])
+
+    out.flags.writeable = False
+    if previous is None:
+        state.slots.append(out)
+    else:
+        state.slots[slot] = out
+    return out
+
+def _recursive_mean(x, alpha, n, carried=True):
+    # Exponential smoothing seeded with the SMA of the first n values (pandas_ta style)
+    state = getattr(_carried, "state", None) if carried else None
+    if state is not None:
+        return _carried_mean(state, x, alpha, n)
+    out = np.full(len(x), np.nan)
+    if n > len(x):
+        return out
+    out[n - 1] = np.mean(x[:n])
+    out[n:] = exp_smooth(x[n:], alpha, out[n - 1])
+    return out
+
+def ema(x, n):
+    return _recursive_mean(x, 2.0 / (n + 1), n)
+
+def rma(x, n):
+    # Wilder's smoothing, used by RSI and ATR
+    return _recursive_mean(x, 1.0 / n, n)
+
+def rsi(close, n=14):
+    delta = np.diff(close, prepend=np.nan)
+    gain = np.where(delta > 0, delta, 0.0)[1:]
+    loss = np.where(delta < 0, -delta, 0.0)[1:]
+    avg_gain = np.insert(rma(gain, n), 0, np.nan)
+    avg_loss = np.insert(rma(loss, n), 0, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+
+def bbands(close, n=20, std=2.0):
+    """
+    Returns (lower, mid, upper) bands (population std, like pandas_ta).
+    """
+    mid = sma(close, n)
+    width = std * rolling_std(close, n, ddof=0)
+    return mid - width, mid, mid + width
+
+def atr(high, low, close, n=14):
+    prev_close = shift(close, 1)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return rma(true_range, n)
+
+def raw_positions(entry_signal, exit_signal=None):
+    """
+    Steps 6-7 of 'generate_signals': boolean entries mean 'go long', numeric
+    entries are taken as the position, and exits flatten. Returns float64
+    positions before holding (NaN while indicators warm up).
+    """
+    entry_signal = np.asarray(entry_signal)
+    if entry_signal.dtype == bool:
+        position = entry_signal.astype(np.float64)
+    else:
+        position = entry_signal.astype(np.float64, copy=True)
+
+    if exit_signal is not None:
+        position[np.asarray(exit_signal) == 1] = 0
+    return position
+
+def hold_positions(entry_signal, exit_signal=None, initial=0):
+    """
+    Same semantics as steps 6-8 of 'generate_signals': raw positions (see
+    'raw_positions') with every non-zero position held until the next one.
+    'initial' is the position held before the first bar (for chunked runs).
+    Returns an int8 position array.
+    """
+    position = raw_positions(entry_signal, exit_signal)
+
+    # Forward-fill the last non-zero position (replace(0, nan).ffill().fillna(0))
+    held = (position != 0) & ~np.isnan(position)
+    last = np.maximum.accumulate(np.where(held, np.arange(len(position)), -1))
+    filled = np.where(last >= 0, position[np.maximum(last, 0)], initial)
+    return np.rint(filled).astype(np.int8)
@@ -0,0 +1,176 @@
+import ast
+import hashlib
+import importlib.util
+import os
+import sys
+import threading
+
+from src.monitoring.stats import stats
+
+# backend/src/strategies/generated, independent of the working directory
+GENERATED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated")
+
+
+class StrategyEntry:
+    """
+    Index record for one generated strategy file. The module itself is only
+    compiled on first use (see StrategyRegistry.strategy_class).
+    """
+    def __init__(self, name, path, mtime_ns, size, digest, class_name, description, has_kernel):
+        self.name = name
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+        self.class_name = class_name
+        self.description = description
+        self.has_kernel = has_kernel
+
+    @property
+    def module_name(self):
+        # Unique per content, so two versions of a file never share a module
+        return f"generated_strategy_{self.name}_{self.digest[:16]}"
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "class_name": self.class_name,
+            "description": self.description,
+            "has_kernel": self.has_kernel,
+            "hash": self.digest,
+            "modified": self.mtime_ns / 1e9,
+        }
+
+
+def _index_file(name, path, st):
+    # Reads the class name and docstring from the source without importing it
+    with open(path, "rb") as f:
+        source = f.read()
+    class_name, description, has_kernel = None, "", False
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        tree = ast.Module(body=[], type_ignores=[])
+
+    classes = [node for node in tree.body if isinstance(node, ast.ClassDef) and node.name.endswith("Strategy")]
+    # The generator names the file after the class: FooBarStrategy -> foobar.py
+    node = next((c for c in classes if c.name.lower() == f"{name}strategy"), classes[0] if classes else None)
+    if node is not None:
+        class_name = node.name
+        docstring = (ast.get_docstring(node) or "").strip()
+        description = docstring.splitlines()[0] if docstring else ""
+        defines_kernel = any(isinstance(item, ast.FunctionDef) and item.name == "generate_positions" for item in node.body)
+        # Only kernels the generator checked against generate_signals are used
+        verified = any(isinstance(item, ast.Assign) and ast.unparse(item) == "kernel_verified = True" for item in node.body)
+        has_kernel = defines_kernel and verified
+
+    digest = hashlib.sha256(source).hexdigest()
+    return StrategyEntry(name, path, st.st_mtime_ns, st.st_size, digest, class_name, description, has_kernel)
+
+
+class StrategyRegistry:
+    """
+    Index of src/strategies/generated: name -> StrategyEntry.
+
+    The folder is scanned once; afterwards a lookup is a dict hit plus one
+    stat() of that file, which re-indexes it when its mtime or size changed.
+    Modules are compiled lazily under content-hash names and cached, so
+    concurrent lookups never share or clobber a sys.modules slot.
+    """
+    def __init__(self, folder=GENERATED_DIR):
+        self.folder = folder
+        self._lock = threading.RLock()
+        self._entries = None
+        self._classes = {}
+
+    def __getstate__(self):
+        # Workers re-index on first use
+        return {"folder": self.folder}
+
+    def __setstate__(self, state):
+        self.__init__(state["folder"])
+
+    def refresh(self):
+        """
+        Re-scans the folder: new files are indexed, changed ones re-hashed
+        and deleted ones dropped. Unchanged files are not read again.
+        """
+        with self._lock:
+            entries = {}
+            old = self._entries or {}
+            if os.path.isdir(self.folder):
+                for item in os.scandir(self.folder):
+                    name, ext = os.path.splitext(item.name)
+                    if ext != ".py" or name.startswith("_") or not item.is_file():
+                        continue
+                    st = item.stat()
+                    entry = old.get(name)
+                    if entry is None or (entry.mtime_ns, entry.size) != (st.st_mtime_ns, st.st_size):
+                        entry = _index_file(name, item.path, st)
+                    entries[name] = entry
+            self._entries = entries
+            return entries
+
+    def get(self, name):
+        """
+        Current entry for 'name' (re-indexed if the file changed on disk).
+        """
+        with self._lock:
+            entries = self._entries if self._entries is not None else self.refresh()
+            entry = entries.get(name)
+            if entry is None:
+                # Maybe generated after the last scan
+                entry = self.refresh().get(name)
+            if entry is None:
+                raise FileNotFoundError(f"Strategy file not found: {os.path.join(self.folder, name + '.py')}")
+
+            try:
+                st = os.stat(entry.path)
+            except FileNotFoundError:
+                del self._entries[name]
+                raise FileNotFoundError(f"Strategy file not found: {entry.path}")
+            if (entry.mtime_ns, entry.size) != (st.st_mtime_ns, st.st_size):
+                entry = self._entries[name] = _index_file(name, entry.path, st)
+            return entry
+
+    def strategy_class(self, name):
+        """
+        The strategy class, compiled once per file content.
+        """
+        with self._lock:
+            entry = self.get(name)
+            cls = self._classes.get(entry.digest)
+            if cls is not None:
+                return cls
+            if entry.class_name is None:
+                raise ValueError("No class ending with 'Strategy' found in file.")
+
+            with stats.stage("load_strategy"):
+                spec = importlib.util.spec_from_file_location(entry.module_name, entry.path)
+                module = importlib.util.module_from_spec(spec)
+                # Registered so instances pickle (by reference) into forked workers
+                sys.modules[entry.module_name] = module
+                try:
+                    spec.loader.exec_module(module)
+                except BaseException:
+                    del sys.modules[entry.module_name]
+                    raise
+            cls = self._classes[entry.digest] = getattr(module, entry.class_name)
+            return cls
+
+    def create(self, name):
+        """
+        A fresh strategy instance.
+        """
+        return self.strategy_class(name)()
+
+    def list(self):
+        """
+        Every indexed strategy, sorted by name (nothing is imported).
+        """
+        with self._lock:
+            return [entry.to_dict() for _, entry in sorted(self.refresh().items())]
+
+
+# Shared registry for the process
+registry = StrategyRegistry()
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+# Tests import the backend the way main.py does ('src.…' from backend/)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def write_pdf(path, text="Time series momentum: long when the close is above its past value."):
+    import fitz
+
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+@pytest.fixture
+def make_pdf():
+    """
+    write_pdf(path, text): (re)writes a one-page paper.
+    """
+    return write_pdf
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    """
+    A one-page paper rendered on the fly.
+    """
+    return write_pdf(str(tmp_path / "paper.pdf"))
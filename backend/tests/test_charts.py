@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from src.api.charts import downsample_indices, shape_chart
+
+RNG = np.random.default_rng(0)
+SERIES = [RNG.standard_normal(5000).cumsum(), RNG.standard_normal(5000).cumsum()]
+
+
+@pytest.mark.parametrize("max_points", [6, 7, 11, 100, 999])
+def test_union_never_exceeds_max_points(max_points):
+    rows = downsample_indices(SERIES, max_points)
+    assert len(rows) <= max_points
+    assert rows[0] == 0 and rows[-1] == 4999
+
+
+def test_too_few_points_per_series_is_rejected():
+    with pytest.raises(ValueError, match="at least 6"):
+        downsample_indices(SERIES, 5)
+
+
+def test_full_resolution_by_default():
+    payload = {
+        "ticker": "SYN",
+        "total_return": "1.00%",
+        "chart": {"date": np.arange(5000).astype(str), "market": SERIES[0], "strategy": SERIES[1]},
+    }
+    assert shape_chart(payload)["points"] == 5000
+    assert shape_chart(payload, max_points=0)["points"] == 5000
@@ -0,0 +1,74 @@
+import contextlib
+import importlib.util
+import io
+
+import numpy as np
+import pytest
+
+from src.backtester.chunked import ChunkedBars, run_chunked
+from src.backtester.data_store import COLUMNS
+from src.backtester.engine import BacktestEngine
+from src.backtester.streaming import warmup_window
+from src.backtester.synthetic import synthetic_ohlcv
+from src.parser.generator import save_strategy_file
+
+N_BARS = 20_000
+BASE = {
+    "description": "Chunked test strategy.",
+    "lookback_period": 20,
+    "required_columns": ["close"],
+    "exit_logic": "False",
+}
+# 400-bar EMAs: far longer than the old fixed 512-bar warm-up could settle
+KERNEL_STRATEGY = {
+    **BASE,
+    "strategy_name": "Chunked Ema Kernel",
+    "entry_logic": "df['entry_signal'] = 0",
+    "numpy_logic": "entry_signal = np.where(close > kn.ema(close, 400), 1, -1)",
+}
+PANDAS_STRATEGY = {
+    **BASE,
+    "strategy_name": "Chunked Ewm Pandas",
+    "entry_logic": "df['entry_signal'] = np.where(df['close'] > df['close'].ewm(span=400, adjust=False).mean(), 1, -1)",
+}
+
+
+class FrameStore:
+    # Serves one fixed frame, so the in-memory run sees exactly the chunked bars
+    def __init__(self, df):
+        self.df = df
+
+    def get(self, ticker, start=None, end=None):
+        return self.df.copy()
+
+
+def generated(tmp_path, data):
+    with contextlib.redirect_stdout(io.StringIO()):
+        path = save_strategy_file(data, output_dir=str(tmp_path), check_kernel=False)
+    spec = importlib.util.spec_from_file_location(f"chunked_{tmp_path.name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    strategy_class = next(value for name, value in vars(module).items() if name.endswith("Strategy") and name != "Strategy")
+    # The kernel is the reference here (its pandas logic is a placeholder), so trust it unchecked
+    strategy_class.kernel_verified = "numpy_logic" in data
+    return strategy_class
+
+
+@pytest.mark.parametrize("data", [KERNEL_STRATEGY, PANDAS_STRATEGY], ids=["kernel", "pandas"])
+def test_chunked_run_matches_the_in_memory_run(tmp_path, data):
+    strategy_class = generated(tmp_path / "strategy", data)
+    # Chunks are stored as float32: compare on the same rounded bars
+    df = synthetic_ohlcv(N_BARS, seed=7).astype(np.float32).astype(np.float64)
+    bars = ChunkedBars(str(tmp_path / "bars"))
+    bars.append(df.index, {c: df[c].to_numpy() for c in COLUMNS})
+
+    engine = BacktestEngine(store=FrameStore(df))
+    engine.load_strategy = lambda name: strategy_class()
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = engine.run("chunked", ticker="SYN")
+        summary = run_chunked(strategy_class(), bars, str(tmp_path / "results"), chunk_size=1000)
+
+    results = ChunkedBars(str(tmp_path / "results"))
+    assert warmup_window(strategy_class(), carried=data is KERNEL_STRATEGY) < N_BARS
+    assert np.array_equal(results.column("position"), expected["position"].to_numpy(dtype=np.float32))
+    assert np.isclose(summary["total_return"], expected["cumulative_strategy"].iloc[-1] - 1, rtol=1e-9)
@@ -0,0 +1,87 @@
+import contextlib
+import io
+
+import pandas as pd
+
+from src.backtester.data_store import OHLCVStore
+from src.backtester.synthetic import synthetic_ohlcv
+
+BARS = synthetic_ohlcv(400, seed=5, start="2020-01-01")
+
+
+class RecordingFetcher:
+    """
+    Serves slices of BARS and records every requested range; 'empty' answers
+    with no bars, as yfinance does when offline.
+    """
+    def __init__(self, empty=False):
+        self.empty = empty
+        self.calls = []
+
+    def __call__(self, ticker, start, end):
+        self.calls.append((start, end))
+        if self.empty:
+            return pd.DataFrame()
+        return BARS.loc[start:pd.Timestamp(end) - pd.Timedelta(days=1)]
+
+
+def get(store, start, end):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return store.get("SYN", start, end)
+
+
+def test_partial_overlap_downloads_only_the_gaps(tmp_path):
+    fetcher = RecordingFetcher()
+    store = OHLCVStore(str(tmp_path), fetcher=fetcher)
+
+    get(store, "2020-03-01", "2020-06-01")
+    assert store.coverage("SYN") == (pd.Timestamp("2020-03-01"), pd.Timestamp("2020-06-01"))
+
+    # Overlaps the covered range on the left and runs past it on the right
+    df = get(store, "2020-02-01", "2020-08-01")
+    assert fetcher.calls == [
+        ("2020-03-01", "2020-06-01"),
+        ("2020-02-01", "2020-03-01"),
+        ("2020-06-01", "2020-08-01"),
+    ]
+    pd.testing.assert_frame_equal(df, BARS.loc["2020-02-01":"2020-07-31"], check_names=False, check_freq=False, check_index_type=False)
+
+    # Wholly inside the covered range: served from disk
+    get(store, "2020-04-01", "2020-05-01")
+    assert len(fetcher.calls) == 3
+
+
+def test_request_beyond_coverage_fills_the_days_in_between(tmp_path):
+    fetcher = RecordingFetcher()
+    store = OHLCVStore(str(tmp_path), fetcher=fetcher)
+
+    get(store, "2020-01-01", "2020-02-01")
+    get(store, "2020-05-01", "2020-06-01")
+
+    assert fetcher.calls[-1] == ("2020-02-01", "2020-06-01")
+    assert store.coverage("SYN") == (pd.Timestamp("2020-01-01"), pd.Timestamp("2020-06-01"))
+    assert len(store.read("SYN")) == len(BARS.loc["2020-01-01":"2020-05-31"])
+
+
+def test_empty_download_is_fetched_again(tmp_path):
+    offline = RecordingFetcher(empty=True)
+    store = OHLCVStore(str(tmp_path), fetcher=offline)
+
+    assert get(store, "2020-03-01", "2020-04-01").empty
+    assert store.coverage("SYN") is None
+
+    online = RecordingFetcher()
+    store.fetcher = online
+    df = get(store, "2020-03-01", "2020-04-01")
+    assert online.calls == [("2020-03-01", "2020-04-01")]
+    assert len(df) == len(BARS.loc["2020-03-01":"2020-03-31"])
+
+
+def test_read_arrays_matches_read(tmp_path):
+    store = OHLCVStore(str(tmp_path), fetcher=RecordingFetcher())
+    get(store, "2020-01-01", "2020-12-01")
+
+    dates, columns = store.read_arrays("SYN", "2020-02-01", "2020-03-01")
+    df = store.read("SYN", "2020-02-01", "2020-03-01")
+    assert (dates == df.index.to_numpy()).all()
+    assert (columns["Close"] == df["Close"].to_numpy()).all()
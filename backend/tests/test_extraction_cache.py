@@ -0,0 +1,76 @@
+import shutil
+
+from src.parser import extraction_cache
+from src.parser.extraction_cache import ExtractionCache, extract_strategy_from_pdf
+from src.parser.fake_client import DEFAULT_STRATEGY, FakeModelClient
+from src.parser.gemini_client import MODEL_NAME, PROMPT_VERSION
+
+
+def test_key_follows_pdf_content_not_its_name(tmp_path, pdf_path, make_pdf):
+    copy = shutil.copy(pdf_path, tmp_path / "renamed.pdf")
+    other = make_pdf(str(tmp_path / "other.pdf"), text="Bollinger band mean reversion.")
+
+    key = ExtractionCache.key(pdf_path, MODEL_NAME)
+    assert ExtractionCache.key(copy, MODEL_NAME) == key
+    assert ExtractionCache.key(other, MODEL_NAME) != key
+
+
+def test_key_changes_with_prompt_version_and_model(pdf_path):
+    key = ExtractionCache.key(pdf_path, MODEL_NAME)
+    assert ExtractionCache.key(pdf_path, MODEL_NAME, prompt_version=PROMPT_VERSION) == key
+    assert ExtractionCache.key(pdf_path, MODEL_NAME, prompt_version=PROMPT_VERSION + "-next") != key
+    assert ExtractionCache.key(pdf_path, "another-model") != key
+
+
+def test_second_extraction_is_a_hit(tmp_path, pdf_path):
+    cache = ExtractionCache(str(tmp_path / "cache"))
+
+    first = FakeModelClient()
+    assert extract_strategy_from_pdf(pdf_path, client=first, cache=cache) == DEFAULT_STRATEGY
+    assert len(first.calls) == 1
+
+    second = FakeModelClient()
+    assert extract_strategy_from_pdf(pdf_path, client=second, cache=cache) == DEFAULT_STRATEGY
+    assert second.calls == []
+
+
+def test_changed_pdf_misses(tmp_path, make_pdf):
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    path = make_pdf(str(tmp_path / "paper.pdf"))
+    extract_strategy_from_pdf(path, client=FakeModelClient(), cache=cache)
+
+    # Same file name, new content
+    make_pdf(path, text="A revised draft of the paper.")
+    client = FakeModelClient()
+    extract_strategy_from_pdf(path, client=client, cache=cache)
+    assert len(client.calls) == 1
+
+
+def test_prompt_version_bump_misses(tmp_path, pdf_path, monkeypatch):
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    extract_strategy_from_pdf(pdf_path, client=FakeModelClient(), cache=cache)
+
+    monkeypatch.setattr(extraction_cache, "PROMPT_VERSION", PROMPT_VERSION + "-next")
+    client = FakeModelClient()
+    extract_strategy_from_pdf(pdf_path, client=client, cache=cache)
+    assert len(client.calls) == 1
+
+
+def test_invalid_extraction_is_not_cached(tmp_path, pdf_path):
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    broken = {**DEFAULT_STRATEGY, "entry_logic": "df['entry_signal'] = ("}
+    extract_strategy_from_pdf(pdf_path, client=FakeModelClient([broken]), cache=cache)
+
+    client = FakeModelClient()
+    extract_strategy_from_pdf(pdf_path, client=client, cache=cache)
+    assert len(client.calls) == 1
+
+
+def test_fake_entries_never_reach_the_real_model(tmp_path, pdf_path):
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    fake = FakeModelClient(model_name=MODEL_NAME)
+    assert fake.model_name != MODEL_NAME
+    extract_strategy_from_pdf(pdf_path, client=fake, cache=cache)
+
+    assert cache.get(ExtractionCache.key(pdf_path, fake.model_name)) == DEFAULT_STRATEGY
+    assert cache.get(ExtractionCache.key(pdf_path, MODEL_NAME)) is None
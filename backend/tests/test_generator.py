@@ -0,0 +1,59 @@
+import contextlib
+import importlib.util
+import io
+
+import numpy as np
+import pytest
+
+from src.backtester.signals import has_kernel, strategy_positions
+from src.backtester.synthetic import synthetic_ohlcv
+from src.benchmarks.suite import BENCH_STRATEGY
+from src.parser.generator import save_strategy_file
+from src.strategies.registry import StrategyRegistry
+
+# Same entry/exit rules as the pandas logic, with the sides swapped
+INVERTED = {
+    **BENCH_STRATEGY,
+    "numpy_logic": "entry_signal = np.where(close > kn.sma(close, lookback), -1, 1)\n"
+                   "exit_signal = (close < kn.rolling_min(close, lookback) * 1.01).astype(int)",
+}
+
+
+def load(path):
+    spec = importlib.util.spec_from_file_location("generator_test_strategy", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.BenchmarkMomentumStrategy
+
+
+def save(tmp_path, data, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return save_strategy_file(data, output_dir=str(tmp_path), **kwargs)
+
+
+def test_matching_kernel_is_verified_and_preferred(tmp_path):
+    strategy = load(save(tmp_path, BENCH_STRATEGY))()
+    assert strategy.kernel_verified is True and has_kernel(strategy)
+    assert StrategyRegistry(str(tmp_path)).get("benchmarkmomentum").has_kernel
+
+    df = synthetic_ohlcv(2000, seed=4)
+    expected = strategy.generate_signals(df)["position"].to_numpy(dtype=np.float64)
+    assert np.array_equal(strategy_positions(strategy, df), expected)
+
+
+def test_mismatching_kernel_fails_generation(tmp_path):
+    with pytest.raises(ValueError, match="does not match"):
+        save(tmp_path, INVERTED)
+    # Neither the strategy nor the candidate used for the check is left behind
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unchecked_kernel_is_not_preferred(tmp_path):
+    path = save(tmp_path, INVERTED, check_kernel=False)
+    strategy = load(path)()
+    assert strategy.kernel_verified is False and not has_kernel(strategy)
+    assert not StrategyRegistry(str(tmp_path)).get("benchmarkmomentum").has_kernel
+
+    df = synthetic_ohlcv(1000, seed=4)
+    expected = strategy.generate_signals(df)["position"].to_numpy(dtype=np.float64)
+    assert np.array_equal(strategy_positions(strategy, df), expected)
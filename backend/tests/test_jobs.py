@@ -0,0 +1,129 @@
+import asyncio
+import functools
+
+from src.api.jobs import PaperJobQueue, analyze_paper_pipeline
+from src.parser.extraction_cache import ExtractionCache
+from src.parser.fake_client import DEFAULT_STRATEGY, FakeModelClient
+
+
+def make_queue(tmp_path, responses=None, concurrency=2):
+    clients = []
+
+    def client_factory():
+        clients.append(FakeModelClient(responses))
+        return clients[-1]
+
+    pipeline = functools.partial(
+        analyze_paper_pipeline,
+        cache=ExtractionCache(str(tmp_path / "cache")),
+        output_dir=str(tmp_path / "generated"),
+    )
+    return PaperJobQueue(pipeline=pipeline, concurrency=concurrency, client_factory=client_factory), clients
+
+
+async def wait_for(queue, job, timeout=60):
+    # Drains the job's SSE stream, which ends once the job is done or failed
+    async def drain():
+        return [chunk async for chunk in queue.stream(job.id)]
+    return await asyncio.wait_for(drain(), timeout)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_job_reports_every_stage_and_saves_the_strategy(tmp_path, pdf_path):
+    async def scenario():
+        queue, clients = make_queue(tmp_path)
+        job = queue.submit(pdf_path, "paper.pdf")
+        assert job.status == "queued"
+        chunks = await wait_for(queue, job)
+        await queue.shutdown()
+        return job, chunks, clients
+
+    job, chunks, clients = run(scenario())
+
+    assert job.status == "done", job.error
+    assert [e["event"] for e in job.events] == ["queued"] + ["stage"] * 5 + ["done"]
+    assert [e["stage"] for e in job.events if e["event"] == "stage"] == [
+        "rendering", "extraction", "validation", "smoke_test", "codegen",
+    ]
+    assert job.result["strategy_name"] == DEFAULT_STRATEGY["strategy_name"]
+    assert job.result["file_saved_at"].startswith(str(tmp_path / "generated"))
+    assert len(clients) == 1 and len(clients[0].calls) == 1
+
+    # SSE: one frame per event, closed by 'done'
+    assert len(chunks) == len(job.events)
+    assert chunks[-1].startswith("event: done\n")
+
+
+def test_second_upload_is_served_from_the_cache(tmp_path, pdf_path):
+    async def scenario():
+        queue, clients = make_queue(tmp_path)
+        first = queue.submit(pdf_path, "paper.pdf")
+        await wait_for(queue, first)
+        second = queue.submit(pdf_path, "paper-again.pdf")
+        await wait_for(queue, second)
+        await queue.shutdown()
+        return second, clients
+
+    second, clients = run(scenario())
+
+    assert second.status == "done", second.error
+    stages = [e for e in second.events if e["event"] == "stage"]
+    assert stages[0] == {**stages[0], "stage": "extraction", "cached": True}
+    assert "rendering" not in [e["stage"] for e in stages]
+    assert len(clients[1].calls) == 0
+
+
+def test_rejected_logic_fails_the_job(tmp_path, pdf_path):
+    looping = {**DEFAULT_STRATEGY, "entry_logic": "for i in range(len(df)): df['entry_signal'] = 1"}
+
+    async def scenario():
+        queue, clients = make_queue(tmp_path, responses=[looping])
+        job = queue.submit(pdf_path, "paper.pdf")
+        chunks = await wait_for(queue, job)
+        await queue.shutdown()
+        return job, chunks, clients
+
+    job, chunks, clients = run(scenario())
+
+    assert job.status == "failed"
+    assert job.events[-1]["event"] == "failed"
+    assert chunks[-1].startswith("event: failed\n")
+    # Initial call plus every refinement attempt
+    assert len(clients[0].calls) == 3
+    assert not (tmp_path / "generated").exists()
+
+
+def test_model_error_fails_the_job(tmp_path, pdf_path):
+    async def scenario():
+        queue, _ = make_queue(tmp_path, responses=["not json"])
+        job = queue.submit(pdf_path, "paper.pdf")
+        await wait_for(queue, job)
+        await queue.shutdown()
+        return job
+
+    job = run(scenario())
+
+    assert job.status == "failed"
+    assert "Could not read the PDF" in job.error
+    assert job.to_dict()["error"] == job.error
+
+
+def test_jobs_beyond_concurrency_wait_in_the_queue(tmp_path, pdf_path):
+    async def scenario():
+        queue, _ = make_queue(tmp_path, concurrency=1)
+        jobs = [queue.submit(pdf_path, f"paper-{i}.pdf") for i in range(3)]
+        await asyncio.sleep(0)
+        statuses = [job.status for job in jobs]
+        for job in jobs:
+            await wait_for(queue, job)
+        await queue.shutdown()
+        return jobs, statuses
+
+    jobs, statuses = run(scenario())
+
+    assert statuses == ["running", "queued", "queued"]
+    assert [job.status for job in jobs] == ["done"] * 3
+    assert all(queue_job.events[0]["event"] == "queued" for queue_job in jobs)
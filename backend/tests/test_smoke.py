@@ -0,0 +1,30 @@
+from src.benchmarks.suite import BENCH_STRATEGY
+from src.parser.smoke import first_mismatch, smoke_test_strategy
+
+SIZES = (1_000, 5_000)
+# Same rules as the pandas logic with the sides swapped (passes validation, runs fine)
+INVERTED = {
+    **BENCH_STRATEGY,
+    "numpy_logic": "entry_signal = np.where(close > kn.sma(close, lookback), -1, 1)\n"
+                   "exit_signal = (close < kn.rolling_min(close, lookback) * 1.01).astype(int)",
+}
+
+
+def test_matching_kernel_passes():
+    result = smoke_test_strategy(BENCH_STRATEGY, sizes=SIZES)
+    assert result["ok"], result["error"]
+    assert set(result["timings"]) == set(SIZES)
+
+
+def test_inverted_kernel_fails_at_the_first_differing_bar():
+    result = smoke_test_strategy(INVERTED, sizes=SIZES)
+    assert not result["ok"]
+    assert "differs from generate_signals at bar" in result["error"]
+    assert result["error"].endswith(f"of {SIZES[0]}")
+
+
+def test_first_mismatch_treats_nan_as_equal():
+    nan = float("nan")
+    assert first_mismatch([nan, 1, -1], [nan, 1, -1]) is None
+    assert first_mismatch([nan, 1, -1], [nan, 1, 1]) == 2
+    assert first_mismatch([0, 1], [0, 1, 1]) == 2
@@ -0,0 +1,96 @@
+import contextlib
+import importlib.util
+import io
+
+import numpy as np
+import pytest
+
+from src.backtester.engine import BacktestEngine
+from src.backtester.streaming import StreamingEngine, replay, warmup_window
+from src.backtester.synthetic import SyntheticStore, synthetic_ohlcv
+from src.parser.generator import save_strategy_file
+from src.strategies import kernels as kn
+
+BASE = {
+    "description": "Replay test strategy.",
+    "lookback_period": 20,
+    "required_columns": ["close"],
+    "exit_logic": "False",
+}
+# EMA_200 and RSI_14: recursive indicators that a 512-bar window used to re-seed
+KERNEL_STRATEGY = {
+    **BASE,
+    "strategy_name": "Replay Ema Kernel",
+    "entry_logic": "df['entry_signal'] = 0",
+    "numpy_logic": "trend = kn.ema(close, 200)\n"
+                   "momentum = kn.rsi(close, 14)\n"
+                   "entry_signal = np.where((close > trend) & (momentum > 50), 1, np.where(momentum < 40, -1, 0))",
+}
+PANDAS_STRATEGY = {
+    **BASE,
+    "strategy_name": "Replay Ewm Pandas",
+    "entry_logic": "df['entry_signal'] = np.where(df['close'] > df['close'].ewm(span=50, adjust=False).mean(), 1, -1)",
+}
+
+
+def generated(tmp_path, data):
+    with contextlib.redirect_stdout(io.StringIO()):
+        path = save_strategy_file(data, output_dir=str(tmp_path), check_kernel=False)
+    spec = importlib.util.spec_from_file_location(f"replay_{tmp_path.name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    strategy_class = next(value for name, value in vars(module).items() if name.endswith("Strategy") and name != "Strategy")
+    # The kernel is the reference here (its pandas logic is a placeholder), so trust it unchecked
+    strategy_class.kernel_verified = "numpy_logic" in data
+    return strategy_class
+
+
+def replayed(strategy_class, n_bars, window=None):
+    engine = BacktestEngine(store=SyntheticStore(n_bars, seed=7))
+    engine.load_strategy = lambda name: strategy_class()
+    with contextlib.redirect_stdout(io.StringIO()):
+        return replay(engine, "replay", ticker="SYN", window=window)
+
+
+def test_kernel_replay_matches_run_with_a_short_window(tmp_path):
+    strategy_class = generated(tmp_path, KERNEL_STRATEGY)
+    window = warmup_window(strategy_class(), carried=True)
+    assert window < 512
+
+    result = replayed(strategy_class, 1500)
+    assert result["bars"] == 1500
+    assert result["mismatches"] == dict.fromkeys(result["mismatches"], 0)
+
+
+def test_pandas_replay_matches_run_once_the_window_slides(tmp_path):
+    strategy_class = generated(tmp_path, PANDAS_STRATEGY)
+    window = warmup_window(strategy_class(), carried=False)
+    n_bars = window + 500
+
+    result = replayed(strategy_class, n_bars)
+    assert result["mismatches"] == dict.fromkeys(result["mismatches"], 0)
+
+
+@pytest.mark.parametrize("indicator", ["ema", "rma"])
+def test_carried_smoothing_matches_the_full_history(indicator):
+    close = synthetic_ohlcv(2000, seed=3)["Close"].to_numpy()
+    expected = getattr(kn, indicator)(close, 120)
+
+    state, window = kn.CarriedState(), 130
+    for t in range(1, len(close) + 1):
+        with kn.carry(state, whole_history=t <= window):
+            tail = getattr(kn, indicator)(close[max(0, t - window):t], 120)
+        assert np.isclose(tail[-1], expected[t - 1], rtol=1e-12, equal_nan=True)
+
+
+def test_engine_keeps_one_book_per_symbol(tmp_path):
+    strategy_class = generated(tmp_path, KERNEL_STRATEGY)
+    engine = StreamingEngine(strategy_class())
+    bars = synthetic_ohlcv(300, seed=1)["Close"].to_numpy()
+    for price in bars:
+        engine.update("AAA", price)
+        engine.update("BBB", price * 2)
+
+    assert set(engine.positions()) == {"AAA", "BBB"}
+    assert engine.books["AAA"].bars == engine.books["BBB"].bars == 300
+    assert engine.books["AAA"].kernel_state is not engine.books["BBB"].kernel_state
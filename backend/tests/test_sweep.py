@@ -0,0 +1,48 @@
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from src.backtester.engine import BacktestEngine
+from src.backtester.synthetic import SyntheticStore
+from src.benchmarks.suite import BENCH_STRATEGY
+from src.parser.generator import save_strategy_file
+from src.strategies.registry import StrategyRegistry
+
+GRID = {"lookback": [5, 8, 13, 21, 34, 55]}
+
+
+def engine_for(tmp_path, with_kernel):
+    data = dict(BENCH_STRATEGY)
+    if not with_kernel:
+        data.pop("numpy_logic")
+    with contextlib.redirect_stdout(io.StringIO()):
+        save_strategy_file(data, output_dir=str(tmp_path))
+    return BacktestEngine(store=SyntheticStore(1500, seed=11), strategies=StrategyRegistry(str(tmp_path)))
+
+
+def run_once(engine, lookback):
+    # One ordinary backtest with the parameter set on the instance
+    strategy = engine.strategies.create("benchmarkmomentum")
+    strategy.lookback = lookback
+    engine.load_strategy = lambda name: strategy
+    try:
+        return engine.run("benchmarkmomentum", ticker="SYN")
+    finally:
+        del engine.load_strategy
+
+
+@pytest.mark.parametrize("with_kernel", [True, False])
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_sweep_table_matches_one_run_per_combination(tmp_path, with_kernel, n_jobs):
+    engine = engine_for(tmp_path, with_kernel)
+    with contextlib.redirect_stdout(io.StringIO()):
+        table = engine.sweep("benchmarkmomentum", "SYN", GRID, n_jobs=n_jobs)
+        runs = {lookback: run_once(engine, lookback) for lookback in GRID["lookback"]}
+
+    assert sorted(table["lookback"]) == GRID["lookback"]
+    assert table["sharpe"].is_monotonic_decreasing
+    for row in table.itertuples():
+        expected = runs[row.lookback]["cumulative_strategy"].iloc[-1] - 1
+        assert np.isclose(row.total_return, expected, rtol=1e-9)
@@ -11,6 +11,7 @@ function App() {
   const [strategy, setStrategy] = useState(null);
   const [backtestData, setBacktestData] = useState(null);
   const [error, setError] = useState("");
+  const [stage, setStage] = useState("");
 
   // 1. Handle File Upload (Phase 1)
   const handleUpload = async () => {
@@ -22,14 +23,36 @@ function App() {
     formData.append("file", file);
 
     try {
+      // The backend queues the paper and streams progress for the job
       const res = await axios.post(`${API_URL}/analyze-paper/`, formData, {
         headers: { 'Content-Type': 'multipart/form-data' }
       });
-      setStrategy(res.data);
+      setStage("queued");
+
+      const events = new EventSource(`${API_URL}${res.data.events_url}`);
+      events.addEventListener("stage", (e) => setStage(JSON.parse(e.data).stage));
+      events.addEventListener("done", (e) => {
+        setStrategy(JSON.parse(e.data).result);
+        setStage("");
+        setLoading(false);
+        events.close();
+      });
+      events.addEventListener("failed", (e) => {
+        setError(`Failed to analyze paper: ${JSON.parse(e.data).error}`);
+        setStage("");
+        setLoading(false);
+        events.close();
+      });
+      events.onerror = () => {
+        if (events.readyState === EventSource.CLOSED) return;
+        setError("Lost connection to the analysis job.");
+        setStage("");
+        setLoading(false);
+        events.close();
+      };
     } catch (err) {
       setError("Failed to analyze paper. Is the Backend running?");
       console.error(err);
-    } finally {
       setLoading(false);
     }
   };
@@ -44,10 +67,15 @@ function App() {
       const res = await axios.get(`${API_URL}/run-backtest/`, {
         params: { 
           strategy_name: strategy.strategy_name,
-          ticker: "BTC-USD"
+          ticker: "BTC-USD",
+          format: "columnar",
+          max_points: 1000
         }
       });
-      setBacktestData(res.data);
+      // Parallel arrays -> one row per point for Recharts
+      const { date, market, strategy: curve } = res.data.chart;
+      const chart_data = date.map((d, i) => ({ date: d, market: market[i], strategy: curve[i] }));
+      setBacktestData({ ...res.data, chart_data });
     } catch (err) {
       setError("Backtest failed. Check console for details.");
     } finally {
@@ -84,7 +112,7 @@ function App() {
               disabled={loading || !file}
               className="bg-green-600 hover:bg-green-700 text-white px-4 py-2 rounded-lg font-medium transition disabled:opacity-50"
             >
-              {loading ? "Processing..." : "Analyze"}
+              {loading ? (stage ? `${stage.charAt(0).toUpperCase()}${stage.slice(1)}...` : "Processing...") : "Analyze"}
             </button>
           </div>
 